@@ -1,62 +1,157 @@
-import tkinter as tk
-from tkinter import messagebox
-import json
-import matplotlib.pyplot as plt
-import numpy as np
-from datetime import datetime,timedelta
-import os
-import shutil
+import time
+_process_start = time.perf_counter()
+
+import argparse
+import queue
+import sys
+import threading
 import traceback
-from tkinter import simpledialog
+from contextlib import contextmanager
+from datetime import datetime
 
 
-SKILLS_FILE = "skills.json"
-_last_snapshot_time = None  # متغير عام global تضعه في أول ملف GUI
+_startup_phases = []   # [(المرحلة, الثواني)] - تُطبع مع --profile-startup
 
 
-# دالة لقراءة المهارات من الملف
-def load_skills():
+# قياس زمن مرحلة من مراحل التشغيل (استيراد أو تهيئة)
+@contextmanager
+def startup_phase(name):
+    start = time.perf_counter()
     try:
-        with open(SKILLS_FILE, "r", encoding="utf-8") as f:
-            content = f.read().strip()
-            if not content:
-                return []
-            return json.loads(content)
-    except FileNotFoundError:
-        return []
-    except json.JSONDecodeError as e:
-        print("❌ خطأ في قراءة JSON:", e)
-        return []
-
-# دالة لحفظ المهارات إلى الملف
-def save_skills(skills_list):
-    with open(SKILLS_FILE, "w", encoding="utf-8") as f:
-        json.dump(skills_list, f, ensure_ascii=False, indent=2)
-
-    # ⬇⬇ إضافة أخذ نسخة snapshot تلقائيًا بعد الحفظ ⬇⬇
+        yield
+    finally:
+        _startup_phases.append((name, time.perf_counter() - start))
+
+
+with startup_phase("import tkinter"):
     try:
-        # 🟨 حمّل آخر Snapshot موجود (لو فيه)
-        snapshot_folder = "snapshots"
-        os.makedirs(snapshot_folder, exist_ok=True)
-        snapshots = sorted(os.listdir(snapshot_folder))
-        if snapshots:
-            last_snapshot_path = os.path.join(snapshot_folder, snapshots[-1])
-            with open(last_snapshot_path, "r", encoding="utf-8") as f:
-                last_snapshot = json.load(f)
-        else:
-            last_snapshot = []
+        import tkinter as tk
+        from tkinter import filedialog, messagebox, simpledialog, ttk
+    except ImportError:
+        tk = None  # بدون Tk تعمل أوامر batch فقط (انظر status_core.cli)
+
+with startup_phase("import status_core"):
+    from status_core import (
+        SkillStore, SnapshotError, DebouncedSaver, SnapshotScheduler, load_snapshot,
+        snapshot_range, rename_snapshots, delete_snapshots, snapshot_diff, previous_snapshot,
+        snapshot_stem, snapshot_sort_key, format_diff,
+        retention_report, start_retention,
+        profile_index, list_profiles, current_profile, create_profile, open_profile, pop_recovered,
+        save_profile_skills,
+        import_into, import_skills, export_skills,
+    )
+    from status_core.radar import (
+        PROFILE_TITLE, PROFILE_COLOR, SNAPSHOT_COLOR, radar_angles, close_polygon, draw_radar,
+        draw_radar_overlay, draw_team_radar, snapshot_radar_title,
+    )
+    from status_core.cli import add_batch_arguments, add_storage_arguments, open_storage, run_batch
+
+
+# matplotlib يُستورد فقط عند أول رادار (أو في الخلفية بعد ظهور النافذة)
+# نستخدم Figure و FigureCanvasTkAgg مباشرة بدون pyplot → لا نوافذ ولا figures متسربة
+_Figure = None
+_FigureCanvasTkAgg = None
+_plotting_lock = threading.Lock()
+
+
+def plotting():
+    global _Figure, _FigureCanvasTkAgg
+    with _plotting_lock:
+        if _Figure is None:
+            with startup_phase("import numpy"):
+                import numpy  # noqa: F401 - أثقل جزء في matplotlib، نقيسه وحده
+            with startup_phase("import matplotlib (TkAgg)"):
+                from matplotlib.figure import Figure
+                from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+            _Figure, _FigureCanvasTkAgg = Figure, FigureCanvasTkAgg
+    return _Figure, _FigureCanvasTkAgg
+
+
+# تسخين matplotlib في thread بعد ظهور النافذة حتى يفتح أول رادار بسرعة
+def warm_plotting(report=False):
+    def worker():
+        try:
+            plotting()
+        except Exception as e:
+            print("⚠️ تعذر تحميل matplotlib في الخلفية:", e)
+        if report:
+            print_startup_profile("بعد تحميل matplotlib في الخلفية")
+
+    threading.Thread(target=worker, daemon=True).start()
+
+
+# طباعة زمن كل مرحلة تشغيل
+def print_startup_profile(title):
+    print(f"⏱️ زمن التشغيل ({title}):")
+    for name, seconds in _startup_phases:
+        print(f"  {name:<28}{seconds * 1000:9.1f} ms")
+    print(f"  {'الإجمالي منذ بدء العملية':<28}{(time.perf_counter() - _process_start) * 1000:9.1f} ms")
+
+
+# رادار واحد مدمج في النافذة الرئيسية: يُرسم بالكامل فقط لو تغيرت المحاور أو العنوان،
+# وغير ذلك نحدّث بيانات الخط والمساحة في مكانها ونرسمهما فوق خلفية محفوظة (blitting)
+class RadarView:
+    def __init__(self, parent):
+        Figure, FigureCanvasTkAgg = plotting()
+        self.figure = Figure(figsize=(5, 5))
+        self.ax = self.figure.add_subplot(polar=True)
+        self.canvas = FigureCanvasTkAgg(self.figure, master=parent)
+        self.canvas.get_tk_widget().pack(fill="both", expand=True)
+        self.canvas.mpl_connect("draw_event", self._on_draw)
+
+        self.labels = None
+        self.title = None
+        self.line = None
+        self.fill = None
+        self.background = None
+
+    # بعد أي رسم كامل (أول مرة أو تغيير حجم): نحفظ الخلفية ونرسم الخط والمساحة فوقها
+    def _on_draw(self, event):
+        self.background = self.canvas.copy_from_bbox(self.ax.bbox)
+        self._draw_data()
+
+    def _draw_data(self):
+        if self.line is not None:
+            self.ax.draw_artist(self.fill)
+            self.ax.draw_artist(self.line)
+
+    def show(self, labels, values, title, color=PROFILE_COLOR):
+        labels = list(labels)
+        if labels != self.labels or title != self.title:
+            self.ax.clear()
+            self.line, self.fill = draw_radar(self.ax, labels, values, title, color)
+            self.line.set_animated(True)
+            self.fill.set_animated(True)
+            self.labels, self.title = labels, title
+            self.canvas.draw()
+            return
+
+        angles, closed_values = close_polygon(radar_angles(len(labels)), values)
+        self.line.set_data(angles, closed_values)
+        self.fill.set_xy(list(zip(angles, closed_values)))
+        self.line.set_color(color)
+        self.fill.set_color(color)
+        if self.background is None:
+            self.canvas.draw()
+            return
+        self.canvas.restore_region(self.background)
+        self._draw_data()
+        self.canvas.blit(self.ax.bbox)
 
-        # ✅ قارن بين الحالة الحالية وآخر Snapshot
-        if skills_list != last_snapshot:
-            now = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-            shutil.copy(SKILLS_FILE, os.path.join(snapshot_folder, f"{now}.json"))
-        # ❌ لو نفس الحالة، تجاهل snapshot
 
-    except Exception as e:
-        messagebox.showerror("خطأ في أخذ Snapshot", f"لم يتم حفظ نسخة احتياطية:\n{e}")
+radar_view = None
 
 
-    
+# إنشاء لوحة الرادار بجانب قائمة المهارات عند أول استخدام
+def get_radar_view():
+    global radar_view
+    if radar_view is None:
+        root.geometry("1000x600")
+        panel = tk.Frame(root)
+        panel.pack(side=tk.RIGHT, fill="both", expand=True)
+        radar_view = RadarView(panel)
+    return radar_view
+
 
 # دالة لعرض الرادار
 def show_radar(skills_dict):
@@ -64,38 +159,147 @@ def show_radar(skills_dict):
         messagebox.showwarning("تحذير", "لا توجد مهارات لعرضها!")
         return
 
-    labels = list(skills_dict.keys())
-    values = list(skills_dict.values())
+    get_radar_view().show(skills_dict.keys(), list(skills_dict.values()), PROFILE_TITLE, PROFILE_COLOR)
+
+# حفظ المهارات لو فيه أي تغيير منذ آخر حفظ - الكتابة الفعلية مؤجلة في الخلفية (saver)
+def commit_skills():
+    if skills.dirty:
+        saver.schedule(skills.to_list())
+        skills.mark_clean()
+
+
+# نتائج مهام الخلفية (أخطاء الحفظ، انتهاء التنظيف) تُوضع في queue ويقرؤها thread الواجهة فقط
+# - لا نستدعي Tk (ولا root.after) من thread آخر: قد يتوقف لو الـ thread الرئيسي ينتظر flush/close
+UI_POLL_MS = 100
+ui_calls = queue.Queue()
+
+
+def call_in_ui(func, *args):
+    ui_calls.put((func, args))
+
+
+# تنفيذ كل ما وصل من مهام الخلفية (من thread الواجهة فقط)
+def run_ui_calls():
+    while True:
+        try:
+            func, args = ui_calls.get_nowait()
+        except queue.Empty:
+            return
+        func(*args)
+
+
+def poll_ui_calls():
+    run_ui_calls()
+    root.after(UI_POLL_MS, poll_ui_calls)
+
+
+# أخطاء الحفظ تصل من thread الحفظ → نعرضها من thread الواجهة
+def on_save_error(error):
+    call_in_ui(show_save_error, error)
+
+
+def show_save_error(error):
+    if isinstance(error, SnapshotError):
+        messagebox.showerror("خطأ في أخذ Snapshot", f"لم يتم حفظ نسخة احتياطية:\n{error}")
+    else:
+        messagebox.showerror("خطأ", f"فشل حفظ المهارات:\n{error}")
+
+
+# إغلاق النافذة: اللقطة المؤجلة ثم أي تعديل معلق قبل الخروج
+def on_close():
+    try:
+        scheduler.flush()
+    except Exception as e:
+        print("❌ فشل أخذ اللقطة المؤجلة:", e)
+    saver.close()
+    run_ui_calls()  # خطأ في الحفظ الأخير يظهر قبل إغلاق النافذة
+    root.destroy()
+
+# اختيار ملف المهارات (شخص): القائمة والملخص من الفهرس فقط، والمهارات تُحمّل عند الاختيار
+def build_profile_picker(parent):
+    global profile_box, profile_info
+    row = tk.Frame(parent)
+    row.pack(pady=5, fill="x")
+    tk.Label(row, text="👤 الملف:").pack(side=tk.LEFT)
+    profile_box = ttk.Combobox(row, values=list_profiles(), state="readonly", width=22)
+    profile_box.set(current_profile())
+    profile_box.bind("<<ComboboxSelected>>", lambda event: switch_profile(profile_box.get()))
+    profile_box.pack(side=tk.LEFT, padx=5)
+    tk.Button(row, text="➕ ملف جديد", command=new_profile_prompt).pack(side=tk.LEFT)
+    profile_info = tk.Label(parent, fg="gray")
+    profile_info.pack()
+    update_profile_info()
+
+
+def update_profile_info():
+    summary = profile_index().get(current_profile(), {})
+    text = f"{summary.get('skills', 0)} مهارة - المتوسط {summary.get('mean', 0)}"
+    if summary.get("top"):
+        text += f" - الأعلى: {summary['top']}"
+    profile_info.config(text=text)
+
+
+# تبديل الملف: نكتب اللقطة والحفظ المؤجلين للملف الحالي أولًا ثم نفتح الجديد
+# (ممنوع أثناء التنظيف في الخلفية - قاعدة الملف الحالي تُغلق عند التبديل)
+def switch_profile(name):
+    global skills
+    if name == current_profile():
+        return
+    if retention_thread is not None and retention_thread.is_alive():
+        messagebox.showwarning("⏳ انتظر", "جارٍ تنظيف اللقطات في الخلفية، حاول تبديل الملف بعد انتهائه.")
+        profile_box.set(current_profile())
+        return
+    try:
+        scheduler.flush()
+        saver.flush()
+        skills = SkillStore(open_profile(name))
+    except Exception as e:
+        messagebox.showerror("خطأ", f"تعذر فتح الملف {name}:\n{e}")
+        profile_box.set(current_profile())
+        return
+
+    scheduler.last_fingerprint = None  # آخر لقطة تُقرأ من سجل الملف الجديد
+    root.title(f"إدارة المهارات - {name}")
+    skill_rows.reset()  # الصفوف وتعديلاتها غير المحفوظة تخص الملف السابق
+    refresh_ui()
+    update_profile_info()
+    show_recovery_warning(pop_recovered(name))
 
-    num_vars = len(labels)
-    angles = np.linspace(0, 2 * np.pi, num_vars, endpoint=False).tolist()
-    values += values[:1]
-    angles += angles[:1]
 
-    fig, ax = plt.subplots(figsize=(6, 6), subplot_kw=dict(polar=True))
-    ax.plot(angles, values, color='lime', linewidth=2)
-    ax.fill(angles, values, color='lime', alpha=0.25)
-    ax.set_xticks(angles[:-1])
-    ax.set_xticklabels(labels, fontsize=12, fontweight='bold')
-    ax.set_yticklabels([])
-    ax.set_ylim(0, 100)
-    ax.set_title("ملف المهارات الشخصي", size=16, weight='bold', y=1.08)
+def show_recovery_warning(recovered_from):
+    if recovered_from:
+        messagebox.showwarning(
+            "🩹 استرجاع", f"ملف المهارات كان تالفًا وتم استرجاعه من آخر لقطة سليمة:\n{recovered_from}")
 
-    plt.tight_layout()
-    plt.show()
 
-# تحديث الواجهة بالكامل بعد إضافة/حذف
+def new_profile_prompt():
+    name = simpledialog.askstring("👤 ملف جديد", "اسم صاحب الملف:", parent=root)
+    if not name:
+        return
+    try:
+        name = create_profile(name)
+    except FileExistsError:
+        messagebox.showerror("❌ خطأ", "يوجد ملف بنفس الاسم بالفعل!")
+        return
+    except ValueError as e:
+        messagebox.showerror("❌ خطأ", str(e))
+        return
+    profile_box.config(values=list_profiles())
+    profile_box.set(name)
+    switch_profile(name)
+
+# تحديث الواجهة بعد إضافة/حذف
+# (يعدّل فقط الصفوف التي أضيفت أو حذفت أو تغيرت قيمتها - بدون قراءة الملف)
 def refresh_ui():
-    for widget in frame.winfo_children():
-        widget.destroy()
-    entries.clear()
-    build_ui()
+    skill_rows.sync(skills)
+    # لو الرادار يعرض المهارات الحالية نحدّثه في مكانه
+    if radar_view is not None and radar_view.title == PROFILE_TITLE and len(skills):
+        radar_view.show(skills, [value for _, value in skills.items()], PROFILE_TITLE, PROFILE_COLOR)
 
 # دالة لحذف مهارة
 def delete_skill(skill_name):
-    global skills
-    skills = [s for s in skills if s["name"] != skill_name]
-    save_skills(skills)
+    skills.delete(skill_name)
+    commit_skills()
     refresh_ui()
 
 # إضافة أو تعديل مهارة جديدة
@@ -106,84 +310,252 @@ def add_or_update_skill():
         if not name or not (0 <= val <= 100):
             raise ValueError
 
-        found = False
-        for skill_obj in skills:
-            if skill_obj["name"] == name:
-                skill_obj["value"] = val
-                found = True
-                break
-
-        if not found:
-            skills.append({"name": name, "value": val})
-
-        save_skills(skills)
+        skills.upsert(name, val)
+        commit_skills()
         refresh_ui()
+        skill_rows.see(name)
     except:
         messagebox.showerror("خطأ", "تأكد من إدخال اسم وقيمة صحيحة بين 0 و 100.")
 
 
-def save_snapshot():
-    global _last_snapshot_time
-    now = datetime.now()
+BULK_FILETYPES = [("CSV", "*.csv"), ("JSON Lines", "*.jsonl *.ndjson")]
+
+
+# استيراد مهارات من ملف CSV/JSONL: الصفوف تُقرأ سطرًا سطرًا وتُضاف على دفعات، ثم حفظ واحد وتحديث واحد
+def import_skills_prompt():
+    path = filedialog.askopenfilename(title="📥 استيراد مهارات", filetypes=BULK_FILETYPES, parent=root)
+    if not path:
+        return
+    try:
+        report = import_into(skills, path)
+    except (OSError, ValueError) as e:
+        messagebox.showerror("خطأ", f"فشل الاستيراد:\n{e}")
+        return
+    commit_skills()
+    refresh_ui()
 
-    if _last_snapshot_time and (now - _last_snapshot_time) < timedelta(seconds=5):
-        print("⛔ تم تجاهل الحفظ لتكراره خلال 5 ثواني.")
+    message = f"تم استيراد {report['imported']} مهارة."
+    if report["rejected"]:
+        details = "\n".join(f"سطر {line_no}: {reason}" for line_no, reason in report["errors"][:10])
+        message += f"\nتم رفض {report['rejected']} سطر:\n{details}"
+        messagebox.showwarning("📥 استيراد", message)
+    else:
+        messagebox.showinfo("📥 استيراد", message)
+
+
+def export_skills_prompt():
+    path = filedialog.asksaveasfilename(title="📤 تصدير مهارات", filetypes=BULK_FILETYPES,
+                                        defaultextension=".csv", parent=root)
+    if not path:
+        return
+    try:
+        count = export_skills(path, skills.items())
+    except (OSError, ValueError) as e:
+        messagebox.showerror("خطأ", f"فشل التصدير:\n{e}")
         return
+    messagebox.showinfo("📤 تصدير", f"تم تصدير {count} مهارة إلى:\n{path}")
 
-    _last_snapshot_time = now
 
-    print(f"🔄 حفظ Snapshot عند: {now}")
+# حفظ لقطة في سجل التاريخ (زر 📸) - لو تكررت بسرعة تُؤجل بدل أن تضيع
+def on_snapshot():
     try:
-        with open("skills.json", "r", encoding="utf-8") as f:
-            content = f.read().strip()
-            if not content:
-                raise ValueError("ملف المهارات فارغ!")
-            data = json.loads(content)
-
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        snapshot = {
-            "timestamp": timestamp,
-            "skills": data
-        }
-
-        history = []
-        if os.path.exists("history.json"):
-            with open("history.json", "r", encoding="utf-8") as f:
-                content = f.read().strip()
-                if content:
-                    history = json.loads(content)
-
-        history.append(snapshot)
-
-        with open("history.json", "w", encoding="utf-8") as f:
-            json.dump(history, f, ensure_ascii=False, indent=4)
-
-        messagebox.showinfo("تم الحفظ", f"تم حفظ لقطة بتاريخ {timestamp}")
+        timestamp = scheduler.request()
+        if timestamp:
+            messagebox.showinfo("تم الحفظ", f"تم حفظ لقطة بتاريخ {timestamp}")
+        else:
+            messagebox.showinfo("⏳ مؤجلة", f"سيتم حفظ اللقطة خلال {scheduler.next_delay():.0f} ثانية.")
     except Exception as e:
         messagebox.showerror("خطأ", f"حدث خطأ أثناء الحفظ: {e}")
+    arm_snapshot_timer()
 
 
+snapshot_timer = None
 
-# بناء عناصر المهارات في الواجهة
-def build_ui():
-    global add_name_entry, add_value_entry,skills
-    skills = load_skills()
 
-    tk.Label(frame, text="تقييم المهارات (0 - 100):", font=("Arial", 12, "bold")).pack()
-    for skill_obj in skills:
-        print("Skill object:", skill_obj, type(skill_obj))
-        skill = skill_obj["name"]
-        value = skill_obj["value"]
-        row = tk.Frame(frame)
-        row.pack(pady=5, fill="x")
-        tk.Label(row, text=skill, width=15, anchor='w').pack(side=tk.LEFT)
+# مؤقت الجدولة: يُضبط على موعد اللقطة التالية (المؤجلة أو الدورية) فقط - بدون polling
+def arm_snapshot_timer():
+    global snapshot_timer
+    if snapshot_timer is not None:
+        root.after_cancel(snapshot_timer)
+        snapshot_timer = None
+    delay = scheduler.next_delay()
+    if delay is not None:
+        snapshot_timer = root.after(int(delay * 1000) + 10, on_snapshot_timer)
+
+
+def on_snapshot_timer():
+    global snapshot_timer
+    snapshot_timer = None
+    try:
+        timestamp = scheduler.tick()
+        if timestamp:
+            print(f"📸 لقطة مجدولة بتاريخ {timestamp}")
+    except Exception as e:
+        messagebox.showerror("خطأ", f"فشل أخذ لقطة مجدولة: {e}")
+    arm_snapshot_timer()
+
+
+
+# قائمة مهارات افتراضية قابلة للتمرير: عدد ثابت من الصفوف بقدر ما يظهر فقط،
+# ومع التمرير يُعاد استخدام نفس الصفوف لعرض مهارات أخرى
+class SkillRows:
+    ROW_HEIGHT = 34
+
+    def __init__(self, parent, height=260):
+        self.items = []     # [(name, value)] بنفس ترتيب المهارات
+        self.values = {}    # name -> value كما في البيانات
+        self.edits = {}     # name -> نص كتبه المستخدم ولم يُحفظ بعد
+        self.pool = []      # الصفوف المعروضة فعليًا (يُعاد استخدامها)
+        self.index = {}     # name -> موضعها في items
+        self.first = 0      # رقم أول مهارة ظاهرة
+
+        container = tk.Frame(parent, height=height)
+        container.pack(fill="x")
+        container.pack_propagate(False)
+        self.scrollbar = tk.Scrollbar(container, orient=tk.VERTICAL, command=self._on_scroll)
+        self.scrollbar.pack(side=tk.RIGHT, fill="y")
+        self.body = tk.Frame(container)
+        self.body.pack(side=tk.LEFT, fill="both", expand=True)
+        self.body.bind("<Configure>", self._on_resize)
+        self._bind_wheel(self.body)
+
+    def _bind_wheel(self, widget):
+        widget.bind("<MouseWheel>", self._on_wheel)
+        widget.bind("<Button-4>", self._on_wheel)
+        widget.bind("<Button-5>", self._on_wheel)
+
+    # إنشاء صف فارغ في الـ pool
+    def _create_slot(self):
+        row = tk.Frame(self.body, height=self.ROW_HEIGHT)
+        label = tk.Label(row, width=15, anchor='w')
+        label.pack(side=tk.LEFT)
         entry = tk.Entry(row, width=5)
-        entry.insert(0, str(value))
         entry.pack(side=tk.LEFT)
-        entries[skill] = entry
+        slot = {"frame": row, "label": label, "entry": entry, "name": None}
 
-        del_btn = tk.Button(row, text="🗑", command=lambda s=skill: delete_skill(s), bg="red", fg="white")
+        del_btn = tk.Button(row, text="🗑", command=lambda: slot["name"] and delete_skill(slot["name"]), bg="red", fg="white")
         del_btn.pack(side=tk.RIGHT)
+        for widget in (row, label, entry, del_btn):
+            self._bind_wheel(widget)
+        self.pool.append(slot)
+
+    # حفظ ما كتبه المستخدم في الصفوف الظاهرة قبل إعادة استخدامها
+    def _stash(self):
+        for slot in self.pool:
+            name = slot["name"]
+            if name is None or name not in self.values:
+                continue
+            text = slot["entry"].get()
+            if text != str(self.values[name]):
+                self.edits[name] = text
+            else:
+                self.edits.pop(name, None)
+
+    # عرض المهارات من first في الصفوف الموجودة - يعدّل فقط الصف الذي تغير محتواه
+    def _render(self):
+        n = len(self.items)
+        self.first = max(0, min(self.first, n - len(self.pool)))
+        for i, slot in enumerate(self.pool):
+            index = self.first + i
+            if index < n:
+                name, value = self.items[index]
+                text = self.edits.get(name, str(value))
+                if slot["name"] is None:
+                    slot["frame"].pack(pady=2, fill="x")
+                if slot["name"] != name:
+                    slot["label"].config(text=name)
+                if slot["name"] != name or slot["entry"].get() != text:
+                    slot["entry"].delete(0, tk.END)
+                    slot["entry"].insert(0, text)
+                slot["name"] = name
+            elif slot["name"] is not None:
+                slot["frame"].pack_forget()
+                slot["name"] = None
+
+        if n:
+            self.scrollbar.set(self.first / n, min(1.0, (self.first + len(self.pool)) / n))
+        else:
+            self.scrollbar.set(0, 1)
+
+    def _on_resize(self, event):
+        visible = max(1, event.height // self.ROW_HEIGHT)
+        if visible == len(self.pool):
+            return
+        self._stash()
+        while len(self.pool) < visible:
+            self._create_slot()
+        while len(self.pool) > visible:
+            self.pool.pop()["frame"].destroy()
+        self._render()
+
+    def _on_scroll(self, *args):
+        self._stash()
+        if args[0] == "moveto":
+            self.first = int(float(args[1]) * len(self.items))
+        elif args[0] == "scroll":
+            step = int(args[1])
+            self.first += step * len(self.pool) if args[2] == "pages" else step
+        self._render()
+
+    def _on_wheel(self, event):
+        step = -1 if event.num == 4 or event.delta > 0 else 1
+        self._on_scroll("scroll", step, "units")
+        return "break"
+
+    # مطابقة القائمة مع المهارات الحالية في الذاكرة (SkillStore)
+    def sync(self, store):
+        self._stash()
+        values = dict(store.items())
+        for name in list(self.edits):
+            if values.get(name) != self.values.get(name):
+                del self.edits[name]  # القيمة تغيرت في البيانات أو حُذفت → نلغي أي تعديل قديم
+
+        self.values = values
+        self.items = list(values.items())
+        self.index = {name: i for i, name in enumerate(values)}
+        self._render()
+
+    # نسيان كل ما يخص المهارات المعروضة (عند فتح ملف آخر) - sync بعدها يبدأ من الصفر
+    def reset(self):
+        self.edits.clear()
+        self.values = {}
+        self.items = []
+        self.index = {}
+        self.first = 0
+        for slot in self.pool:
+            if slot["name"] is not None:
+                slot["frame"].pack_forget()
+                slot["name"] = None
+            slot["label"].config(text="")
+            slot["entry"].delete(0, tk.END)
+
+    # التمرير حتى تظهر مهارة معينة
+    def see(self, name):
+        index = self.index.get(name)
+        if index is None:
+            return
+        self._stash()
+        if index < self.first:
+            self.first = index
+        elif index >= self.first + len(self.pool):
+            self.first = index - len(self.pool) + 1
+        self._render()
+
+    # نص خانة القيمة لكل مهارة (الظاهرة وغير الظاهرة)
+    def values_text(self):
+        self._stash()
+        return {name: self.edits.get(name, str(value)) for name, value in self.items}
+
+
+# بناء عناصر الواجهة الثابتة مرة واحدة (الصفوف يديرها SkillRows)
+def build_ui():
+    global add_name_entry, add_value_entry, skill_rows
+
+    tk.Label(frame, text="تقييم المهارات (0 - 100):", font=("Arial", 12, "bold")).pack()
+    rows_frame = tk.Frame(frame)
+    rows_frame.pack(fill="x")
+    skill_rows = SkillRows(rows_frame)
+    skill_rows.sync(skills)
 
     # مساحة للإضافة
     tk.Label(frame, text="\n➕ إضافة / تعديل مهارة:", font=("Arial", 11, "bold")).pack()
@@ -204,14 +576,16 @@ def build_ui():
 # تنفيذ الحفظ
 def on_save():
     try:
-        for skill_obj in skills:
-            name = skill_obj["name"]
-            if name in entries:
-                val = int(entries[name].get())
-                skill_obj["value"] = val
+        texts = skill_rows.values_text()
+        new_values = {}
+        for name, text in texts.items():
+            val = int(text)
             if not (0 <= val <= 100):
                 raise ValueError
-        save_skills(skills)
+            new_values[name] = val
+        skills.update(new_values)  # المهارات التي تغيرت فقط تدخل في dirty
+        commit_skills()
+        refresh_ui()
         messagebox.showinfo("تم", "تم حفظ التعديلات.")
     except:
         messagebox.showerror("خطأ", "برجاء إدخال أرقام صحيحة بين 0 و 100.")
@@ -221,108 +595,307 @@ def on_save():
 def on_show():
     try:
         temp_skills = {}
-        for skill_obj in skills:
-            name = skill_obj["name"]
-            val = int(entries[name].get())
-            temp_skills[name] = val
+        for name, text in skill_rows.values_text().items():
+            temp_skills[name] = int(text)
         show_radar(temp_skills)
     except:
         messagebox.showerror("خطأ", "تأكد من أن كل التقييمات أرقام صحيحة.")
 
 
 
-def show_history_window():
-    history_win = tk.Toplevel(root)
-    history_win.title("📅 الحالات السابقة")
-    history_win.geometry("400x600")
-
-    tk.Label(history_win, text="اختر تاريخ الحالة:").pack(pady=10)
-
-    snapshot_folder = "snapshots"
-    if not os.path.exists(snapshot_folder):
-        tk.Label(history_win, text="لا توجد حالات محفوظة بعد.").pack(pady=20)
-        return
-
-    files = sorted(os.listdir(snapshot_folder), reverse=True)  # الأحدث أولًا
-    for filename in files:
-        if filename.endswith(".json"):
-            date_str = filename.replace(".json", "")
-            frame = tk.Frame(history_win)
-            frame.pack(pady=5)
-
-            tk.Label(frame, text=date_str).pack(side=tk.LEFT, padx=5)
+# نافذة التاريخ بصفحات: الفهرس المرتب يأتي من الكاش، والصفوف تُبنى فقط لصفحة واحدة
+# ويُعاد استخدامها عند التنقل بين الصفحات
+class HistoryBrowser:
+    PAGE_SIZE = 15
+
+    def __init__(self, window):
+        self.window = window
+        self.names = []     # اللقطات بعد التصفية (الأحدث أولًا)
+        self.page = 0
+        self.slots = []
+        self.selected = set()  # اللقطات المختارة للعمليات الجماعية (تبقى مع تغيير الصفحة)
+
+        tk.Label(window, text="اختر تاريخ الحالة:").pack(pady=10)
+
+        # تصفية بالتاريخ (YYYY-MM-DD)
+        filter_row = tk.Frame(window)
+        filter_row.pack(pady=5)
+        tk.Label(filter_row, text="من:").pack(side=tk.LEFT)
+        self.since_entry = tk.Entry(filter_row, width=11)
+        self.since_entry.pack(side=tk.LEFT)
+        tk.Label(filter_row, text="إلى:").pack(side=tk.LEFT)
+        self.until_entry = tk.Entry(filter_row, width=11)
+        self.until_entry.pack(side=tk.LEFT)
+        tk.Button(filter_row, text="🔍 تصفية", command=self.apply_filter).pack(side=tk.LEFT, padx=5)
+
+        self.rows_frame = tk.Frame(window)
+        self.rows_frame.pack(fill="both", expand=True)
+        self.empty_label = tk.Label(self.rows_frame, text="لا توجد حالات محفوظة بعد.")
+
+        # عمليات على كل اللقطات المختارة مرة واحدة
+        bulk_row = tk.Frame(window)
+        bulk_row.pack(pady=5)
+        tk.Button(bulk_row, text="☑️ تحديد الصفحة", command=self.select_page).pack(side=tk.LEFT)
+        tk.Button(bulk_row, text="✏️ تسمية المحدد", command=lambda: self.selected and rename_snapshot_prompt(self.selection(), self)).pack(side=tk.LEFT, padx=5)
+        tk.Button(bulk_row, text="🗑️ حذف المحدد", command=lambda: self.selected and delete_snapshot(self.selection(), self)).pack(side=tk.LEFT)
+        tk.Button(bulk_row, text="🔀 مقارنة", command=self.compare).pack(side=tk.LEFT, padx=5)
+        tk.Button(bulk_row, text="🧹 تنظيف", command=lambda: clean_snapshots_prompt(self)).pack(side=tk.LEFT)
+        self.selection_label = tk.Label(window)
+        self.selection_label.pack()
+
+        pager = tk.Frame(window)
+        pager.pack(pady=5)
+        self.prev_btn = tk.Button(pager, text="◀ السابق", command=lambda: self.go_to(self.page - 1))
+        self.prev_btn.pack(side=tk.LEFT)
+        self.page_label = tk.Label(pager)
+        self.page_label.pack(side=tk.LEFT, padx=10)
+        self.next_btn = tk.Button(pager, text="التالي ▶", command=lambda: self.go_to(self.page + 1))
+        self.next_btn.pack(side=tk.LEFT)
+
+        self.apply_filter()
+
+    # صف فارغ يُعاد استخدامه لأي لقطة في الصفحة
+    def _create_slot(self):
+        row = tk.Frame(self.rows_frame)
+        slot = {"frame": row, "name": None, "checked": tk.BooleanVar(row)}
+        tk.Checkbutton(row, variable=slot["checked"], command=lambda: self.toggle(slot)).pack(side=tk.LEFT)
+        slot["label"] = tk.Label(row)
+        slot["label"].pack(side=tk.LEFT, padx=5)
+
+        # زر فتح السناب شوت
+        tk.Button(row, text="👁️ عرض", command=lambda: show_snapshot_radar_from_file(slot["name"])).pack(side=tk.LEFT)
+
+        # زر تعديل الاسم
+        tk.Button(row, text="✏️ تعديل الاسم", command=lambda: rename_snapshot_prompt(slot["name"], self)).pack(side=tk.LEFT, padx=5)
+
+        # زر حذف السناب شوت
+        tk.Button(row, text="🗑️ حذف", command=lambda: delete_snapshot(slot["name"], self)).pack(side=tk.LEFT, padx=5)
+        self.slots.append(slot)
+
+    def toggle(self, slot):
+        if slot["checked"].get():
+            self.selected.add(slot["name"])
+        else:
+            self.selected.discard(slot["name"])
+        self._update_selection_label()
+
+    def select_page(self):
+        for slot in self.slots:
+            if slot["name"] is not None:
+                slot["checked"].set(True)
+                self.selected.add(slot["name"])
+        self._update_selection_label()
+
+    # المختارة بترتيب العرض
+    def selection(self):
+        return [name for name in self.names if name in self.selected]
+
+    # لقطة واحدة محددة → مقارنتها بالسابقة لها، لقطتان → مقارنتهما ببعض
+    def compare(self):
+        chosen = sorted(self.selected, key=snapshot_sort_key)
+        if len(chosen) == 1:
+            older = previous_snapshot(chosen[0])
+            if older is None:
+                messagebox.showinfo("ℹ️ مقارنة", "هذه أقدم لقطة - لا توجد لقطة قبلها.", parent=self.window)
+                return
+            chosen.insert(0, older)
+        if len(chosen) != 2:
+            messagebox.showwarning("⚠️ تنبيه", "حدد لقطة واحدة (للمقارنة بالسابقة) أو لقطتين.", parent=self.window)
+            return
+        show_snapshot_compare(self.window, *chosen)
 
-            # زر فتح السناب شوت
-            tk.Button(frame, text="👁️ عرض", command=lambda f=filename: show_snapshot_radar_from_file(f)).pack(side=tk.LEFT)
+    def _update_selection_label(self):
+        self.selection_label.config(text=f"المحدد: {len(self.selected)}" if self.selected else "")
 
-            # زر تعديل الاسم
-            tk.Button(frame, text="✏️ تعديل الاسم", command=lambda f=filename: rename_snapshot_prompt(f, history_win)).pack(side=tk.LEFT, padx=5)
+    # بعد إعادة التسمية: نغير الاسم في النموذج وفي الصف الظاهر فقط
+    def renamed(self, mapping):
+        if not mapping:
+            return
+        for i, name in enumerate(self.names):
+            if name in mapping:
+                self.names[i] = mapping[name]
+        self.selected = {mapping.get(name, name) for name in self.selected}
+        for slot in self.slots:
+            if slot["name"] in mapping:
+                slot["name"] = mapping[slot["name"]]
+                slot["label"].config(text=snapshot_stem(slot["name"]))
+        self._update_selection_label()
+
+    # بعد الحذف: نحذف من النموذج ونعيد عرض الصفحة الحالية بنفس الصفوف
+    def removed(self, filenames):
+        if not filenames:
+            return
+        gone = set(filenames)
+        self.names = [name for name in self.names if name not in gone]
+        self.selected -= gone
+        self.page = min(self.page, self.page_count() - 1)
+        self.render()
+        self._update_selection_label()
+
+    def page_count(self):
+        return max(1, -(-len(self.names) // self.PAGE_SIZE))
+
+    def apply_filter(self):
+        since = self.since_entry.get().strip() or None
+        until = self.until_entry.get().strip() or None
+        try:
+            for day in (since, until):
+                if day:
+                    datetime.strptime(day, "%Y-%m-%d")
+        except ValueError:
+            messagebox.showerror("خطأ", "اكتب التاريخ بصيغة YYYY-MM-DD.")
+            return
 
-            # زر حذف السناب شوت (تم تعديله ليأخذ اسم الملف)
-            tk.Button(frame, text="🗑️ حذف", command=lambda f=filename: delete_snapshot(f, history_win)).pack(side=tk.LEFT, padx=5)
+        self.names = snapshot_range(since, until)[::-1]  # الأحدث أولًا
+        self.page = 0
+        self.render()
+
+    def go_to(self, page):
+        self.page = max(0, min(page, self.page_count() - 1))
+        self.render()
+
+    # عرض الصفحة الحالية - يعدّل فقط الصفوف التي تغيرت لقطتها
+    def render(self):
+        start = self.page * self.PAGE_SIZE
+        page_names = self.names[start:start + self.PAGE_SIZE]
+        while len(self.slots) < len(page_names):
+            self._create_slot()
+
+        for i, slot in enumerate(self.slots):
+            if i < len(page_names):
+                name = page_names[i]
+                if slot["name"] is None:
+                    slot["frame"].pack(pady=5)
+                if slot["name"] != name:
+                    slot["label"].config(text=snapshot_stem(name))
+                    slot["checked"].set(name in self.selected)
+                slot["name"] = name
+            elif slot["name"] is not None:
+                slot["frame"].pack_forget()
+                slot["name"] = None
+
+        if self.names:
+            self.empty_label.pack_forget()
+        else:
+            self.empty_label.pack(pady=20)
+        self.page_label.config(text=f"صفحة {self.page + 1} من {self.page_count()} ({len(self.names)} لقطة)")
+        self.prev_btn.config(state=tk.NORMAL if self.page > 0 else tk.DISABLED)
+        self.next_btn.config(state=tk.NORMAL if self.page < self.page_count() - 1 else tk.DISABLED)
 
 
+def show_history_window():
+    history_win = tk.Toplevel(root)
+    history_win.title("📅 الحالات السابقة")
+    history_win.geometry("450x650")
+    HistoryBrowser(history_win)
 
 
-def rename_snapshot_prompt(filename, parent_window):
-    old_path = os.path.join("snapshots", filename)
-    date_part = filename.replace(".json", "").split("__")[0]  # نأخذ الجزء الخاص بالتاريخ فقط
+# filenames = لقطة واحدة أو مجموعة مختارة (نفس الوصف يُضاف بعد تاريخ كل منها)
+def rename_snapshot_prompt(filenames, browser):
+    if isinstance(filenames, str):
+        filenames = [filenames]
 
     # نافذة صغيرة لطلب الاسم الجديد
-    rename_win = tk.Toplevel(parent_window)
+    rename_win = tk.Toplevel(browser.window)
     rename_win.title("✏️ إعادة التسمية")
     rename_win.geometry("300x150")
 
-    tk.Label(rename_win, text=f"أدخل وصفًا للحالة:\n(سيُضاف بعد التاريخ)").pack(pady=10)
+    hint = "(سيُضاف بعد التاريخ)" if len(filenames) == 1 else f"(سيُضاف بعد تاريخ {len(filenames)} لقطة)"
+    tk.Label(rename_win, text=f"أدخل وصفًا للحالة:\n{hint}").pack(pady=10)
     entry = tk.Entry(rename_win, width=30)
     entry.pack(pady=5)
 
     def apply_rename():
-        new_description = entry.get().strip().replace(" ", "_")
+        new_description = entry.get().strip()
         if not new_description:
             messagebox.showwarning("⚠️ تنبيه", "يجب إدخال وصف جديد.")
             return
 
-        new_filename = f"{date_part}__{new_description}.json"
-        new_path = os.path.join("snapshots", new_filename)
-
-        if os.path.exists(new_path):
-            messagebox.showerror("❌ خطأ", "يوجد ملف بنفس الاسم بالفعل!")
+        renamed, failed = rename_snapshots(filenames, new_description)
+        browser.renamed(renamed)  # تحديث الصفوف المتأثرة فقط
+        if failed:
+            if len(filenames) == 1 and isinstance(failed[0][1], FileExistsError):
+                messagebox.showerror("❌ خطأ", "يوجد ملف بنفس الاسم بالفعل!")
+                return
+            details = "\n".join(f"{name}: {error}" for name, error in failed)
+            messagebox.showerror("❌ خطأ", f"تعذر تعديل اسم {len(failed)} لقطة:\n{details}")
         else:
-            os.rename(old_path, new_path)
             messagebox.showinfo("✅ تم", "تم تعديل الاسم بنجاح.")
-            rename_win.destroy()
-            parent_window.destroy()
-            show_history_window()  # إعادة فتح نافذة التاريخ لتحديثها
+        rename_win.destroy()
 
     tk.Button(rename_win, text="💾 حفظ", command=apply_rename).pack(pady=10)
 
 
-def delete_snapshot(filename, parent_window):
-    confirm = messagebox.askyesno("تأكيد الحذف", f"هل أنت متأكد من حذف اللقطة:\n{filename}؟")
+def delete_snapshot(filenames, browser):
+    if isinstance(filenames, str):
+        filenames = [filenames]
+    if len(filenames) == 1:
+        question = f"هل أنت متأكد من حذف اللقطة:\n{filenames[0]}؟"
+    else:
+        question = f"هل أنت متأكد من حذف {len(filenames)} لقطة؟"
+    confirm = messagebox.askyesno("تأكيد الحذف", question)
     if not confirm:
         return
 
-    path = os.path.join("snapshots", filename)
-    try:
-        os.remove(path)
-        messagebox.showinfo("تم الحذف", f"تم حذف {filename} بنجاح.")
-        parent_window.destroy()  # إغلاق النافذة الحالية
-        show_history_window()    # فتحها من جديد لتحديث العرض
-    except Exception as e:
-        messagebox.showerror("خطأ", f"فشل حذف الملف:\n{e}")
+    deleted, failed = delete_snapshots(filenames)
+    browser.removed(deleted)  # حذف الصفوف من النموذج بدل إعادة فتح النافذة
+    if failed:
+        details = "\n".join(f"{name}: {error}" for name, error in failed)
+        messagebox.showerror("خطأ", f"فشل حذف الملف:\n{details}")
+    elif len(deleted) == 1:
+        messagebox.showinfo("تم الحذف", f"تم حذف {deleted[0]} بنجاح.")
+    else:
+        messagebox.showinfo("تم الحذف", f"تم حذف {len(deleted)} لقطة بنجاح.")
 
 
 
 
 
 
-def show_snapshot_radar_from_file(filename):
-    snapshot_path = os.path.join("snapshots", filename)
+retention_thread = None
+
+
+# تنظيف اللقطات القديمة حسب سياسة الاحتفاظ: تقرير تجريبي أولًا ثم الحذف في الخلفية
+# (المهمة تلتقط مجلد الملف الحالي عند بدايتها)
+def clean_snapshots_prompt(browser):
+    global retention_thread
+    if retention_thread is not None and retention_thread.is_alive():
+        messagebox.showinfo("🧹 تنظيف", "التنظيف يعمل بالفعل في الخلفية.", parent=browser.window)
+        return
+    report = retention_report()
+    if not report["snapshots"] and not report["history_entries"] and not report["store_bytes"]:
+        messagebox.showinfo("🧹 تنظيف", "لا توجد لقطات قديمة للحذف حسب سياسة الاحتفاظ.", parent=browser.window)
+        return
+
+    size_kb = (report["snapshot_bytes"] + report["store_bytes"] + report["history_bytes"]) / 1024
+    question = (f"سيتم حذف {len(report['snapshots'])} لقطة و {report['history_entries']} سجل تاريخ "
+                f"(حوالي {size_kb:.1f} KB).\n"
+                "تُحفظ كل اللقطات لآخر 24 ساعة، ثم لقطة لكل ساعة لأسبوع، ثم لقطة لكل يوم لسنة.\n"
+                "اللقطات التي لها وصف لا تُحذف. متابعة؟")
+    if not messagebox.askyesno("🧹 تنظيف", question, parent=browser.window):
+        return
 
+    def done(result):
+        call_in_ui(finished, result)
+
+    def finished(result):
+        if isinstance(result, Exception):
+            messagebox.showerror("خطأ", f"فشل التنظيف: {result}")
+            return
+        if browser.window.winfo_exists():
+            browser.apply_filter()
+        message = (f"تم حذف {result['deleted']} لقطة و {result['history_dropped']} سجل تاريخ، "
+                   f"وتوفير {result['store_bytes'] / 1024:.1f} KB من مخزن اللقطات.")
+        if result["failed"]:
+            message += f"\nتعذر حذف {len(result['failed'])} لقطة."
+        messagebox.showinfo("🧹 تم التنظيف", message)
+
+    retention_thread = start_retention(done=done)
+
+
+def show_snapshot_radar_from_file(filename):
     try:
-        with open(snapshot_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        data = load_snapshot(filename)
 
         if not isinstance(data, list):
             messagebox.showerror("خطأ", "ملف Snapshot غير صالح.")
@@ -335,46 +908,276 @@ def show_snapshot_radar_from_file(filename):
             messagebox.showinfo("فارغ", "لا توجد مهارات في هذا الـ Snapshot.")
             return
 
-        angles = np.linspace(0, 2 * np.pi, len(labels), endpoint=False).tolist()
-        values += values[:1]
-        angles += angles[:1]
-
-        fig, ax = plt.subplots(figsize=(6, 6), subplot_kw=dict(polar=True))
-        ax.plot(angles, values, 'o-', linewidth=2)
-        ax.fill(angles, values, alpha=0.25)
-        ax.set_thetagrids(np.degrees(angles[:-1]), labels)
-        ax.set_title(f"رادار Snapshot - {filename}", fontsize=14)
-        ax.grid(True)
-
-        plt.show()
+        get_radar_view().show(labels, values, snapshot_radar_title(filename), SNAPSHOT_COLOR)
 
     except Exception:
         messagebox.showerror("خطأ", f"فشل في تحميل Snapshot:\n{traceback.format_exc()}")
 
 
+# مقارنة لقطتين: قائمة الفروق + رادار اللقطتين فوق بعض
+def show_snapshot_compare(parent, older, newer):
+    try:
+        diff = snapshot_diff(older, newer)
+        older_data, newer_data = load_snapshot(older), load_snapshot(newer)
+    except Exception:
+        messagebox.showerror("خطأ", f"فشل في تحميل Snapshot:\n{traceback.format_exc()}", parent=parent)
+        return
+
+    compare_win = tk.Toplevel(parent)
+    compare_win.title("🔀 مقارنة لقطتين")
+    compare_win.geometry("650x700")
+    older_label, newer_label = snapshot_stem(older), snapshot_stem(newer)
+    tk.Label(compare_win, text=f"{older_label}  ←  {newer_label}").pack(pady=5)
+    tk.Label(compare_win, text=format_diff(diff), justify=tk.LEFT).pack(pady=5)
+
+    Figure, FigureCanvasTkAgg = plotting()
+    figure = Figure(figsize=(5, 5))
+    ax = figure.add_subplot(polar=True)
+    draw_radar_overlay(ax, older_data, newer_data, older_label, newer_label, "مقارنة لقطتين")
+    canvas = FigureCanvasTkAgg(figure, master=compare_win)
+    canvas.get_tk_widget().pack(fill="both", expand=True)
+    canvas.draw()
+
+
+# رادار الفريق: شريط p25–p75 ووسيط ومتوسط الملفات المختارة، وفوقه الملف الحالي
+# الإحصاءات من status_core.team (مخزنة حتى يتغير أحد الملفات المختارة)
+def show_team_window():
+    from status_core.team import align_to_team, team_stats  # numpy يُحمّل فقط عند فتح النافذة
+
+    team_win = tk.Toplevel(root)
+    team_win.title("👥 رادار الفريق")
+    team_win.geometry("900x600")
+
+    side = tk.Frame(team_win)
+    side.pack(side=tk.LEFT, fill="y", padx=5, pady=5)
+    tk.Label(side, text="الملفات المشمولة:").pack()
+    profile_list = tk.Listbox(side, selectmode=tk.EXTENDED, exportselection=False, width=22)
+    profile_list.pack(fill="y", expand=True)
+    for name in list_profiles():
+        profile_list.insert(tk.END, name)
+    profile_list.selection_set(0, tk.END)
+    summary_label = tk.Label(side, justify=tk.LEFT)
+    summary_label.pack(pady=5)
+
+    Figure, FigureCanvasTkAgg = plotting()
+    figure = Figure(figsize=(6, 6))
+    ax = figure.add_subplot(polar=True)
+    canvas = FigureCanvasTkAgg(figure, master=team_win)
+    canvas.get_tk_widget().pack(side=tk.LEFT, fill="both", expand=True)
+
+    def draw():
+        names = [profile_list.get(i) for i in profile_list.curselection()]
+        if not names:
+            messagebox.showwarning("⚠️ تنبيه", "اختر ملفًا واحدًا على الأقل.", parent=team_win)
+            return
+        stats = team_stats(names)
+        if not stats["skills"]:
+            messagebox.showinfo("فارغ", "لا توجد مهارات في الملفات المختارة.", parent=team_win)
+            return
+        ax.clear()
+        draw_team_radar(ax, stats["skills"], stats["p25"], stats["median"], stats["p75"], stats["mean"],
+                        profile_values=align_to_team(stats, skills.to_list()), profile_label=current_profile())
+        canvas.draw_idle()
+        summary_label.config(text=f"{len(names)} ملف - {len(stats['skills'])} مهارة")
+
+    tk.Button(side, text="📊 عرض", command=draw).pack(pady=5)
+    draw()
+
+
+# نافذة الاتجاهات: منحنى مهارة عبر اللقطات + إحصاءات الفترة + أكثر المهارات تغيرًا
+# كل الاستعلامات من مصفوفة المهارات المحفوظة (status_core.analytics) - بدون فتح ملفات اللقطات
+class TrendsWindow:
+    MOVERS = 5
+
+    def __init__(self, window):
+        from status_core.analytics import skill_matrix  # numpy يُحمّل فقط عند فتح النافذة
+
+        self.window = window
+        self.skill_matrix = skill_matrix
+        self.matrix = None
+
+        filter_row = tk.Frame(window)
+        filter_row.pack(pady=5)
+        tk.Label(filter_row, text="من:").pack(side=tk.LEFT)
+        self.since_entry = tk.Entry(filter_row, width=11)
+        self.since_entry.pack(side=tk.LEFT, padx=2)
+        tk.Label(filter_row, text="إلى:").pack(side=tk.LEFT)
+        self.until_entry = tk.Entry(filter_row, width=11)
+        self.until_entry.pack(side=tk.LEFT, padx=2)
+        tk.Button(filter_row, text="🔄 تحديث", command=self.refresh).pack(side=tk.LEFT, padx=5)
+
+        body = tk.Frame(window)
+        body.pack(fill="both", expand=True)
+        side = tk.Frame(body)
+        side.pack(side=tk.LEFT, fill="y", padx=5)
+        self.skill_list = tk.Listbox(side, width=20, exportselection=False)
+        self.skill_list.pack(fill="y", expand=True)
+        self.skill_list.bind("<<ListboxSelect>>", lambda event: self.plot())
+        self.movers_label = tk.Label(side, justify=tk.LEFT, anchor="w")
+        self.movers_label.pack(fill="x", pady=5)
+
+        Figure, FigureCanvasTkAgg = plotting()
+        self.figure = Figure(figsize=(6, 4))
+        self.ax = self.figure.add_subplot()
+        self.ax.set_ylim(0, 100)
+        self.ax.xaxis_date()
+        self.line, = self.ax.plot([], [], "o-", color=SNAPSHOT_COLOR)
+        self.canvas = FigureCanvasTkAgg(self.figure, master=body)
+        self.canvas.get_tk_widget().pack(side=tk.LEFT, fill="both", expand=True)
+
+        self.stats_label = tk.Label(window, text="اختر مهارة لعرض تطورها.")
+        self.stats_label.pack(pady=5)
+
+        self.refresh()
+
+    def _period(self):
+        return self.since_entry.get().strip() or None, self.until_entry.get().strip() or None
+
+    # تحميل اللقطات الجديدة فقط ثم تحديث القائمة وأكثر المهارات تغيرًا
+    def refresh(self):
+        self.matrix = self.skill_matrix()
+        since, until = self._period()
+        try:
+            movers = self.matrix.biggest_movers(since, until, self.MOVERS)
+        except ValueError:
+            messagebox.showwarning("⚠️ تنبيه", "صيغة التاريخ يجب أن تكون YYYY-MM-DD", parent=self.window)
+            return
 
+        selected = self.selected_skill()
+        if list(self.skill_list.get(0, tk.END)) != self.matrix.skills:
+            self.skill_list.delete(0, tk.END)
+            for skill in self.matrix.skills:
+                self.skill_list.insert(tk.END, skill)
+            if selected in self.matrix.columns:
+                self.skill_list.selection_set(self.matrix.columns[selected])
+
+        lines = [f"{'📈' if change > 0 else '📉'} {skill}: {first:g} → {last:g} ({change:+g})"
+                 for skill, first, last, change in movers]
+        self.movers_label.config(text="أكثر المهارات تغيرًا:\n" + ("\n".join(lines) or "لا يوجد تغيير"))
+        self.plot()
+
+    def selected_skill(self):
+        selection = self.skill_list.curselection()
+        return self.skill_list.get(selection[0]) if selection else None
+
+    # تحديث بيانات الخط في مكانه بدل إعادة بناء الرسم
+    def plot(self):
+        skill = self.selected_skill()
+        if skill is None or skill not in self.matrix.columns:
+            return
+        since, until = self._period()
+        try:
+            times, values = self.matrix.trend(skill, since, until)
+            stats = self.matrix.stats(since, until).get(skill)
+        except ValueError:
+            messagebox.showwarning("⚠️ تنبيه", "صيغة التاريخ يجب أن تكون YYYY-MM-DD", parent=self.window)
+            return
 
+        self.line.set_data(times, values)
+        self.ax.set_title(skill)
+        if times:
+            self.ax.relim()
+            self.ax.autoscale_view(scaley=False)
+        self.figure.autofmt_xdate()
+        self.canvas.draw_idle()
+
+        if stats:
+            self.stats_label.config(text=f"أقل: {stats['min']:g}   أعلى: {stats['max']:g}   "
+                                         f"متوسط: {stats['mean']:.1f}   ({stats['count']} لقطة)")
+        else:
+            self.stats_label.config(text="لا توجد قيم لهذه المهارة في الفترة المحددة.")
 
-# نافذة البرنامج
-skills = load_skills()
-entries = {}
 
-root = tk.Tk()
-root.title("إدارة المهارات")
-root.geometry("400x600")
+def show_trends_window():
+    trends_win = tk.Toplevel(root)
+    trends_win.title("📈 اتجاهات المهارات")
+    trends_win.geometry("800x550")
+    TrendsWindow(trends_win)
 
-frame = tk.Frame(root)
-frame.pack(pady=10)
 
-# بناء واجهة البداية
-build_ui()
 
-# أزرار الحفظ والعرض
-tk.Button(root, text="💾 حفظ التعديلات", command=on_save, bg="lightblue").pack(pady=10)
-tk.Button(root, text="📊 عرض الرادار", command=on_show, bg="lightgreen").pack(pady=5)
-tk.Button(root, text="📸 حفظ لقطة Snapshot", command=save_snapshot, bg="lightgray").pack(pady=10)
-btn_show_history = tk.Button(root, text="📜 عرض التاريخ", command=show_history_window)
-btn_show_history.pack(pady=5)
 
 
-root.mainloop()
+# نافذة البرنامج
+# (تُبنى فقط عند تشغيل الملف مباشرة - الاستيراد لا يفتح نافذة)
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="إدارة المهارات")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="طباعة زمن كل مرحلة استيراد وتهيئة عند التشغيل")
+
+    storage_group = add_storage_arguments(parser)
+    storage_group.add_argument("--snapshot-interval", type=float, default=5.0, metavar="SECONDS",
+                               help="أقل مدة بين لقطات سجل التاريخ (الطلبات الأسرع تُؤجل، 0 = بدون حد، الافتراضي 5)")
+    storage_group.add_argument("--snapshot-burst", type=int, default=1, metavar="N",
+                               help="عدد اللقطات المسموح بها متتالية قبل تطبيق المدة (الافتراضي 1)")
+    storage_group.add_argument("--snapshot-every", type=float, default=3600.0, metavar="SECONDS",
+                               help="لقطة تلقائية كل هذه المدة لو تغيرت المهارات (0 = بدون، الافتراضي ساعة)")
+    storage_group.add_argument("--autosave-delay", type=float, default=0.5, metavar="SECONDS",
+                               help="دمج التعديلات المتتالية خلال هذه المدة في حفظ واحد (الافتراضي 0.5)")
+    add_batch_arguments(parser)
+    args = parser.parse_args()
+
+    with startup_phase("open storage"):
+        open_storage(args, parser)
+
+    # أوامر batch (نفس python -m status_core) تنتهي هنا بدون نافذة
+    code = run_batch(args)
+    if code is not None:
+        sys.exit(code)
+    if tk is None:
+        parser.error("tkinter غير متوفر: الواجهة تحتاج Tk، والأوامر بدون واجهة متاحة عبر python -m status_core")
+
+    with startup_phase("load data"):
+        # open_profile يرحّل السجل القديم ويسترجع skills.json التالف عند أول فتح (هنا أو مع --profile)
+        skills = SkillStore(open_profile(current_profile()))
+        recovered_from = pop_recovered(current_profile())
+        saver = DebouncedSaver(save_profile_skills, args.autosave_delay, on_error=on_save_error)
+        scheduler = SnapshotScheduler(args.snapshot_interval, args.snapshot_burst, args.snapshot_every,
+                                      prepare=saver.flush)
+
+    with startup_phase("create window"):
+        root = tk.Tk()
+        root.title(f"إدارة المهارات - {current_profile()}")
+        root.geometry("400x600")
+        root.protocol("WM_DELETE_WINDOW", on_close)
+
+    with startup_phase("build UI"):
+        # اللوحة اليسرى: المهارات والأزرار (الرادار يُضاف على اليمين عند أول عرض)
+        main_panel = tk.Frame(root, width=400)
+        main_panel.pack(side=tk.LEFT, fill="y")
+        build_profile_picker(main_panel)
+
+        frame = tk.Frame(main_panel)
+        frame.pack(pady=10, fill="x")
+
+        # بناء واجهة البداية
+        build_ui()
+
+        # أزرار الحفظ والعرض
+        tk.Button(main_panel, text="💾 حفظ التعديلات", command=on_save, bg="lightblue").pack(pady=10)
+        tk.Button(main_panel, text="📊 عرض الرادار", command=on_show, bg="lightgreen").pack(pady=5)
+        tk.Button(main_panel, text="📸 حفظ لقطة Snapshot", command=on_snapshot, bg="lightgray").pack(pady=10)
+        btn_show_history = tk.Button(main_panel, text="📜 عرض التاريخ", command=show_history_window)
+        btn_show_history.pack(pady=5)
+        tk.Button(main_panel, text="📈 اتجاهات المهارات", command=show_trends_window).pack(pady=5)
+        tk.Button(main_panel, text="👥 رادار الفريق", command=show_team_window).pack(pady=5)
+        bulk_row = tk.Frame(main_panel)
+        bulk_row.pack(pady=5)
+        tk.Button(bulk_row, text="📥 استيراد", command=import_skills_prompt).pack(side=tk.LEFT, padx=5)
+        tk.Button(bulk_row, text="📤 تصدير", command=export_skills_prompt).pack(side=tk.LEFT, padx=5)
+
+    # بعد أول رسم للنافذة: تقرير التشغيل ثم تسخين matplotlib في الخلفية
+    def on_first_idle():
+        if args.profile_startup:
+            print_startup_profile("حتى ظهور النافذة")
+        warm_plotting(report=args.profile_startup)
+        arm_snapshot_timer()
+
+    if recovered_from:
+        root.after(0, lambda: show_recovery_warning(recovered_from))
+    root.after(100, on_first_idle)
+    root.after(UI_POLL_MS, poll_ui_calls)
+    try:
+        root.mainloop()
+    finally:
+        saver.close()  # حتى لو انتهت الحلقة بطريقة أخرى (Ctrl+C مثلًا)
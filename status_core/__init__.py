@@ -0,0 +1,35 @@
+# قلب التطبيق بدون واجهة: نموذج البيانات والتخزين واللقطات
+# (لا يستورد tkinter ولا matplotlib - يصلح للمهام الخلفية والسكربتات)
+from .paths import SKILLS_FILE, SNAPSHOT_FOLDER, data_path, set_data_dir
+from .model import SkillStore
+from .storage import SnapshotError, read_skills_file, iter_skills, load_skills, save_skills, recover_skills
+from .snapshots import (
+    skills_fingerprint, snapshot_stem, snapshot_sort_key, snapshot_index, snapshot_range,
+    last_snapshot_fingerprint, snapshot_if_changed,
+    store_snapshot_records, write_snapshot, load_snapshot,
+    rename_snapshot, rename_snapshots, delete_snapshot, delete_snapshots, snapshot_mtime,
+    snapshot_diff, previous_snapshot,
+    SNAPSHOT_FORMATS, SNAPSHOT_SUFFIXES, set_snapshot_format, snapshot_format, convert_snapshots,
+    benchmark_snapshot_formats,
+    snapshot_store_size, snapshot_store_garbage, sweep_snapshot_store,
+)
+from .diff import diff_skills, is_empty_diff, format_diff
+from .history import (
+    migrate_history_json, append_history, history_count, read_history_entry,
+    iter_history, history_tail, history_generation, compact_history, save_snapshot,
+)
+from .backend import use_sqlite, use_json
+from .autosave import DebouncedSaver
+from .scheduler import TokenBucket, SnapshotScheduler
+from .profiles import (
+    DEFAULT_PROFILE, profile_index, list_profiles, current_profile, create_profile,
+    open_profile, pop_recovered, save_profile_skills, profile_skills,
+)
+from .bulk import BULK_FORMATS, detect_format, import_into, import_skills, export_skills
+from .retention import (
+    DEFAULT_RETENTION, load_retention_policy, save_retention_policy,
+    retention_report, apply_retention, start_retention,
+)
+from .atomic import atomic_write, atomic_append, atomic_batch
+from .binary import BINARY_SUFFIX, encode_binary_snapshot, read_binary_snapshot
+from .jsonstream import iter_json_array, iter_json_file, read_json_array
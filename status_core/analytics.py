@@ -0,0 +1,154 @@
+import bisect
+import warnings
+from datetime import datetime
+
+import numpy as np
+
+from . import backend, paths
+from .history import history_count, history_generation, iter_history
+from .snapshots import load_snapshot, snapshot_index, snapshot_sort_key
+
+
+# مصفوفة أعمدة: صف لكل لقطة وعمود لكل مهارة (NaN = المهارة غير موجودة في اللقطة)
+# تُبنى مرة واحدة ثم تُضاف لها اللقطات الجديدة فقط عند refresh
+class SkillMatrix:
+    def __init__(self, source="snapshots"):
+        if source not in ("snapshots", "history"):
+            raise ValueError(f"مصدر غير معروف: {source}")
+        self.source = source
+        self.names = []         # اسم اللقطة لكل صف (للسجل: رقمه)
+        self.times = []         # datetime لكل صف (مرتبة تصاعديًا)
+        self.skills = []        # اسم المهارة لكل عمود
+        self.columns = {}       # اسم المهارة -> رقم العمود
+        self._data = np.full((16, 8), np.nan)
+        self._rows = 0
+        self._generation = None  # نسخة سجل التاريخ التي بُنيت منها الصفوف
+
+    # المصفوفة الفعلية (بدون السعة الاحتياطية)
+    @property
+    def values(self):
+        return self._data[:self._rows, :len(self.skills)]
+
+    def _reset(self):
+        self.__init__(self.source)
+
+    # إضافة صف: السعة تتضاعف عند الحاجة فالإضافة O(1) في المتوسط
+    def _append_row(self, name, when, records):
+        for record in records:
+            if record["name"] not in self.columns:
+                self.columns[record["name"]] = len(self.skills)
+                self.skills.append(record["name"])
+
+        rows, cols = self._data.shape
+        if self._rows == rows or len(self.skills) > cols:
+            grown = np.full((rows * 2 if self._rows == rows else rows,
+                             max(cols, len(self.skills) * 2)), np.nan)
+            grown[:rows, :cols] = self._data
+            self._data = grown
+
+        row = self._data[self._rows]
+        for record in records:
+            row[self.columns[record["name"]]] = record["value"]
+        self._rows += 1
+        self.names.append(name)
+        self.times.append(when)
+
+    # تحميل اللقطات الجديدة فقط - وإعادة البناء لو تغير ما سبق تحميله (حذف/إعادة تسمية)
+    def refresh(self):
+        if self.source == "history":
+            # الضغط/الاحتفاظ يعيد ترقيم اللقطات → الصفوف القديمة لم تعد مطابقة، نعيد البناء
+            generation = history_generation()
+            count = history_count()
+            if generation != self._generation or count < self._rows:
+                self._reset()
+                self._generation = generation
+            for i, entry in enumerate(iter_history(self._rows), self._rows):
+                when = datetime.strptime(entry["timestamp"], "%Y-%m-%d %H:%M:%S")
+                self._append_row(i, when, entry["skills"])
+            return self
+
+        names = [name for name in snapshot_index() if snapshot_sort_key(name)[0]]  # المؤرخة فقط
+        if names[:len(self.names)] != self.names:
+            self._reset()
+        for name in names[len(self.names):]:
+            try:
+                records = load_snapshot(name)
+            except (OSError, KeyError, ValueError) as e:
+                print(f"⚠️ تخطي لقطة {name}: {e}")
+                records = []
+            when = datetime.strptime(snapshot_sort_key(name)[1], "%Y-%m-%d_%H-%M-%S")
+            self._append_row(name, when, records)
+        return self
+
+    # حدود الصفوف داخل فترة (since/until: datetime أو YYYY-MM-DD شاملة)
+    def _window(self, since=None, until=None):
+        if isinstance(since, str):
+            since = datetime.strptime(since, "%Y-%m-%d")
+        if isinstance(until, str):
+            until = datetime.strptime(until + " 23:59:59", "%Y-%m-%d %H:%M:%S")
+        start = bisect.bisect_left(self.times, since) if since else 0
+        end = bisect.bisect_right(self.times, until) if until else self._rows
+        return start, end
+
+    # تطور مهارة واحدة: (الأوقات، القيم) للقطات التي تحتويها فقط
+    def trend(self, skill, since=None, until=None):
+        start, end = self._window(since, until)
+        column = self.values[start:end, self.columns[skill]]
+        present = ~np.isnan(column)
+        times = [t for t, keep in zip(self.times[start:end], present) if keep]
+        return times, column[present]
+
+    # min/max/mean/count لكل المهارات في الفترة مرة واحدة - {مهارة: {...}}
+    def stats(self, since=None, until=None):
+        start, end = self._window(since, until)
+        window = self.values[start:end]
+        counts = np.count_nonzero(~np.isnan(window), axis=0)
+        result = {}
+        if window.size:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", RuntimeWarning)  # أعمدة كلها NaN في الفترة
+                mins = np.nanmin(window, axis=0)
+                maxs = np.nanmax(window, axis=0)
+                means = np.nanmean(window, axis=0)
+            for j, skill in enumerate(self.skills):
+                if counts[j]:
+                    result[skill] = {"min": float(mins[j]), "max": float(maxs[j]),
+                                     "mean": float(means[j]), "count": int(counts[j])}
+        return result
+
+    # أكثر المهارات تغيرًا بين أول وآخر قيمة لها في الفترة - [(مهارة، أول، آخر، الفرق)]
+    def biggest_movers(self, since=None, until=None, top=5):
+        start, end = self._window(since, until)
+        window = self.values[start:end]
+        if not window.size:
+            return []
+
+        present = ~np.isnan(window)
+        has_value = present.any(axis=0)
+        first_row = present.argmax(axis=0)
+        last_row = window.shape[0] - 1 - present[::-1].argmax(axis=0)
+        cols = np.arange(window.shape[1])
+        first = window[first_row, cols]
+        last = window[last_row, cols]
+        change = np.where(has_value, last - first, 0.0)
+
+        order = np.argsort(-np.abs(change), kind="stable")[:top]
+        return [(self.skills[j], float(first[j]), float(last[j]), float(change[j]))
+                for j in order if has_value[j] and change[j] != 0]
+
+
+_matrices = {}   # (مجلد البيانات، قاعدة SQLite، المصدر) -> SkillMatrix
+
+
+# نسيان المصفوفات المحفوظة لمجلد بيانات (عند إغلاق ملفه)
+def drop_caches(folder, exclude=None):
+    paths.drop_cached_paths(_matrices, folder, exclude)
+
+
+# المصفوفة المحفوظة لمجلد البيانات الحالي بعد تحميل أي لقطات جديدة
+def skill_matrix(source="snapshots"):
+    key = (paths.DATA_DIR, backend.active_path(), source)
+    matrix = _matrices.get(key)
+    if matrix is None:
+        matrix = _matrices[key] = SkillMatrix(source)
+    return matrix.refresh()
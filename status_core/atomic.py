@@ -0,0 +1,91 @@
+import os
+import threading
+from contextlib import contextmanager
+
+
+# الكتابة الآمنة: الملف القديم يبقى كما هو حتى تكتمل النسخة الجديدة على القرص
+# (ملف مؤقت بجانبه → fsync → os.replace → fsync للمجلد) فانقطاع الكهرباء لا يترك ملفًا فارغًا
+
+_batches = threading.local()           # الدفعة المفتوحة في هذا الـ thread (إن وجدت)
+
+
+def _fsync_dir(folder):
+    if os.name != "posix":
+        return  # ويندوز لا يدعم fsync للمجلدات
+    fd = os.open(folder or ".", os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def fsync_path(path):
+    with open(path, "rb") as f:
+        os.fsync(f.fileno())
+
+
+def _to_bytes(data):
+    return data.encode("utf-8") if isinstance(data, str) else data
+
+
+# داخل دفعة: الإلحاقات المعلقة تصل للقرص قبل أي ملف قد يُشير إليها (المخزن قبل ملف اللقطة)
+def _sync_appends(batch):
+    for path in batch["appends"]:
+        fsync_path(path)
+        batch["folders"].add(os.path.dirname(path))
+    batch["appends"].clear()
+
+
+# استبدال محتوى الملف بالكامل بشكل ذري
+def atomic_write(path, data):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_to_bytes(data))
+        f.flush()
+        os.fsync(f.fileno())
+    replace_durably(tmp_path, path, synced=True)
+
+
+# استبدال ملف بملف مؤقت مكتوب بالكامل (مثل ناتج ضغط السجل) بعد التأكد من وصوله للقرص
+def replace_durably(tmp_path, path, synced=False):
+    if not synced:
+        fsync_path(tmp_path)
+    batch = getattr(_batches, "current", None)
+    if batch is not None:
+        _sync_appends(batch)
+    os.replace(tmp_path, path)
+    if batch is not None:
+        batch["folders"].add(os.path.dirname(path))
+    else:
+        _fsync_dir(os.path.dirname(path))
+
+
+# إلحاق بنهاية ملف (السجلات والمخازن الإلحاقية) - fsync فوري، أو مؤجل داخل دفعة
+def atomic_append(path, data):
+    batch = getattr(_batches, "current", None)
+    with open(path, "ab") as f:
+        f.write(_to_bytes(data))
+        if batch is None:
+            f.flush()
+            os.fsync(f.fileno())
+    if batch is not None:
+        batch["appends"].add(path)
+
+
+# تجميع كتابات عملية حفظ واحدة لتقليل عدد مرات fsync:
+# الإلحاقات المتتالية تُدمج في fsync واحد لكل ملف، ومجلدات الملفات المستبدلة تُزامن مرة واحدة في النهاية
+# (محتوى كل ملف مستبدل يُزامن دائمًا قبل الاستبدال - هذا ما يمنع الملف الفارغ بعد الانقطاع)
+@contextmanager
+def atomic_batch():
+    if getattr(_batches, "current", None) is not None:
+        yield  # دفعة داخل دفعة → تنضم للخارجية
+        return
+
+    batch = _batches.current = {"appends": set(), "folders": set()}
+    try:
+        yield
+    finally:
+        _batches.current = None
+        _sync_appends(batch)
+        for folder in batch["folders"]:
+            _fsync_dir(folder)
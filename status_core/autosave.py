@@ -0,0 +1,82 @@
+import threading
+import time
+
+
+# حفظ مؤجل في الخلفية: التعديلات المتتالية خلال delay ثانية تُدمج في كتابة واحدة لآخر نسخة،
+# والكتابة نفسها في thread منفصل حتى لا تتوقف الواجهة
+# on_error يُستدعى من الـ worker - لا يلمس Tk: الواجهة تضع الخطأ في queue يقرؤها الـ thread الرئيسي
+# (الـ thread الرئيسي قد يكون منتظرًا داخل flush/close)
+class DebouncedSaver:
+    def __init__(self, save, delay=0.5, on_error=None):
+        self.save = save
+        self.delay = delay
+        self.on_error = on_error
+        self._cond = threading.Condition()
+        self._pending = None     # آخر نسخة لم تُحفظ بعد
+        self._due = 0.0          # موعد حفظها (يتأخر مع كل تعديل جديد)
+        self._busy = False       # الـ worker يكتب الآن
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="autosave", daemon=True)
+        self._thread.start()
+
+    # تسجيل آخر نسخة من البيانات - ما سبقها ولم يُحفظ يُستبدل بها
+    def schedule(self, data):
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("تم إغلاق الحفظ التلقائي")
+            self._pending = data
+            self._due = time.monotonic() + self.delay
+            self._cond.notify_all()
+
+    @property
+    def pending(self):
+        with self._cond:
+            return self._pending is not None or self._busy
+
+    def _run(self):
+        with self._cond:
+            while True:
+                while self._pending is None and not self._closed:
+                    self._cond.wait()
+                if self._pending is None:
+                    return  # أُغلق ولا يوجد ما يُحفظ
+
+                remaining = self._due - time.monotonic()
+                if remaining > 0 and not self._closed:
+                    self._cond.wait(remaining)
+                    continue
+
+                data, self._pending = self._pending, None
+                self._busy = True
+                self._cond.release()
+                try:
+                    self._save(data)
+                finally:
+                    self._cond.acquire()
+                    self._busy = False
+                    self._cond.notify_all()
+
+    def _save(self, data):
+        try:
+            self.save(data)
+        except Exception as e:
+            if self.on_error is not None:
+                self.on_error(e)
+            else:
+                print("❌ فشل الحفظ التلقائي:", e)
+
+    # حفظ أي تعديل معلق الآن (بدون انتظار المهلة) والانتظار حتى ينتهي
+    def flush(self):
+        with self._cond:
+            if self._pending is not None:
+                self._due = 0.0
+                self._cond.notify_all()
+            while self._pending is not None or self._busy:
+                self._cond.wait()
+
+    # عند الخروج: حفظ المعلق ثم إيقاف الـ worker
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join()
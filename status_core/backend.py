@@ -0,0 +1,49 @@
+# اختيار مكان التخزين: ملفات JSON (الافتراضي) أو قاعدة SQLite
+# الدوال العامة في storage/snapshots/history تسأل active() وتحوّل الطلب للقاعدة لو مفعلة
+import threading
+from contextlib import contextmanager
+
+_active = None
+_pinned = threading.local()            # قاعدة مثبتة لـ thread معيّن (مع paths.pinned_data_dir)
+
+
+def active():
+    if getattr(_pinned, "set", False):
+        return _pinned.db
+    return _active
+
+
+# تثبيت القاعدة (أو None = ملفات JSON) داخل thread مهمة خلفية
+@contextmanager
+def pinned(db):
+    previous = (getattr(_pinned, "set", False), getattr(_pinned, "db", None))
+    _pinned.set, _pinned.db = True, db
+    try:
+        yield db
+    finally:
+        _pinned.set, _pinned.db = previous
+
+
+# تفعيل قاعدة SQLite (path افتراضيًا status.db داخل مجلد البيانات)
+def use_sqlite(path=None, import_json=False):
+    global _active
+    from .sqlite_backend import SqliteBackend
+
+    db = SqliteBackend(path)
+    if import_json:
+        db.import_json()
+    _active = db
+    return db
+
+
+# الرجوع لملفات JSON
+def use_json():
+    global _active
+    if _active is not None:
+        _active.close()
+    _active = None
+
+
+# مسار القاعدة المفعلة (لنقلها لعمليات أخرى) أو None
+def active_path():
+    return _active.path if _active is not None else None
@@ -0,0 +1,52 @@
+import mmap
+import struct
+
+
+# صيغة لقطة ثنائية مضغوطة (اختيارية): جدول أسماء المهارات + قيمة uint8 لكل مهارة (0 - 100)
+#   "SKB1" | uint32 العدد | uint32 حجم جدول الأسماء | الأسماء utf-8 مفصولة بـ \0 | uint8 القيم
+# الأرقام little-endian - الملف باسم .skb، والقارئ يعرف الصيغة من أول 4 بايت
+# (لقطات ثنائية قديمة باسم .json ما زالت تُقرأ، و convert_snapshots يصحح أسماءها)
+# الصيغة مستقلة: كل ملف لقطة كاملة بدون keyframes ولا فروق ولا snapshots/.store
+BINARY_MAGIC = b"SKB1"
+BINARY_SUFFIX = ".skb"
+_HEADER = struct.Struct("<4sII")
+
+
+# ترميز قائمة مهارات - None لو لا تصلح للصيغة (حقول إضافية، قيمة خارج 0 - 100، \0 في الاسم)
+def encode_binary_snapshot(skills_list):
+    names = []
+    values = bytearray()
+    for record in skills_list:
+        if not isinstance(record, dict) or record.keys() != {"name", "value"}:
+            return None
+        name, value = record["name"], record["value"]
+        if not isinstance(name, str) or "\0" in name or type(value) is not int or not 0 <= value <= 100:
+            return None
+        names.append(name)
+        values.append(value)
+    table = "\0".join(names).encode("utf-8")
+    return _HEADER.pack(BINARY_MAGIC, len(values), len(table)) + table + bytes(values)
+
+
+# قراءة لقطة ثنائية من ملف مفتوح (rb) عبر mmap - جدول الأسماء يُفك مرة واحدة والقيم بايتات مباشرة
+def read_binary_snapshot(f):
+    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        if len(mm) < _HEADER.size:
+            raise ValueError("لقطة ثنائية ناقصة")
+        magic, count, table_size = _HEADER.unpack_from(mm, 0)
+        if magic != BINARY_MAGIC:
+            raise ValueError("ليست لقطة ثنائية")
+        pos = _HEADER.size
+        table = mm[pos:pos + table_size].decode("utf-8")
+        values = mm[pos + table_size:pos + table_size + count]
+
+    names = table.split("\0") if count else []
+    if len(names) != count or len(values) != count:
+        raise ValueError("لقطة ثنائية ناقصة")
+    return [{"name": name, "value": value} for name, value in zip(names, values)]
+
+
+def is_binary_snapshot(path):
+    with open(path, "rb") as f:
+        return f.read(len(BINARY_MAGIC)) == BINARY_MAGIC
+
@@ -0,0 +1,124 @@
+import csv
+import json
+import os
+from itertools import islice
+
+from .atomic import replace_durably
+from .model import SkillStore
+from .profiles import save_profile_skills
+from .storage import iter_skills, load_skills
+
+
+# استيراد وتصدير المهارات بالجملة (CSV أو JSON-Lines) - الملف يُقرأ ويُكتب سطرًا سطرًا عبر generators
+BULK_FORMATS = ("csv", "jsonl")
+BULK_BATCH = 1000                      # عدد الصفوف في كل دفعة upsert
+MAX_REPORTED_ERRORS = 100              # نحتفظ بأول الأخطاء فقط حتى لا تكبر الذاكرة مع ملف تالف
+
+
+def detect_format(path):
+    ext = os.path.splitext(path)[1].lower().lstrip(".")
+    if ext in ("jsonl", "ndjson"):
+        return "jsonl"
+    if ext == "csv":
+        return "csv"
+    raise ValueError(f"صيغة غير معروفة: {path} (المدعوم: .csv أو .jsonl)")
+
+
+# صفوف CSV: (رقم السطر، الاسم، القيمة كنص) - السطر الأول يُتخطى لو كان عناوين name,value
+def read_csv_rows(path):
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        for line_no, row in enumerate(csv.reader(f), 1):
+            if not row or not any(cell.strip() for cell in row):
+                continue
+            if line_no == 1 and [cell.strip().lower() for cell in row[:2]] == ["name", "value"]:
+                continue
+            yield line_no, row[0], row[1] if len(row) > 1 else ""
+
+
+# صفوف JSON-Lines: كل سطر {"name": ..., "value": ...}
+def read_jsonl_rows(path):
+    with open(path, "r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                obj = json.loads(line)
+                yield line_no, obj["name"], obj["value"]
+            except (ValueError, KeyError, TypeError):
+                yield line_no, None, None  # تُرفض في validate_rows
+
+
+def read_rows(path, fmt=None):
+    fmt = fmt or detect_format(path)
+    return read_csv_rows(path) if fmt == "csv" else read_jsonl_rows(path)
+
+
+# نفس شرط إدخال مهارة من الواجهة: اسم غير فارغ وقيمة صحيحة بين 0 و 100
+# الصفوف الصالحة تمر كأزواج (name, value)، والمرفوضة تُسجل في report
+def validate_rows(rows, report):
+    for line_no, name, value in rows:
+        try:
+            name = name.strip() if isinstance(name, str) else ""
+            # عدد صحيح فعلي أو نص يقبله int() كما في الواجهة - لا bool ولا كسور (50.9 لا تُقرّب إلى 50)
+            if type(value) is not int and not isinstance(value, str):
+                raise ValueError
+            value = int(value)
+            if not name or not (0 <= value <= 100):
+                raise ValueError
+        except (TypeError, ValueError):
+            report["rejected"] += 1
+            if len(report["errors"]) < MAX_REPORTED_ERRORS:
+                report["errors"].append((line_no, "تأكد من إدخال اسم وقيمة صحيحة بين 0 و 100."))
+            continue
+        yield name, value
+
+
+def batched(items, size):
+    items = iter(items)
+    while True:
+        batch = list(islice(items, size))
+        if not batch:
+            return
+        yield batch
+
+
+# استيراد ملف إلى مخزن مهارات (upsert على دفعات) - بدون حفظ، المستدعي يحفظ مرة واحدة في النهاية
+# ترجع {"imported", "rejected", "errors": [(رقم السطر، السبب)]}
+def import_into(store, path, fmt=None, batch_size=BULK_BATCH):
+    report = {"imported": 0, "rejected": 0, "errors": []}
+    for batch in batched(validate_rows(read_rows(path, fmt), report), batch_size):
+        store.update(batch)
+        report["imported"] += len(batch)
+    return report
+
+
+# استيراد ملف إلى ملف المهارات الحالي وحفظه مرة واحدة
+def import_skills(path, fmt=None, batch_size=BULK_BATCH):
+    store = SkillStore(load_skills())
+    report = import_into(store, path, fmt, batch_size)
+    if store.dirty:
+        save_profile_skills(store.to_list())
+    return report
+
+
+# تصدير أزواج (name, value) إلى ملف سطرًا سطرًا (ملف مؤقت ثم استبدال) - ترجع عدد المهارات
+def export_skills(path, items=None, fmt=None):
+    fmt = fmt or detect_format(path)
+    if items is None:
+        items = ((skill["name"], skill["value"]) for skill in iter_skills())
+
+    count = 0
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8", newline="") as f:
+        if fmt == "csv":
+            writer = csv.writer(f)
+            writer.writerow(["name", "value"])
+            for name, value in items:
+                writer.writerow([name, value])
+                count += 1
+        else:
+            for name, value in items:
+                f.write(json.dumps({"name": name, "value": value}, ensure_ascii=False) + "\n")
+                count += 1
+    replace_durably(tmp_path, path)
+    return count
@@ -0,0 +1,158 @@
+import argparse
+
+from .backend import use_sqlite
+from .bulk import export_skills, import_skills
+from .export import EXPORT_FORMATS, export_radars
+from .profiles import list_profiles, open_profile
+from .retention import apply_retention, retention_report
+from .snapshots import SNAPSHOT_FORMATS, benchmark_snapshot_formats, convert_snapshots, set_snapshot_format
+
+
+# أوامر بدون واجهة (batch): تعمل بدون tkinter - python -m status_core أو من Status_app.py
+# الواجهة تضيف خياراتها الخاصة فوق نفس المجموعات
+
+
+# خيارات التخزين المشتركة - ترجع المجموعة حتى تضيف الواجهة خياراتها إليها
+def add_storage_arguments(parser):
+    storage_group = parser.add_argument_group("التخزين")
+    storage_group.add_argument("--backend", choices=("json", "sqlite"), default="json",
+                               help="ملفات JSON (الافتراضي) أو قاعدة SQLite واحدة")
+    storage_group.add_argument("--db", metavar="PATH", help="مسار قاعدة SQLite (الافتراضي status.db)")
+    storage_group.add_argument("--import-json", action="store_true",
+                               help="نسخ skills.json واللقطات والتاريخ إلى قاعدة SQLite قبل التشغيل")
+    storage_group.add_argument("--profile", metavar="NAME",
+                               help="فتح ملف مهارات معيّن من profiles/ (الافتراضي: الملف الأصلي)")
+    storage_group.add_argument("--snapshot-format", choices=SNAPSHOT_FORMATS, default="json",
+                               help="صيغة اللقطات الجديدة: json (الافتراضي) أو binary (أسماء + قيم uint8)")
+    return storage_group
+
+
+def add_batch_arguments(parser):
+    retention_group = parser.add_argument_group("سياسة الاحتفاظ (بدون واجهة)")
+    retention_group.add_argument("--retention-report", action="store_true",
+                                 help="عرض ما سيُحذف من اللقطات والتاريخ والمساحة التي ستتوفر، بدون حذف")
+    retention_group.add_argument("--apply-retention", action="store_true",
+                                 help="حذف اللقطات القديمة حسب retention.json (أو السياسة الافتراضية)")
+
+    format_group = parser.add_argument_group("صيغة اللقطات (بدون واجهة)")
+    format_group.add_argument("--convert-snapshots", choices=SNAPSHOT_FORMATS, metavar="FORMAT",
+                              help="تحويل اللقطات الموجودة إلى json أو binary في مكانها")
+    format_group.add_argument("--benchmark-snapshots", action="store_true",
+                              help="مقارنة حجم وزمن تحميل اللقطات الموجودة بصيغتها الحالية مع الصيغة الثنائية")
+
+    bulk_group = parser.add_argument_group("استيراد/تصدير المهارات بالجملة (بدون واجهة)")
+    bulk_group.add_argument("--import-skills", metavar="FILE",
+                            help="إضافة/تعديل المهارات من ملف .csv أو .jsonl (name,value لكل سطر)")
+    bulk_group.add_argument("--export-skills", metavar="FILE",
+                            help="كتابة المهارات الحالية إلى ملف .csv أو .jsonl")
+
+    export_group = parser.add_argument_group("تصدير الرادارات (بدون واجهة)")
+    export_group.add_argument("--export-radars", metavar="OUT_DIR",
+                              help="رسم رادار كل لقطة في snapshots/ إلى ملفات صور داخل OUT_DIR")
+    export_group.add_argument("--format", choices=EXPORT_FORMATS, default="png")
+    export_group.add_argument("--since", metavar="YYYY-MM-DD", help="اللقطات من هذا اليوم فقط")
+    export_group.add_argument("--until", metavar="YYYY-MM-DD", help="اللقطات حتى هذا اليوم فقط")
+    export_group.add_argument("--match", metavar="TEXT", help="اللقطات التي يحتوي اسمها على TEXT")
+    export_group.add_argument("--jobs", type=int, help="عدد العمليات المتوازية (الافتراضي: عدد الأنوية)")
+    export_group.add_argument("--force", action="store_true", help="إعادة رسم حتى الصور المحدثة")
+
+
+# فتح التخزين المطلوب في سطر الأوامر: القاعدة، ثم الملف، ثم صيغة اللقطات الجديدة
+def open_storage(args, parser):
+    if args.backend == "sqlite":
+        use_sqlite(args.db, import_json=args.import_json)
+
+    if args.profile:
+        try:
+            open_profile(args.profile)
+        except KeyError:
+            parser.error(f"لا يوجد ملف باسم {args.profile} (المتاح: {', '.join(list_profiles())})")
+
+    set_snapshot_format(args.snapshot_format)
+
+
+# تنفيذ أمر batch لو طُلب - ترجع كود الخروج، أو None لو لم يُطلب أي أمر
+def run_batch(args):
+    if args.convert_snapshots:
+        converted, failed = convert_snapshots(args.convert_snapshots)
+        print(f"🔁 تم تحويل {converted} لقطة إلى {args.convert_snapshots}")
+        for filename, error in failed:
+            print(f"❌ {filename}: {error}")
+        return 1 if failed else 0
+
+    if args.benchmark_snapshots:
+        result = benchmark_snapshot_formats()
+        for name, error in result["skipped"]:
+            print(f"⚠️ تخطي لقطة {name}: {error}")
+        if not result["snapshots"]:
+            print("لا توجد لقطات للمقارنة.")
+            return 0
+        print(f"⏱️ {result['snapshots']} لقطة (الحالية = الملفات كما هي على القرص مع snapshots/.store، بكاش فارغ):")
+        for fmt, label in (("current", "الحالية"), ("binary", "binary")):
+            size, seconds = result[f"{fmt}_bytes"], result[f"{fmt}_seconds"]
+            print(f"  {label:<8}{size / 1024:10.1f} KB{seconds * 1000:10.2f} ms")
+        print(f"  الحجم: الحالية / الثنائية = {result['current_bytes'] / max(result['binary_bytes'], 1):.2f}x، "
+              f"الزمن: {result['current_seconds'] / max(result['binary_seconds'], 1e-9):.2f}x")
+        print("  (الصيغة الثنائية لقطات كاملة مستقلة - لا تستخدم keyframes ولا فروق)")
+        return 0
+
+    if args.retention_report:
+        report = retention_report()
+        print(f"🧹 سيتم حذف {len(report['snapshots'])} لقطة ({report['snapshot_bytes'] / 1024:.1f} KB) "
+              f"و {report['history_entries']} سجل تاريخ ({report['history_bytes'] / 1024:.1f} KB)، "
+              f"ومن مخزن اللقطات {report['store_bytes'] / 1024:.1f} KB")
+        for filename in report["snapshots"]:
+            print(f"  - {filename}")
+        return 0
+
+    if args.apply_retention:
+        result = apply_retention(progress=lambda done, total: print(f"  {done}/{total}"))
+        print(f"🧹 تم حذف {result['deleted']} لقطة و {result['history_dropped']} سجل تاريخ، "
+              f"وتوفير {result['store_bytes'] / 1024:.1f} KB من مخزن اللقطات")
+        for filename, error in result["failed"]:
+            print(f"❌ {filename}: {error}")
+        return 1 if result["failed"] else 0
+
+    if args.import_skills:
+        try:
+            report = import_skills(args.import_skills)
+        except (OSError, ValueError) as e:
+            print("❌ فشل الاستيراد:", e)
+            return 1
+        print(f"📥 تم استيراد {report['imported']} مهارة، ورفض {report['rejected']} سطر")
+        for line_no, reason in report["errors"]:
+            print(f"  سطر {line_no}: {reason}")
+        return 1 if report["rejected"] else 0
+
+    if args.export_skills:
+        try:
+            count = export_skills(args.export_skills)
+        except (OSError, ValueError) as e:
+            print("❌ فشل التصدير:", e)
+            return 1
+        print(f"📤 تم تصدير {count} مهارة إلى {args.export_skills}")
+        return 0
+
+    if args.export_radars:
+        report = export_radars(args.export_radars, args.format, args.since, args.until,
+                               args.match, args.jobs, args.force)
+        print(f"🖼️ تم رسم {report['rendered']} رادار، وتخطي {report['skipped']} محدث، "
+              f"في {report['seconds']:.2f} ثانية ({report['per_second']:.1f} لقطة/ثانية)")
+        for filename, error in report["failed"]:
+            print(f"❌ {filename}: {error}")
+        return 1 if report["failed"] else 0
+
+    return None
+
+
+# python -m status_core: نفس أوامر batch بدون استيراد tkinter أو فتح نافذة
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m status_core", description="إدارة المهارات بدون واجهة")
+    add_storage_arguments(parser)
+    add_batch_arguments(parser)
+    args = parser.parse_args(argv)
+    open_storage(args, parser)
+    code = run_batch(args)
+    if code is None:
+        parser.error("لم يُحدد أي أمر (مثلًا --export-radars أو --apply-retention أو --import-skills)")
+    return code
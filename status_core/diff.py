@@ -0,0 +1,25 @@
+# فرق لقطتين بالاسم (لا يتأثر بترتيب المهارات):
+# {"added": {اسم: قيمة}, "removed": {اسم: قيمة}, "changed": {اسم: [القديمة، الجديدة]}}
+def diff_skills(old, new):
+    old_values = {record["name"]: record["value"] for record in old}
+    new_values = {record["name"]: record["value"] for record in new}
+    common = old_values.keys() & new_values.keys()
+    return {
+        "added": {name: value for name, value in new_values.items() if name not in old_values},
+        "removed": {name: value for name, value in old_values.items() if name not in new_values},
+        "changed": {name: [old_values[name], new_values[name]]
+                    for name in new_values if name in common and old_values[name] != new_values[name]},
+    }
+
+
+def is_empty_diff(diff):
+    return not (diff["added"] or diff["removed"] or diff["changed"])
+
+
+# نص مختصر للفرق (سطر لكل مهارة)
+def format_diff(diff):
+    lines = [f"➕ {name}: {value}" for name, value in diff["added"].items()]
+    lines += [f"➖ {name}: {value}" for name, value in diff["removed"].items()]
+    lines += [f"{'🔼' if new > old else '🔽'} {name}: {old} → {new}"
+              for name, (old, new) in diff["changed"].items()]
+    return "\n".join(lines) or "لا يوجد فرق."
@@ -0,0 +1,85 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from . import backend, paths
+from .radar import SNAPSHOT_COLOR, draw_radar, snapshot_radar_title
+from .snapshots import load_snapshot, snapshot_mtime, snapshot_range, snapshot_stem
+
+
+EXPORT_FORMATS = ("png", "svg")
+
+
+# اختيار اللقطات المطلوبة: since/until بصيغة YYYY-MM-DD (شاملة)، و match جزء من اسم الملف
+def select_snapshots(since=None, until=None, match=None):
+    selected = snapshot_range(since, until)
+    if match:
+        selected = [name for name in selected if match in name]
+    return selected
+
+
+# رسم لقطة واحدة إلى ملف - تعمل داخل process منفصل بـ Agg (بدون شاشة)
+def _render_snapshot(task):
+    data_dir, db_path, filename, out_path = task
+    try:
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+        paths.set_data_dir(data_dir)
+        if db_path and backend.active_path() != db_path:
+            backend.use_sqlite(db_path)
+        data = load_snapshot(filename)
+        if not isinstance(data, list) or not data:
+            return filename, "لقطة فارغة أو غير صالحة"
+
+        figure = Figure(figsize=(6, 6))
+        FigureCanvasAgg(figure)
+        ax = figure.add_subplot(polar=True)
+        draw_radar(ax, [item["name"] for item in data], [item["value"] for item in data],
+                   snapshot_radar_title(filename), SNAPSHOT_COLOR)
+        figure.tight_layout()
+        figure.savefig(out_path + ".tmp", format=os.path.splitext(out_path)[1][1:])
+        os.replace(out_path + ".tmp", out_path)
+        return filename, None
+    except Exception as e:
+        return filename, str(e)
+
+
+# تصدير رادار كل لقطة (أو المختارة) إلى out_dir بالتوازي
+# اللقطة التي صورتها أحدث من ملفها تُتخطى إلا مع force
+def export_radars(out_dir, fmt="png", since=None, until=None, match=None, jobs=None, force=False):
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"صيغة غير مدعومة: {fmt}")
+    os.makedirs(out_dir, exist_ok=True)
+
+    tasks = []
+    skipped = 0
+    data_dir = os.path.abspath(paths.DATA_DIR)
+    db_path = backend.active_path()
+    db_path = os.path.abspath(db_path) if db_path else None
+    for filename in select_snapshots(since, until, match):
+        out_path = os.path.join(out_dir, f"{snapshot_stem(filename)}.{fmt}")
+        if not force and os.path.exists(out_path) and os.path.getmtime(out_path) >= snapshot_mtime(filename):
+            skipped += 1
+            continue
+        tasks.append((data_dir, db_path, filename, out_path))
+
+    start = time.perf_counter()
+    failed = []
+    if tasks:
+        workers = jobs or os.cpu_count() or 1
+        chunksize = max(1, len(tasks) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for filename, error in pool.map(_render_snapshot, tasks, chunksize=chunksize):
+                if error:
+                    failed.append((filename, error))
+    seconds = time.perf_counter() - start
+
+    rendered = len(tasks) - len(failed)
+    return {
+        "rendered": rendered,
+        "skipped": skipped,
+        "failed": failed,
+        "seconds": seconds,
+        "per_second": rendered / seconds if seconds else 0.0,
+    }
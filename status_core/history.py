@@ -0,0 +1,311 @@
+import json
+import os
+import threading
+from array import array
+from datetime import datetime
+
+from . import backend
+from .atomic import atomic_append, atomic_write, replace_durably
+from .jsonstream import iter_json_file
+from .paths import data_path, drop_cached_paths, HISTORY_FILE, HISTORY_JOURNAL, HISTORY_INDEX
+from .storage import read_skills_file
+
+
+_history_lock = threading.Lock()
+_history_compacted = threading.Condition(_history_lock)   # يُنبَّه عند انتهاء أي ضغط
+_history_offsets = {}                  # مسار السجل -> array("Q") في الذاكرة، يُحمّل عند أول استخدام
+_history_compacting = set()            # السجلات التي يجري ضغطها الآن
+_history_generations = {}              # مسار السجل -> عدد مرات إعادة كتابته (أرقام اللقطات تغيرت)
+
+
+# تحويل لقطة إلى سطر JSON مضغوط
+def _history_line(entry):
+    return (json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+# قراءة مواضع الأسطر الكاملة في السجل بدءًا من موضع معيّن
+def _scan_history_offsets(journal, start=0):
+    offsets = array("Q")
+    end = start
+    if not os.path.exists(journal):
+        return offsets, end
+    with open(journal, "rb") as f:
+        f.seek(start)
+        pos = start
+        for line in f:
+            if not line.endswith(b"\n"):
+                break  # سطر ناقص (انقطاع أثناء الكتابة)
+            if line.strip():
+                offsets.append(pos)
+            pos += len(line)
+            end = pos
+    return offsets, end
+
+
+# كتابة الفهرس بالكامل
+def _write_history_index(index, offsets):
+    atomic_write(index, offsets.tobytes())
+
+
+# تحميل الفهرس والتأكد من تطابقه مع السجل (يُستدعى داخل القفل)
+def _ensure_history_index(journal, index):
+    if journal in _history_offsets:
+        return _history_offsets[journal]
+
+    offsets = array("Q")
+    if os.path.exists(index):
+        with open(index, "rb") as f:
+            data = f.read()
+        offsets.frombytes(data[:len(data) - len(data) % offsets.itemsize])
+
+    size = os.path.getsize(journal) if os.path.exists(journal) else 0
+    if offsets and offsets[-1] >= size:
+        offsets = array("Q")  # فهرس أقدم من السجل أو تالف → إعادة بناء كاملة
+
+    # نكمل الفهرس بالأسطر التي أضيفت بعد آخر سطر مفهرس
+    start = 0
+    if offsets:
+        with open(journal, "rb") as f:
+            f.seek(offsets[-1])
+            start = offsets[-1] + len(f.readline())
+    tail, end = _scan_history_offsets(journal, start)
+    if tail:
+        offsets.extend(tail)
+
+    # حذف أي سطر ناقص في نهاية الملف حتى لا يختلط بالإضافة التالية
+    if end < size and end >= start:
+        with open(journal, "r+b") as f:
+            f.truncate(end)
+        print("⚠️ تم حذف سطر ناقص من نهاية سجل التاريخ.")
+
+    if tail or not os.path.exists(index):
+        _write_history_index(index, offsets)
+
+    _history_offsets[journal] = offsets
+    return offsets
+
+
+# ترحيل history.json القديم (مصفوفة) إلى السجل الإلحاقي - مرة واحدة فقط
+def migrate_history_json():
+    if backend.active() is not None:
+        return  # القاعدة لها مستورد خاص (SqliteBackend.import_json)
+    legacy = data_path(HISTORY_FILE)
+    journal = data_path(HISTORY_JOURNAL)
+    if not os.path.exists(legacy) or os.path.exists(journal):
+        return
+
+    # المصفوفة تُقرأ لقطة لقطة وتُكتب سطرًا سطرًا → الذاكرة بحجم لقطة واحدة مهما كبر الملف
+    tmp_path = journal + ".tmp"
+    offsets = array("Q")
+    try:
+        with open(tmp_path, "wb") as f:
+            for entry in iter_json_file(legacy):
+                offsets.append(f.tell())
+                f.write(_history_line(entry))
+    except json.JSONDecodeError as e:
+        os.remove(tmp_path)
+        print("❌ تعذر ترحيل history.json:", e)
+        return
+    replace_durably(tmp_path, journal)
+
+    _write_history_index(data_path(HISTORY_INDEX), offsets)
+    with _history_lock:
+        _history_offsets[journal] = offsets
+        _history_generations[journal] = _history_generations.get(journal, 0) + 1
+    os.replace(legacy, legacy + ".bak")
+    print(f"✅ تم ترحيل {len(offsets)} لقطة من history.json إلى {HISTORY_JOURNAL}")
+
+
+# إضافة لقطة واحدة لنهاية السجل - بدون قراءة أو إعادة كتابة الملف
+def append_history(entry):
+    db = backend.active()
+    if db is not None:
+        return db.append_history(entry)
+    journal, index = data_path(HISTORY_JOURNAL), data_path(HISTORY_INDEX)
+    line = _history_line(entry)
+
+    with _history_lock:
+        offsets = _ensure_history_index(journal, index)
+        offset = os.path.getsize(journal) if os.path.exists(journal) else 0
+        atomic_append(journal, line)
+        offsets.append(offset)
+        with open(index, "ab") as f:
+            array("Q", [offset]).tofile(f)
+
+
+# عدد اللقطات في السجل
+def history_count():
+    db = backend.active()
+    if db is not None:
+        return db.history_count()
+    journal, index = data_path(HISTORY_JOURNAL), data_path(HISTORY_INDEX)
+    with _history_lock:
+        return len(_ensure_history_index(journal, index))
+
+
+# قراءة لقطة برقمها (يدعم الأرقام السالبة: -1 = الأحدث)
+def read_history_entry(i):
+    db = backend.active()
+    if db is not None:
+        return db.read_history_entry(i)
+    journal, index = data_path(HISTORY_JOURNAL), data_path(HISTORY_INDEX)
+    with _history_lock:
+        offset = _ensure_history_index(journal, index)[i]
+        with open(journal, "rb") as f:
+            f.seek(offset)
+            line = f.readline()
+    return json.loads(line)
+
+
+# نسيان فهارس السجل المحملة لمجلد بيانات (عند إغلاق ملفه، أو كأن التطبيق فُتح من جديد)
+def drop_caches(folder, exclude=None):
+    with _history_lock:
+        for cache in (_history_offsets, _history_generations):
+            drop_cached_paths(cache, folder, exclude)
+
+
+# "نسخة" السجل: تتغير كلما أُعيدت كتابته (ضغط، احتفاظ، ترحيل) - أي رقم لقطة محفوظ قبلها لم يعد صالحًا
+# (الـ inode يكشف أيضًا إعادة الكتابة من عملية أخرى)
+def history_generation():
+    db = backend.active()
+    if db is not None:
+        return db.history_generation()
+    journal = data_path(HISTORY_JOURNAL)
+    try:
+        inode = os.stat(journal).st_ino
+    except FileNotFoundError:
+        inode = None
+    with _history_lock:
+        return _history_generations.get(journal, 0), inode
+
+
+# المرور على اللقطات من رقم معيّن (السالب من النهاية: -n = آخر n) حتى آخر لقطة وقت الاستدعاء
+# الملف يُفتح مرة واحدة ونبدأ مباشرة من موضع اللقطة المطلوبة - ما قبلها لا يُقرأ
+def iter_history(start=0):
+    db = backend.active()
+    if db is not None:
+        yield from db.iter_history(start)
+        return
+
+    journal, index = data_path(HISTORY_JOURNAL), data_path(HISTORY_INDEX)
+    with _history_lock:
+        offsets = _ensure_history_index(journal, index)
+        count = len(offsets)
+        start = max(0, count + start) if start < 0 else start
+        if start >= count:
+            return
+        f = open(journal, "rb")  # الضغط يستبدل الملف بـ os.replace → هذا المقبض يبقى على النسخة الحالية
+        f.seek(offsets[start])
+    with f:
+        for _ in range(count - start):
+            yield json.loads(f.readline())
+
+
+# آخر n لقطة (الأقدم أولًا)
+def history_tail(n):
+    return list(iter_history(-n)) if n > 0 else []
+
+
+# ضغط السجل عند الطلب فقط (سياسة الاحتفاظ أو الدمج): الأسطر التالفة في الوسط تُحذف دائمًا،
+# أما السطر الناقص في النهاية فيُقص عند فتح السجل (_ensure_history_index) بدون ضغط
+# القراءة والكتابة تتم خارج القفل، والقفل يُؤخذ فقط لنسخ ما أضيف أثناء الضغط ثم الاستبدال
+# لو يجري ضغط آخر لنفس السجل ننتظر انتهاءه ثم نضغط (لا يضيع طلب الاحتفاظ)
+# keep(entry) اختياري: اللقطات التي ترجع False تُحذف (سياسة الاحتفاظ - status_core.retention)
+# merge=True (اختياري وصريح فقط): دمج اللقطات المتتالية المتطابقة في أولها مع last_seen
+# لو لم يُحذف شيء لا يُعاد كتابة السجل (أرقام اللقطات لا تتغير)
+# ترجع (المُبقى، المحذوف) أو None لو لا يوجد سجل
+def compact_history(journal=None, index=None, keep=None, merge=False):
+    journal = journal or data_path(HISTORY_JOURNAL)
+    index = index or data_path(HISTORY_INDEX)
+    with _history_compacted:
+        while journal in _history_compacting:
+            _history_compacted.wait()
+        if not os.path.exists(journal):
+            return None
+        _history_compacting.add(journal)
+        _ensure_history_index(journal, index)
+        end = os.path.getsize(journal)
+
+    try:
+        tmp_path = journal + ".compact"
+        new_offsets = array("Q")
+        kept = dropped = 0
+        with open(journal, "rb") as src, open(tmp_path, "wb") as dst:
+            previous = None
+            previous_line = None
+            pos = 0
+            for line in src:
+                pos += len(line)
+                if pos > end:
+                    break  # ما بعد end يُنسخ لاحقًا داخل القفل
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    dropped += 1
+                    continue
+                if keep is not None and not keep(entry):
+                    dropped += 1
+                    continue
+
+                if merge and previous is not None and previous.get("skills") == entry.get("skills"):
+                    # نفس الحالة: نحتفظ بأول ظهور ونسجل آخر وقت ظهرت فيه
+                    previous["last_seen"] = entry.get("last_seen", entry.get("timestamp"))
+                    previous_line = None
+                    dropped += 1
+                    continue
+
+                if previous is not None:
+                    new_offsets.append(dst.tell())
+                    dst.write(previous_line or _history_line(previous))
+                    kept += 1
+                previous, previous_line = entry, line
+            if previous is not None:
+                new_offsets.append(dst.tell())
+                dst.write(previous_line or _history_line(previous))
+                kept += 1
+
+        if not dropped:
+            os.remove(tmp_path)
+            return kept, dropped
+
+        with _history_lock:
+            # نسخ أي لقطات أضيفت أثناء الضغط كما هي
+            with open(journal, "rb") as src, open(tmp_path, "ab") as dst:
+                src.seek(end)
+                for line in src:
+                    new_offsets.append(dst.tell())
+                    dst.write(line)
+            replace_durably(tmp_path, journal)
+            _write_history_index(index, new_offsets)
+            _history_offsets[journal] = new_offsets
+            _history_generations[journal] = _history_generations.get(journal, 0) + 1
+        print(f"🧹 ضغط سجل التاريخ: أُبقي على {kept} وحُذف/دُمج {dropped}.")
+        return kept, dropped
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise  # المستدعي (الاحتفاظ، الدمج) يعرض الخطأ بدل أن يُقرأ كـ "لا شيء للحذف"
+    finally:
+        with _history_compacted:
+            _history_compacting.discard(journal)
+            _history_compacted.notify_all()
+
+
+# حفظ لقطة في سجل التاريخ (من skills.json لو data غير محددة) - ترجع وقت اللقطة
+# تحديد معدل اللقطات وتأجيلها مسؤولية SnapshotScheduler (status_core.scheduler)
+def save_snapshot(data=None):
+    print(f"🔄 حفظ Snapshot عند: {datetime.now()}")
+    if data is None:
+        data = read_skills_file()
+    if data is None:
+        raise ValueError("ملف المهارات فارغ!")
+
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    snapshot = {
+        "timestamp": timestamp,
+        "skills": data
+    }
+
+    # إلحاق سطر واحد بالسجل بدل قراءة وإعادة كتابة history.json كاملًا
+    append_history(snapshot)
+    return timestamp
@@ -0,0 +1,122 @@
+import json
+import os
+
+
+# قراءة مصفوفة JSON كبيرة (skills.json أو history.json القديم) عنصرًا عنصرًا بدون تحميل الملف كاملًا:
+# نقرأ أجزاء صغيرة ونفك كل عنصر بـ raw_decode بمجرد اكتماله في الـ buffer
+STREAM_CHUNK = 64 * 1024               # حجم القراءة الافتراضي (حرف)
+STREAM_THRESHOLD = 8 * 1024 * 1024     # الملفات الأصغر تُقرأ بـ json.loads مباشرة (أسرع، والذاكرة الزائدة صغيرة)
+
+_WHITESPACE = " \t\n\r"
+_DELIMITERS = _WHITESPACE + ",]"
+
+
+class _Buffer:
+    def __init__(self, f, chunk_size):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.text = ""
+        self.pos = 0
+        self.eof = False
+        # كل عنصر يُفك وحده → json لا يشارك المفاتيح المتكررة ("name"/"value") بين العناصر
+        # فنشاركها نحن، وإلا صار لكل سجل نسخته من كل مفتاح
+        self.keys = {}
+        self.decoder = json.JSONDecoder(object_pairs_hook=self._object)
+
+    def _object(self, pairs):
+        keys = self.keys
+        return {keys.setdefault(key, key): value for key, value in pairs}
+
+    # قراءة المزيد (على الأقل بقدر الموجود حتى لا يتكرر فك عنصر ضخم مرات كثيرة)
+    def fill(self):
+        if self.eof:
+            return False
+        self.text = self.text[self.pos:]
+        self.pos = 0
+        chunk = self.f.read(max(self.chunk_size, len(self.text)))
+        if not chunk:
+            self.eof = True
+            return False
+        self.text += chunk
+        return True
+
+    # أول حرف غير فراغ (None = نهاية الملف)
+    def peek(self):
+        while True:
+            while self.pos < len(self.text) and self.text[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if not self.fill():
+                return None
+
+    def error(self, message):
+        raise json.JSONDecodeError(message, self.text, self.pos)
+
+    # فك قيمة كاملة تبدأ عند pos - لا نقبلها حتى نرى فاصلًا بعدها (رقم مقطوع مثل "-1." يُفك كـ -1)
+    def decode(self):
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.text, self.pos)
+                if self.eof or (end < len(self.text) and self.text[end] in _DELIMITERS):
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            if not self.fill():
+                continue  # eof: المحاولة الأخيرة ترفع الخطأ أو ترجع القيمة
+
+
+def _array_items(buf):
+    if buf.peek() != "[":
+        buf.error("متوقع مصفوفة JSON")
+    buf.pos += 1
+
+    if buf.peek() == "]":
+        buf.pos += 1
+    else:
+        while True:
+            if buf.peek() is None:
+                buf.error("نهاية الملف قبل إغلاق المصفوفة")
+            yield buf.decode()
+            sep = buf.peek()
+            buf.pos += 1
+            if sep == "]":
+                break
+            if sep != ",":
+                buf.error("متوقع , أو ]")
+
+    if buf.peek() is not None:
+        buf.error("بيانات زائدة بعد المصفوفة")
+
+
+# عناصر مصفوفة JSON في ملف نصي مفتوح - ملف فارغ = لا عناصر، وأي شيء غير مصفوفة → JSONDecodeError
+def iter_json_array(f, chunk_size=STREAM_CHUNK):
+    buf = _Buffer(f, chunk_size)
+    if buf.peek() is not None:
+        yield from _array_items(buf)
+
+
+# المصفوفة كاملة كقائمة - None لو الملف فارغ
+# الملف الكبير يُفك تدريجيًا بدون نسخة نصية له كله في الذاكرة بجانب القائمة
+def read_json_array(f, chunk_size=STREAM_CHUNK, threshold=STREAM_THRESHOLD):
+    if os.fstat(f.fileno()).st_size < threshold:
+        content = f.read().strip()
+        if not content:
+            return None
+        data = json.loads(content)
+        if not isinstance(data, list):
+            raise json.JSONDecodeError("متوقع مصفوفة JSON", content, 0)
+        return data
+
+    buf = _Buffer(f, chunk_size)
+    if buf.peek() is None:
+        return None
+    return list(_array_items(buf))
+
+
+# عناصر مصفوفة JSON من مسار ملف (الملف يُغلق عند انتهاء أو إيقاف المرور عليها)
+def iter_json_file(path, chunk_size=STREAM_CHUNK):
+    with open(path, "r", encoding="utf-8") as f:
+        yield from iter_json_array(f, chunk_size)
@@ -0,0 +1,47 @@
+# مخزن المهارات في الذاكرة: dict مرتب بالإدخال (name -> value)
+# الإضافة والتعديل والحذف O(1)، و dirty يسجل الأسماء التي تغيرت منذ آخر حفظ
+class SkillStore:
+    def __init__(self, skills_list=()):
+        self._values = {}
+        self.dirty = set()
+        for skill_obj in skills_list:
+            self._values[skill_obj["name"]] = skill_obj["value"]
+
+    def __len__(self):
+        return len(self._values)
+
+    def __contains__(self, name):
+        return name in self._values
+
+    def __iter__(self):
+        return iter(self._values)
+
+    def get(self, name, default=None):
+        return self._values.get(name, default)
+
+    def items(self):
+        return self._values.items()
+
+    # إضافة مهارة جديدة أو تعديل قيمة مهارة موجودة (تحتفظ بمكانها)
+    def upsert(self, name, value):
+        if name not in self._values or self._values[name] != value:
+            self._values[name] = value
+            self.dirty.add(name)
+
+    def delete(self, name):
+        if name in self._values:
+            del self._values[name]
+            self.dirty.add(name)
+
+    # تعديل مجموعة مهارات مرة واحدة (dict أو أزواج (name, value))
+    def update(self, values):
+        pairs = values.items() if isinstance(values, dict) else values
+        for name, value in pairs:
+            self.upsert(name, value)
+
+    # بنفس صيغة skills.json
+    def to_list(self):
+        return [{"name": name, "value": value} for name, value in self._values.items()]
+
+    def mark_clean(self):
+        self.dirty.clear()
@@ -0,0 +1,67 @@
+import os
+import threading
+from contextlib import contextmanager
+
+
+# مجلد البيانات: كل الملفات تُقرأ وتُكتب نسبةً له
+DATA_DIR = "."
+
+SKILLS_FILE = "skills.json"
+RETENTION_FILE = "retention.json"      # سياسة الاحتفاظ باللقطات لهذا المجلد (اختياري)
+
+# سجل التاريخ: ملف JSON-Lines إلحاقي (سطر لكل لقطة) + فهرس بمواضع الأسطر
+HISTORY_FILE = "history.json"          # الصيغة القديمة (مصفوفة واحدة) - للترحيل فقط
+HISTORY_JOURNAL = "history.jsonl"
+HISTORY_INDEX = "history.idx"          # uint64 لكل سطر = موضع بدايته في السجل
+
+# مخزن اللقطات: كل سجل مهارة يُحفظ مرة واحدة بالـ hash، واللقطة مجرد قائمة hashes
+SNAPSHOT_FOLDER = "snapshots"
+SNAPSHOT_STORE = os.path.join(SNAPSHOT_FOLDER, ".store")
+SNAPSHOT_OBJECTS = os.path.join(SNAPSHOT_STORE, "objects.jsonl")
+SNAPSHOT_LAST = os.path.join(SNAPSHOT_STORE, "last.json")
+SNAPSHOT_DELTAS = os.path.join(SNAPSHOT_STORE, "deltas.jsonl")   # فرق كل لقطة عن السابقة لها
+SNAPSHOT_FRAMES = os.path.join(SNAPSHOT_STORE, "frames.jsonl")   # اللقطات الكاملة (keyframes) بالـ hash
+SNAPSHOT_FRAME = os.path.join(SNAPSHOT_STORE, "frame.json")      # الـ keyframe الحالي وعدد اللقطات بعده
+
+
+_pinned = threading.local()            # مجلد بيانات مثبت لـ thread معيّن (مهام الخلفية)
+
+
+# مجلد البيانات الفعلي لهذا الـ thread: المثبت لو موجود وإلا الحالي
+def data_dir():
+    return getattr(_pinned, "path", None) or DATA_DIR
+
+
+# المسار الكامل لملف داخل مجلد البيانات الحالي
+def data_path(*parts):
+    return os.path.join(data_dir(), *parts)
+
+
+# تثبيت مجلد البيانات داخل thread: مهمة خلفية تلتقط المجلد عند بدايتها فلا يغيّره تبديل الملف أثناءها
+@contextmanager
+def pinned_data_dir(path):
+    previous = getattr(_pinned, "path", None)
+    _pinned.path = path
+    try:
+        yield path
+    finally:
+        _pinned.path = previous
+
+
+# حذف مفاتيح كاش تخص مجلدًا (المفتاح مسار، أو tuple أوله مسار)
+# exclude: مجلد فرعي تبقى كاشاته (الملفات الأخرى داخل مجلد الملف الافتراضي)
+def drop_cached_paths(cache, folder, exclude=None):
+    prefix = os.path.join(folder, "")
+    exclude = os.path.join(exclude, "") if exclude else None
+    for key in list(cache):
+        path = key[0] if isinstance(key, tuple) else key
+        if not isinstance(path, str) or (exclude and path.startswith(exclude)):
+            continue
+        if path == folder or path.startswith(prefix):
+            del cache[key]
+
+
+# تغيير مجلد البيانات (مثلًا لمهمة batch أو اختبار)
+def set_data_dir(path):
+    global DATA_DIR
+    DATA_DIR = path
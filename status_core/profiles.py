@@ -0,0 +1,218 @@
+import json
+import os
+import sys
+from collections import OrderedDict
+from datetime import datetime
+
+from . import backend, history, paths, snapshots
+from .atomic import atomic_write
+from .jsonstream import read_json_array
+from .sqlite_backend import SQLITE_FILE, SqliteBackend
+from .storage import load_skills, recover_skills, save_skills
+
+
+# عدة ملفات مهارات (شخص لكل ملف): كل ملف مجلد بيانات مستقل داخل profiles/
+# (skills.json + snapshots/ + history.jsonl)، والملف الافتراضي هو مجلد البيانات الأصلي نفسه
+# فهرس صغير profiles/index.json فيه الأسماء وملخص كل ملف حتى تظهر القائمة فورًا بدون فتح أي ملف
+PROFILES_FOLDER = "profiles"
+PROFILE_INDEX = os.path.join(PROFILES_FOLDER, "index.json")
+DEFAULT_PROFILE = "default"
+PROFILE_CACHE_SIZE = 8                 # عدد الملفات المفتوحة مؤخرًا التي تبقى بياناتها في الذاكرة
+
+_root_dir = None                       # مجلد البيانات الأصلي (قبل أي تبديل)
+_root_db = None                        # قاعدة SQLite للملف الافتراضي كما اختارها المستخدم (--db)
+_index = None                          # {اسم: ملخص}
+_open_profiles = OrderedDict()         # اسم -> قائمة المهارات (LRU: الأحدث في النهاية)
+_current = DEFAULT_PROFILE
+_recovered = {}                        # اسم -> اللقطة التي استُرجع منها skills.json عند فتحه (حتى تعرضها الواجهة)
+
+
+def _root():
+    global _root_dir
+    if _root_dir is None:
+        _root_dir = paths.DATA_DIR
+    return _root_dir
+
+
+def _validate_name(name):
+    name = name.strip()
+    if not name or name in (".", "..") or os.sep in name or "/" in name or name == PROFILES_FOLDER:
+        raise ValueError(f"اسم ملف غير صالح: {name!r}")
+    return name
+
+
+def profile_dir(name):
+    if name == DEFAULT_PROFILE:
+        return _root()
+    return os.path.join(_root(), PROFILES_FOLDER, name)
+
+
+# قاعدة SQLite لملف: الافتراضي يبقى على القاعدة التي فُتحت بها (--db)، والباقي status.db داخل مجلده
+def profile_db(name):
+    if name == DEFAULT_PROFILE and _root_db:
+        return _root_db
+    return os.path.join(profile_dir(name), SQLITE_FILE)
+
+
+# ملخص ملف المهارات للفهرس (version يزيد مع كل حفظ - تستخدمه الكاشات المبنية على عدة ملفات)
+def profile_summary(skills_list, version=0):
+    values = [skill["value"] for skill in skills_list]
+    best = max(skills_list, key=lambda skill: skill["value"]) if skills_list else None
+    return {
+        "skills": len(values),
+        "mean": round(sum(values) / len(values), 1) if values else 0,
+        "top": best["name"] if best else None,
+        "updated": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "version": version,
+    }
+
+
+def _write_index():
+    os.makedirs(os.path.join(_root(), PROFILES_FOLDER), exist_ok=True)
+    atomic_write(os.path.join(_root(), PROFILE_INDEX),
+                 json.dumps({"profiles": _index}, ensure_ascii=False, separators=(",", ":")))
+
+
+# مهارات ملف معيّن بدون تغيير مجلد البيانات الحالي - من نفس التخزين المفعل:
+# SQLite → قاعدة الملف (اتصال قصير لو ليست المفتوحة الآن)، JSON → skills.json
+def _read_profile_skills(name):
+    db = backend.active()
+    if db is not None:
+        if name == _current:
+            return db.load_skills()
+        path = profile_db(name)
+        if not os.path.exists(path):
+            return []  # لم يُحفظ شيء في هذا الملف تحت SQLite بعد
+        other = SqliteBackend(path)
+        try:
+            return other.load_skills()
+        finally:
+            other.close()
+    try:
+        with open(os.path.join(profile_dir(name), paths.SKILLS_FILE), "r", encoding="utf-8") as f:
+            return read_json_array(f) or []
+    except (OSError, json.JSONDecodeError):
+        return []
+
+
+# الفهرس: يُقرأ مرة واحدة، ويُبنى بالمرور على profiles/ فقط لو غير موجود
+def profile_index():
+    global _index
+    if _index is not None:
+        return _index
+
+    path = os.path.join(_root(), PROFILE_INDEX)
+    if os.path.exists(path):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                _index = json.load(f)["profiles"]
+            return _index
+        except (OSError, ValueError, KeyError):
+            print("⚠️ فهرس الملفات تالف، سيتم إعادة بنائه.")
+
+    _index = {DEFAULT_PROFILE: profile_summary(_read_profile_skills(DEFAULT_PROFILE))}
+    folder = os.path.join(_root(), PROFILES_FOLDER)
+    if os.path.isdir(folder):
+        with os.scandir(folder) as it:
+            for entry in it:
+                if entry.is_dir():
+                    _index[entry.name] = profile_summary(_read_profile_skills(entry.name))
+    _write_index()
+    return _index
+
+
+# أسماء الملفات بالترتيب (الافتراضي أولًا)
+def list_profiles():
+    names = sorted(name for name in profile_index() if name != DEFAULT_PROFILE)
+    return [DEFAULT_PROFILE] + names
+
+
+def current_profile():
+    return _current
+
+
+def create_profile(name):
+    name = _validate_name(name)
+    index = profile_index()
+    if name in index:
+        raise FileExistsError(name)
+    os.makedirs(os.path.join(profile_dir(name), paths.SNAPSHOT_FOLDER), exist_ok=True)
+    atomic_write(os.path.join(profile_dir(name), paths.SKILLS_FILE), "[]")
+    index[name] = profile_summary([])
+    _write_index()
+    return name
+
+
+# تحديث ملخص ملف في الفهرس (بعد كل حفظ)
+def update_profile_summary(name, skills_list):
+    index = profile_index()
+    version = index.get(name, {}).get("version", 0) + 1
+    index[name] = profile_summary(skills_list, version)
+    _write_index()
+
+
+# حفظ مهارات الملف الحالي ثم تحديث ملخصه في الفهرس ونسخته في الـ LRU
+def save_profile_skills(skills_list):
+    save_skills(skills_list)
+    update_profile_summary(_current, skills_list)
+    if _current in _open_profiles:
+        _open_profiles[_current] = skills_list
+
+
+# مهارات ملف بدون فتحه (من الـ LRU لو مفتوح مؤخرًا، وإلا من القرص مباشرة)
+def profile_skills(name):
+    if name in _open_profiles:
+        return _open_profiles[name]
+    if name not in profile_index():
+        raise KeyError(name)
+    return _read_profile_skills(name)
+
+
+# حذف كاشات المسارات الخاصة بملف (اللقطات، السجل، التحليلات) عند خروجه من الـ LRU
+def _release_caches(name):
+    folder = profile_dir(name)
+    # الملف الافتراضي هو المجلد الأصلي → لا نلمس كاشات الملفات الأخرى داخل profiles/
+    others = os.path.join(_root(), PROFILES_FOLDER) if name == DEFAULT_PROFILE else None
+    snapshots.drop_caches(folder, others)
+    history.drop_caches(folder, others)
+    analytics = sys.modules.get("status_core.analytics")  # لا نستورد numpy لو لم تُستخدم
+    if analytics is not None:
+        analytics.drop_caches(folder, others)
+
+
+# اسم اللقطة التي استُرجع منها ملف عند فتحه لأن skills.json كان تالفًا (أو None) - تُرجع مرة واحدة فقط
+def pop_recovered(name):
+    return _recovered.pop(name, None)
+
+
+# تبديل الملف الحالي: مجلد البيانات يتغير، والمهارات تُقرأ من القرص فقط لو لم تكن في الـ LRU
+# (على المستدعي كتابة أي حفظ مؤجل للملف السابق أولًا) - ترجع قائمة المهارات
+def open_profile(name):
+    global _current, _root_db
+    if name not in profile_index():
+        raise KeyError(name)
+
+    db = backend.active()
+    if db is not None and _current == DEFAULT_PROFILE:
+        _root_db = db.path  # نتذكر القاعدة التي اختارها المستخدم قبل أول تبديل
+    paths.set_data_dir(profile_dir(name))
+    if db is not None:
+        path = profile_db(name)
+        if os.path.abspath(db.path) != os.path.abspath(path):
+            backend.use_json()
+            backend.use_sqlite(path)
+
+    skills_list = _open_profiles.pop(name, None)
+    if skills_list is None:
+        history.migrate_history_json()
+        recovered_from = recover_skills()
+        if recovered_from:
+            _recovered[name] = recovered_from
+        skills_list = load_skills()
+    _open_profiles[name] = skills_list
+    _current = name
+
+    while len(_open_profiles) > PROFILE_CACHE_SIZE:
+        evicted, _ = _open_profiles.popitem(last=False)
+        _release_caches(evicted)
+    return skills_list
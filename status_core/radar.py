@@ -0,0 +1,75 @@
+import math
+
+
+# إعدادات الرادار المشتركة بين الواجهة والتصدير (لا تستورد matplotlib - تعمل على ax جاهز)
+PROFILE_TITLE = "ملف المهارات الشخصي"
+PROFILE_COLOR = "lime"
+SNAPSHOT_COLOR = "tab:blue"
+COMPARE_COLOR = "tab:orange"
+TEAM_COLOR = "tab:purple"
+TEAM_TITLE = "رادار الفريق"
+
+
+# زوايا المحاور بالتساوي حول الدائرة
+def radar_angles(count):
+    return [2 * math.pi * i / count for i in range(count)]
+
+
+# إغلاق المضلع: أول نقطة تتكرر في النهاية
+def close_polygon(angles, values):
+    return list(angles) + list(angles[:1]), list(values) + list(values[:1])
+
+
+# رسم رادار كامل على محور polar - ترجع (الخط، المساحة) لتحديثهما لاحقًا
+def draw_radar(ax, labels, values, title, color=PROFILE_COLOR):
+    angles, closed_values = close_polygon(radar_angles(len(labels)), values)
+    line, = ax.plot(angles, closed_values, 'o-', color=color, linewidth=2)
+    fill, = ax.fill(angles, closed_values, color=color, alpha=0.25)
+    ax.set_thetagrids([math.degrees(a) for a in angles[:-1]], labels, fontsize=11, fontweight='bold')
+    ax.set_yticklabels([])
+    ax.set_ylim(0, 100)
+    ax.set_title(title, size=14, weight='bold', y=1.08)
+    ax.grid(True)
+    return line, fill
+
+
+# محاور مشتركة للقطتين: مهارات الأولى بترتيبها ثم الجديدة في الثانية (المهارة الغائبة = 0)
+def overlay_values(older, newer):
+    old_values = {record["name"]: record["value"] for record in older}
+    new_values = {record["name"]: record["value"] for record in newer}
+    labels = list(old_values) + [name for name in new_values if name not in old_values]
+    return labels, [old_values.get(name, 0) for name in labels], [new_values.get(name, 0) for name in labels]
+
+
+# رادار لقطتين فوق بعض على نفس المحور للمقارنة
+def draw_radar_overlay(ax, older, newer, older_label, newer_label, title):
+    labels, old_values, new_values = overlay_values(older, newer)
+    old_line, _ = draw_radar(ax, labels, old_values, title, SNAPSHOT_COLOR)
+    new_line, _ = draw_radar(ax, labels, new_values, title, COMPARE_COLOR)
+    old_line.set_label(older_label)
+    new_line.set_label(newer_label)
+    ax.legend(loc="upper right", bbox_to_anchor=(1.3, 1.1), fontsize=9)
+
+
+# رادار الفريق: شريط p25–p75 والوسيط والمتوسط، وفوقها ملف شخص واحد (اختياري)
+def draw_team_radar(ax, labels, low, median, high, mean, title=TEAM_TITLE, profile_values=None, profile_label=None):
+    median_line, median_fill = draw_radar(ax, labels, median, title, TEAM_COLOR)
+    median_fill.remove()
+    median_line.set_linestyle("--")
+    median_line.set_label("الوسيط")
+
+    angles, closed_low = close_polygon(radar_angles(len(labels)), low)
+    _, closed_high = close_polygon(angles[:-1], high)
+    _, closed_mean = close_polygon(angles[:-1], mean)
+    ax.fill_between(angles, closed_low, closed_high, color=TEAM_COLOR, alpha=0.2, label="p25–p75")
+    ax.plot(angles, closed_mean, ":", color=TEAM_COLOR, linewidth=1.5, label="المتوسط")
+
+    if profile_values is not None:
+        profile_line, _ = draw_radar(ax, labels, profile_values, title, PROFILE_COLOR)
+        profile_line.set_label(profile_label)
+    ax.legend(loc="upper right", bbox_to_anchor=(1.3, 1.1), fontsize=9)
+
+
+# عنوان رادار لقطة محفوظة
+def snapshot_radar_title(filename):
+    return f"رادار Snapshot - {filename}"
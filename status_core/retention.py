@@ -0,0 +1,220 @@
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+from . import backend, paths
+from .atomic import atomic_write
+from .history import compact_history
+from .paths import data_path, HISTORY_INDEX, HISTORY_JOURNAL, RETENTION_FILE, SNAPSHOT_FOLDER
+from .snapshots import (
+    delete_snapshots, snapshot_index, snapshot_sort_key, snapshot_store_garbage, snapshot_store_size,
+    sweep_snapshot_store,
+)
+
+
+# سياسة الاحتفاظ الافتراضية: كل اللقطات لآخر 24 ساعة، ثم لقطة لكل ساعة لأسبوع، ثم لقطة لكل يوم لسنة
+# (الأقدم من آخر مستوى يُحذف) - ويمكن تغييرها لكل مجلد بيانات في retention.json
+DEFAULT_RETENTION = {
+    "keep_all_hours": 24,
+    "hourly_days": 7,
+    "daily_days": 365,
+    "keep_described": True,     # اللقطات التي أُضيف لها وصف (__...) لا تُحذف أبدًا
+}
+
+RETENTION_BATCH = 50            # عدد اللقطات المحذوفة في كل خطوة
+RETENTION_PAUSE = 0.05          # ثواني بين الخطوات حتى لا تزاحم الحفظ
+
+
+def load_retention_policy():
+    policy = dict(DEFAULT_RETENTION)
+    path = data_path(RETENTION_FILE)
+    if os.path.exists(path):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                policy.update(json.load(f))
+        except (json.JSONDecodeError, OSError) as e:
+            print(f"⚠️ تعذر قراءة {RETENTION_FILE}، سيتم استخدام السياسة الافتراضية:", e)
+    return policy
+
+
+def save_retention_policy(policy):
+    atomic_write(data_path(RETENTION_FILE), json.dumps(policy, ensure_ascii=False, indent=2))
+
+
+# المستويات: [(أقصى عمر بالثواني، حجم الفترة بالثواني - 0 = الكل)]
+def _tiers(policy):
+    return [
+        (policy["keep_all_hours"] * 3600, 0),
+        (policy["hourly_days"] * 86400, 3600),
+        (policy["daily_days"] * 86400, 86400),
+    ]
+
+
+# فلتر متتابع (من الأقدم للأحدث): يُبقي أول لقطة في كل ساعة/يوم حسب عمرها
+class RetentionFilter:
+    def __init__(self, policy=None, now=None):
+        self.tiers = _tiers(policy or load_retention_policy())
+        self.now = now or time.time()
+        self._last_bucket = None
+
+    def keep(self, when):
+        age = self.now - when.timestamp()
+        for tier, (max_age, period) in enumerate(self.tiers):
+            if age < max_age:
+                break
+        else:
+            return False  # أقدم من آخر مستوى
+        if not period:
+            return True
+        bucket = (tier, int(when.timestamp() // period))
+        if bucket == self._last_bucket:
+            return False
+        self._last_bucket = bucket
+        return True
+
+
+def _snapshot_time(filename):
+    dated, date_part = snapshot_sort_key(filename)
+    return datetime.strptime(date_part, "%Y-%m-%d_%H-%M-%S") if dated else None
+
+
+# اللقطات التي ستُحذف حسب السياسة (الأسماء غير المؤرخة والموصوفة تبقى)
+def _expired_snapshots(policy, now):
+    keep = RetentionFilter(policy, now)
+    expired = []
+    for filename in snapshot_index():
+        when = _snapshot_time(filename)
+        if when is None or (policy["keep_described"] and "__" in filename):
+            continue
+        if not keep.keep(when):
+            expired.append(filename)
+    return expired
+
+
+# لقطات سجل التاريخ في قاعدة SQLite التي ستُحذف: [id]
+def _expired_history_rows(db, policy, now):
+    keep = RetentionFilter(policy, now)
+    expired = []
+    for row_id, taken_at in db.history_times():
+        try:
+            when = datetime.strptime(taken_at, "%Y-%m-%d_%H-%M-%S")
+        except ValueError:
+            continue
+        if not keep.keep(when):
+            expired.append(row_id)
+    return expired
+
+
+# لقطات سجل التاريخ التي ستُحذف: (العدد، البايتات) - بقراءة السجل سطرًا سطرًا
+def _expired_history(policy, now):
+    db = backend.active()
+    if db is not None:
+        expired = _expired_history_rows(db, policy, now)
+        return len(expired), db.history_size(expired)
+    journal = data_path(HISTORY_JOURNAL)
+    if not os.path.exists(journal):
+        return 0, 0
+    keep = RetentionFilter(policy, now)
+    count = size = 0
+    with open(journal, "rb") as f:
+        for line in f:
+            try:
+                when = datetime.strptime(json.loads(line)["timestamp"], "%Y-%m-%d %H:%M:%S")
+            except (ValueError, KeyError):
+                continue
+            if not keep.keep(when):
+                count += 1
+                size += len(line)
+    return count, size
+
+
+# تقرير تجريبي (dry run): ماذا سيُحذف وكم مساحة ستتوفر - بدون حذف أي شيء
+# store_bytes = الـ keyframes والسجلات والفروق في snapshots/.store التي لن تستخدمها أي لقطة باقية
+def retention_report(policy=None, now=None):
+    policy = policy or load_retention_policy()
+    now = now or time.time()
+    expired = _expired_snapshots(policy, now)
+    snapshot_bytes = 0
+    if backend.active() is None:
+        for filename in expired:
+            try:
+                snapshot_bytes += os.path.getsize(data_path(SNAPSHOT_FOLDER, filename))
+            except OSError:
+                pass
+    history_entries, history_bytes = _expired_history(policy, now)
+    return {
+        "snapshots": expired,
+        "snapshot_bytes": snapshot_bytes,
+        "store_bytes": snapshot_store_garbage(expired),
+        "history_entries": history_entries,
+        "history_bytes": history_bytes,
+    }
+
+
+# تطبيق السياسة: حذف اللقطات على دفعات صغيرة، ثم تنظيف المخزن مما لم يعد مستخدمًا،
+# ثم ضغط سجل التاريخ بنفس الفلتر
+# progress(المحذوف، الإجمالي) اختياري - يُستدعى بعد كل دفعة
+# target = (مجلد البيانات، القاعدة) ملتقطة عند بدء المهمة: كل المسارات تُحسب منها حتى لو تبدل الملف أثناء التنفيذ
+def apply_retention(policy=None, now=None, progress=None, target=None):
+    if target is not None:
+        data_dir, db = target
+        with paths.pinned_data_dir(data_dir), backend.pinned(db):
+            return apply_retention(policy, now, progress)
+
+    policy = policy or load_retention_policy()
+    now = now or time.time()
+    expired = _expired_snapshots(policy, now)
+    store_before = snapshot_store_size()
+
+    deleted = 0
+    failed = []
+    for start in range(0, len(expired), RETENTION_BATCH):
+        done, errors = delete_snapshots(expired[start:start + RETENTION_BATCH])
+        deleted += len(done)
+        failed += errors
+        if progress is not None:
+            progress(deleted, len(expired))
+        time.sleep(RETENTION_PAUSE)
+
+    # المساحة المحررة من المخزن = فروق اللقطات المحذوفة + ما كنسه التنظيف
+    sweep_snapshot_store()
+    store_bytes = max(0, store_before - snapshot_store_size())
+
+    history_dropped = 0
+    db = backend.active()
+    if db is not None:
+        history_dropped = db.delete_history(_expired_history_rows(db, policy, now))
+    else:
+        keep = RetentionFilter(policy, now)
+
+        def keep_entry(entry):
+            try:
+                return keep.keep(datetime.strptime(entry["timestamp"], "%Y-%m-%d %H:%M:%S"))
+            except (ValueError, KeyError):
+                return True
+
+        result = compact_history(data_path(HISTORY_JOURNAL), data_path(HISTORY_INDEX), keep=keep_entry)
+        if result:
+            history_dropped = result[1]
+
+    return {"deleted": deleted, "failed": failed, "history_dropped": history_dropped, "store_bytes": store_bytes}
+
+
+# تشغيل apply_retention في thread - done(النتيجة أو الخطأ) يُستدعى من الـ thread نفسه
+# مجلد البيانات والقاعدة يُلتقطان هنا (في thread المستدعي) قبل بدء المهمة
+def start_retention(policy=None, done=None, progress=None):
+    target = (paths.data_dir(), backend.active())
+
+    def worker():
+        try:
+            result = apply_retention(policy, progress=progress, target=target)
+        except Exception as e:
+            result = e
+        if done is not None:
+            done(result)
+
+    thread = threading.Thread(target=worker, name="retention", daemon=True)
+    thread.start()
+    return thread
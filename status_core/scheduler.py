@@ -0,0 +1,141 @@
+import threading
+import time
+
+from .history import history_count, read_history_entry, save_snapshot
+from .snapshots import skills_fingerprint
+from .storage import read_skills_file
+
+
+# حد معدل بطريقة token bucket: الرصيد يزيد rate في الثانية حتى burst، وكل لقطة تستهلك 1
+# (rate=None = بدون حد)
+class TokenBucket:
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def take(self, now=None):
+        if self.rate is None:
+            return True
+        self._refill(time.monotonic() if now is None else now)
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+    # الثواني المتبقية حتى يتوفر رصيد للقطة التالية
+    def wait_time(self, now=None):
+        if self.rate is None:
+            return 0.0
+        self._refill(time.monotonic() if now is None else now)
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+
+# جدولة لقطات سجل التاريخ:
+# - الطلب اليدوي يُنفذ فورًا لو الرصيد يسمح، وإلا يُؤجل (لا يضيع) ويُنفذ عند توفر الرصيد،
+#   وكل الطلبات أثناء الانتظار تُدمج في لقطة واحدة تُؤخذ في النهاية بآخر حالة
+# - min_interval <= 0 = بدون حد للمعدل (كل طلب يُنفذ فورًا)
+# - لقطة دورية كل period ثانية لو تغيرت المهارات منذ آخر لقطة (0 = بدون)
+# يحركه مؤقت خارجي (root.after في الواجهة) عبر next_delay/tick، أو thread داخلي بـ start()
+class SnapshotScheduler:
+    def __init__(self, min_interval=5.0, burst=1, period=3600.0, prepare=None):
+        self.bucket = TokenBucket(1.0 / min_interval if min_interval > 0 else None, burst)
+        self.period = period
+        self.prepare = prepare            # يُستدعى قبل كل لقطة (مثل كتابة الحفظ المؤجل)
+        self.pending = False
+        self.last_time = time.monotonic()
+        self.last_fingerprint = None
+        self._cond = threading.Condition(threading.RLock())
+        self._thread = None
+        self._stopped = False
+
+    def _read(self):
+        if self.prepare is not None:
+            self.prepare()
+        data = read_skills_file()
+        if data is None:
+            raise ValueError("ملف المهارات فارغ!")
+        return data
+
+    def _take(self, now, data=None):
+        self.pending = False  # حتى لو فشلت اللقطة لا نعيد المحاولة بلا نهاية
+        data = self._read() if data is None else data
+        timestamp = save_snapshot(data)
+        self.last_fingerprint = skills_fingerprint(data)
+        self.last_time = now
+        return timestamp
+
+    # هل تغيرت المهارات عن آخر لقطة في السجل؟
+    def _changed(self, data):
+        if self.last_fingerprint is None and history_count():
+            self.last_fingerprint = skills_fingerprint(read_history_entry(-1)["skills"])
+        return skills_fingerprint(data) != self.last_fingerprint
+
+    # طلب لقطة - ترجع وقتها لو أُخذت الآن، أو None لو تأجلت (next_delay تعطي موعدها)
+    def request(self):
+        with self._cond:
+            now = time.monotonic()
+            if not self.pending and self.bucket.take(now):
+                return self._take(now)
+            self.pending = True
+            self._cond.notify_all()
+            return None
+
+    # تنفيذ ما حان وقته (الطلب المؤجل أو اللقطة الدورية) - ترجع وقت اللقطة أو None
+    def tick(self):
+        with self._cond:
+            now = time.monotonic()
+            if self.pending:
+                return self._take(now) if self.bucket.take(now) else None
+
+            if self.period and now - self.last_time >= self.period:
+                self.last_time = now  # الفترة التالية تبدأ الآن حتى لو لم يتغير شيء
+                data = self._read()
+                if self._changed(data) and self.bucket.take(now):
+                    return self._take(now, data)
+            return None
+
+    # الثواني حتى الـ tick التالي، أو None لو لا يوجد ما ينتظر
+    def next_delay(self):
+        with self._cond:
+            now = time.monotonic()
+            if self.pending:
+                return self.bucket.wait_time(now)
+            if self.period:
+                return max(0.0, self.last_time + self.period - now)
+            return None
+
+    # عند الخروج: الطلب المؤجل يُؤخذ الآن بدون انتظار الرصيد
+    def flush(self):
+        with self._cond:
+            if self.pending:
+                return self._take(time.monotonic())
+            return None
+
+    # تشغيل الجدولة في thread خاص (للاستخدام بدون واجهة)
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="snapshot-scheduler", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        with self._cond:
+            while not self._stopped:
+                self._cond.wait(self.next_delay())
+                if self._stopped:
+                    return
+                try:
+                    self.tick()
+                except Exception as e:
+                    print("❌ فشل أخذ لقطة مجدولة:", e)
+
+    def stop(self):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join()
@@ -0,0 +1,872 @@
+import bisect
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+from . import backend
+from .atomic import atomic_append, atomic_write
+from .binary import BINARY_MAGIC, BINARY_SUFFIX, encode_binary_snapshot, is_binary_snapshot, read_binary_snapshot
+from .diff import diff_skills
+from .paths import (
+    data_path, drop_cached_paths, SNAPSHOT_FOLDER, SNAPSHOT_STORE, SNAPSHOT_OBJECTS, SNAPSHOT_LAST, SNAPSHOT_DELTAS,
+    SNAPSHOT_FRAMES, SNAPSHOT_FRAME,
+)
+
+
+_snapshot_objects = {}                 # مسار objects.jsonl -> {hash: سجل المهارة}
+_last_snapshot_info = {}               # مسار مجلد اللقطات -> {"filename", "fingerprint", "mtime_ns"}
+_snapshot_lock = threading.RLock()     # كتابة/إعادة تسمية/حذف اللقطات من أكثر من thread (الحفظ التلقائي، التنظيف)
+_snapshot_index = {}                   # مسار مجلد اللقطات -> {"mtime_ns", "names", "keys"} مرتبة بالتاريخ
+_snapshot_deltas = {}                  # مسار deltas.jsonl -> الفروق وفهرسها بالاسم (_load_snapshot_deltas)
+_snapshot_frames = {}                  # مسار frames.jsonl -> {id: قائمة hashes}
+_frame_values = {}                     # (مسار frames.jsonl، id) -> {اسم: قيمة} بعد فك الـ keyframe مرة واحدة
+_frame_state = {}                      # مسار مجلد اللقطات -> {"base": id, "deltas": عدد اللقطات بعده}
+
+SNAPSHOT_KEYFRAME_EVERY = 20           # لقطة كاملة كل N لقطة، وما بينها فروق عن آخر keyframe فقط
+SNAPSHOT_DELTAS_COMPACT_MIN = 200      # deltas.jsonl يُعاد كتابته لما تزيد أسطره الزائدة عن هذا وعن عدد الفروق الحية
+SNAPSHOT_FORMATS = ("json", "binary")  # صيغة اللقطات الجديدة: فرق/keyframe JSON أو ثنائية مستقلة (status_core.binary)
+SNAPSHOT_SUFFIXES = (".json", BINARY_SUFFIX)
+
+_snapshot_format = "json"
+
+_SNAPSHOT_DATE = re.compile(r"\d{4}-\d{2}-\d{2}_\d{2}-\d{2}-\d{2}")
+
+
+# ====== بصمة آخر لقطة ======
+
+# بصمة قائمة المهارات كاملة (تتغير مع أي تعديل في اسم أو قيمة أو ترتيب)
+def skills_fingerprint(skills_list):
+    data = json.dumps(skills_list, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha1(data.encode("utf-8")).hexdigest()
+
+
+# اسم اللقطة بدون الامتداد (.json أو .skb) - للعرض ولأسماء الصور المصدرة
+def snapshot_stem(filename):
+    for suffix in SNAPSHOT_SUFFIXES:
+        if filename.endswith(suffix):
+            return filename[:-len(suffix)]
+    return filename
+
+
+# مفتاح ترتيب اللقطة = الجزء الخاص بالتاريخ فقط (بدون __الوصف)
+# الأسماء التي لا تبدأ بتاريخ تُعتبر أقدم من أي لقطة مؤرخة
+def snapshot_sort_key(filename):
+    date_part = snapshot_stem(filename).split("__")[0]
+    return (1 if _SNAPSHOT_DATE.fullmatch(date_part) else 0, date_part)
+
+
+# ====== فهرس اللقطات ======
+
+# الفهرس المرتب لمجلد اللقطات - يُبنى بـ os.scandir مرة واحدة ويُعاد بناؤه فقط لو تغير mtime المجلد
+def _snapshot_index_state():
+    folder = data_path(SNAPSHOT_FOLDER)
+    try:
+        mtime_ns = os.stat(folder).st_mtime_ns
+    except FileNotFoundError:
+        return {"mtime_ns": None, "names": [], "keys": []}
+
+    state = _snapshot_index.get(folder)
+    if state is None or state["mtime_ns"] != mtime_ns:
+        with os.scandir(folder) as it:
+            names = [entry.name for entry in it if entry.name.endswith(SNAPSHOT_SUFFIXES) and entry.is_file()]
+        names.sort(key=snapshot_sort_key)
+        state = {"mtime_ns": mtime_ns, "names": names, "keys": [snapshot_sort_key(n) for n in names]}
+        _snapshot_index[folder] = state
+    return state
+
+
+# أسماء كل اللقطات من الأقدم للأحدث (القائمة نفسها من الكاش - لا تعدّلها)
+def snapshot_index():
+    db = backend.active()
+    if db is not None:
+        return db.snapshot_index()
+    return _snapshot_index_state()["names"]
+
+
+# اللقطات بين يومين (YYYY-MM-DD، شاملين) بالبحث الثنائي في الفهرس بدون المرور على المجلد
+def snapshot_range(since=None, until=None):
+    db = backend.active()
+    if db is not None:
+        return db.snapshot_range(since, until)
+    state = _snapshot_index_state()
+    if not since and not until:
+        return list(state["names"])
+
+    keys = state["keys"]
+    start = bisect.bisect_left(keys, (1, since)) if since else bisect.bisect_left(keys, (1, ""))
+    end = bisect.bisect_right(keys, (1, until + "\uffff")) if until else len(keys)
+    return state["names"][start:end]
+
+
+# تسجيل لقطة كتبناها بأنفسنا في الفهرس بدل إعادة قراءة المجلد
+def _index_add(filename, fresh):
+    folder = data_path(SNAPSHOT_FOLDER)
+    state = _snapshot_index.get(folder)
+    if not fresh or state is None:
+        return
+    key = snapshot_sort_key(filename)
+    i = bisect.bisect_left(state["keys"], key)
+    if i == len(state["names"]) or state["names"][i] != filename:
+        state["names"].insert(i, filename)
+        state["keys"].insert(i, key)
+    state["mtime_ns"] = os.stat(folder).st_mtime_ns
+
+
+# هل الفهرس في الذاكرة مطابق للمجلد الآن؟
+def _index_is_fresh():
+    folder = data_path(SNAPSHOT_FOLDER)
+    state = _snapshot_index.get(folder)
+    try:
+        return state is not None and state["mtime_ns"] == os.stat(folder).st_mtime_ns
+    except FileNotFoundError:
+        return False
+
+
+# حفظ بصمة آخر لقطة في الذاكرة وفي الملف الجانبي
+def _remember_last_snapshot(filename, fingerprint):
+    folder = data_path(SNAPSHOT_FOLDER)
+    os.makedirs(data_path(SNAPSHOT_STORE), exist_ok=True)
+    info = {
+        "filename": filename,
+        "fingerprint": fingerprint,
+        "mtime_ns": os.stat(folder).st_mtime_ns,
+    }
+    _last_snapshot_info[folder] = info
+    atomic_write(data_path(SNAPSHOT_LAST), json.dumps(info, ensure_ascii=False))
+
+
+# بصمة آخر لقطة - O(1) طالما لم يتغير مجلد اللقطات من خارج save_skills
+def last_snapshot_fingerprint():
+    folder = data_path(SNAPSHOT_FOLDER)
+    os.makedirs(data_path(SNAPSHOT_STORE), exist_ok=True)
+    mtime_ns = os.stat(folder).st_mtime_ns
+
+    info = _last_snapshot_info.get(folder)
+    if info is None and os.path.exists(data_path(SNAPSHOT_LAST)):
+        try:
+            with open(data_path(SNAPSHOT_LAST), "r", encoding="utf-8") as f:
+                info = json.load(f)
+        except (json.JSONDecodeError, OSError):
+            info = None
+
+    if info and info.get("mtime_ns") == mtime_ns:
+        _last_snapshot_info[folder] = info
+        return info["fingerprint"]
+
+    # المجلد تغير (إعادة تسمية/حذف/نسخ يدوي) → نعيد الحساب مرة واحدة
+    names = snapshot_index()
+    newest = names[-1] if names else None
+    last_snapshot = load_snapshot(newest) if newest else []
+    fingerprint = skills_fingerprint(last_snapshot)
+    _remember_last_snapshot(newest, fingerprint)
+    return fingerprint
+
+
+# أخذ لقطة جديدة فقط لو المهارات اختلفت عن آخر لقطة - ترجع اسم الملف أو None
+def snapshot_if_changed(skills_list):
+    with _snapshot_lock:
+        fingerprint = skills_fingerprint(skills_list)
+        if fingerprint == last_snapshot_fingerprint():
+            return None
+
+        previous = _last_snapshot_info[data_path(SNAPSHOT_FOLDER)]["filename"]
+        now = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        filename = write_snapshot(skills_list, f"{now}.json")
+        if filename == previous:
+            # نفس الثانية → استبدلنا اللقطة السابقة: فروقها القديمة لم تعد صحيحة، والفرق الجديد من التي قبلها
+            _rename_snapshot_deltas([(filename, None)])
+            previous = previous_snapshot(filename)
+        _remember_last_snapshot(filename, fingerprint)
+        _record_snapshot_delta(previous, filename, skills_list)
+        return filename
+
+
+# ====== فروق اللقطات المتتالية ======
+
+def _delta_line(older, newer, diff):
+    return json.dumps({"from": older, "to": newer, "diff": diff}, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+
+def _index_delta(state, key, diff):
+    if key in state["diffs"]:
+        state["garbage"] += 1  # نفس الزوج مسجل من قبل → سطره القديم زائد
+    state["diffs"][key] = diff
+    for name in key:
+        state["names"].setdefault(name, set()).add(key)
+
+
+# تطبيق إعادة تسمية/حذف على الفروق في الذاكرة - يلمس فقط الفروق الخاصة بالأسماء المتغيرة
+def _fold_delta_changes(state, changes):
+    renamed = dict(changes)
+    keys = set()
+    for old in renamed:
+        keys.update(state["names"].pop(old, ()))
+    for key in keys:
+        diff = state["diffs"].pop(key)
+        for name in key:
+            if name not in renamed:
+                state["names"][name].discard(key)
+        a, b = key
+        a, b = renamed.get(a, a), renamed.get(b, b)
+        if (key[0] in renamed and a is None) or (key[1] in renamed and b is None):
+            state["garbage"] += 1  # فرق يخص لقطة محذوفة
+            continue
+        _index_delta(state, (a, b), diff)
+
+
+# الفروق في الذاكرة: {"diffs": {(السابقة، اللقطة): الفرق}, "names": {اسم: مفاتيحه}, "garbage": أسطر زائدة}
+# الملف إلحاقي: سطر لكل فرق، وسطر {"changes": [[القديم، الجديد أو null]]} لكل إعادة تسمية/حذف
+# (يُطبق بالترتيب عند التحميل مثل history.jsonl) - ويُعاد كتابته فقط لما تكثر أسطره الزائدة
+def _load_snapshot_deltas():
+    path = data_path(SNAPSHOT_DELTAS)
+    state = _snapshot_deltas.get(path)
+    if state is not None:
+        return state
+
+    state = _snapshot_deltas[path] = {"diffs": {}, "names": {}, "garbage": 0}
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    obj = json.loads(line)
+                    if "changes" in obj:
+                        _fold_delta_changes(state, [tuple(change) for change in obj["changes"]])
+                        state["garbage"] += 1
+                    else:
+                        _index_delta(state, (obj["from"], obj["to"]), obj["diff"])
+                except (ValueError, KeyError, TypeError):
+                    state["garbage"] += 1  # سطر ناقص أو تالف
+    return state
+
+
+# إعادة كتابة deltas.jsonl من الفروق الحية فقط (بدون أسطر التغييرات والفروق القديمة)
+def _compact_snapshot_deltas(state):
+    atomic_write(data_path(SNAPSHOT_DELTAS),
+                 "".join(_delta_line(a, b, diff) for (a, b), diff in state["diffs"].items()))
+    state["garbage"] = 0
+
+
+def _maybe_compact_snapshot_deltas(state):
+    if state["garbage"] > max(SNAPSHOT_DELTAS_COMPACT_MIN, len(state["diffs"])):
+        _compact_snapshot_deltas(state)
+
+
+# حساب فرق اللقطة الجديدة عن السابقة لها مرة واحدة وقت الكتابة (سطر إلحاقي)
+def _record_snapshot_delta(previous, filename, skills_list):
+    try:
+        diff = diff_skills(load_snapshot(previous) if previous else [], skills_list)
+    except (OSError, KeyError, ValueError):
+        return  # اللقطة السابقة غير مقروءة → يُحسب الفرق عند الطلب
+    state = _load_snapshot_deltas()
+    _index_delta(state, (previous, filename), diff)
+    atomic_append(data_path(SNAPSHOT_DELTAS), _delta_line(previous, filename, diff))
+    _maybe_compact_snapshot_deltas(state)
+
+
+# بعد إعادة التسمية أو الحذف: سطر واحد بالتغييرات بدل إعادة كتابة الملف
+# changes = [(القديم، الجديد أو None)] - الأسماء التي ليس لها فروق لا تُسجل
+def _rename_snapshot_deltas(changes):
+    state = _load_snapshot_deltas()
+    changes = [(old, new) for old, new in changes if old in state["names"]]
+    if not changes:
+        return
+    _fold_delta_changes(state, changes)
+    state["garbage"] += 1
+    atomic_append(data_path(SNAPSHOT_DELTAS),
+                  json.dumps({"changes": changes}, ensure_ascii=False, separators=(",", ":")) + "\n")
+    _maybe_compact_snapshot_deltas(state)
+
+
+# فرق لقطتين (older=None تعني لقطة فارغة) - المتتالية محسوبة مسبقًا، وغيرها يُحسب بالاسم
+def snapshot_diff(older, newer):
+    db = backend.active()
+    if db is not None:
+        return db.snapshot_diff(older, newer)
+    diff = _load_snapshot_deltas()["diffs"].get((older, newer))
+    if diff is None:
+        diff = diff_skills(load_snapshot(older) if older else [], load_snapshot(newer))
+    return diff
+
+
+# اللقطة السابقة مباشرة في الترتيب الزمني (أو None للأقدم)
+def previous_snapshot(filename):
+    names = snapshot_index()
+    i = names.index(filename)
+    return names[i - 1] if i else None
+
+
+# ====== مخزن اللقطات (content-addressed) ======
+
+# بصمة سجل مهارة واحد (نفس السجل ← نفس الـ hash دائمًا)
+def _record_hash(record):
+    data = json.dumps(record, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha1(data.encode("utf-8")).hexdigest()[:16]
+
+
+# تحميل كل السجلات المخزنة مرة واحدة في الذاكرة
+def _load_snapshot_objects():
+    path = data_path(SNAPSHOT_OBJECTS)
+    objects = _snapshot_objects.get(path)
+    if objects is not None:
+        return objects
+
+    objects = _snapshot_objects[path] = {}
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    obj = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # سطر ناقص في النهاية
+                objects[obj["h"]] = obj["r"]
+    return objects
+
+
+# حفظ سجلات المهارات في المخزن (الجديد فقط) وإرجاع قائمة الـ hashes بنفس الترتيب
+def store_snapshot_records(records):
+    objects = _load_snapshot_objects()
+    hashes = []
+    new_lines = []
+    for record in records:
+        h = _record_hash(record)
+        if h not in objects:
+            objects[h] = dict(record)  # نسخة حتى لا تتأثر بتعديل القائمة لاحقًا
+            new_lines.append(json.dumps({"h": h, "r": record}, ensure_ascii=False, separators=(",", ":")))
+        hashes.append(h)
+
+    if new_lines:
+        os.makedirs(data_path(SNAPSHOT_STORE), exist_ok=True)
+        atomic_append(data_path(SNAPSHOT_OBJECTS), "\n".join(new_lines) + "\n")
+    return hashes
+
+
+# ====== keyframes + فروق ======
+
+def _load_snapshot_frames():
+    path = data_path(SNAPSHOT_FRAMES)
+    frames = _snapshot_frames.get(path)
+    if frames is not None:
+        return frames
+
+    frames = _snapshot_frames[path] = {}
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    obj = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # سطر ناقص في النهاية
+                frames[obj["h"]] = obj["objects"]
+    return frames
+
+
+# تسجيل keyframe (قائمة hashes) في المخزن - ترجع الـ id الخاص به
+def _store_frame(hashes):
+    frame_id = hashlib.sha1(",".join(hashes).encode("ascii")).hexdigest()[:16]
+    frames = _load_snapshot_frames()
+    if frame_id not in frames:
+        frames[frame_id] = hashes
+        atomic_append(data_path(SNAPSHOT_FRAMES), json.dumps({"h": frame_id, "objects": hashes}, separators=(",", ":")) + "\n")
+    return frame_id
+
+
+# قيم keyframe كـ {اسم: قيمة} - تُفك مرة واحدة ثم تُستخدم لكل اللقطات المبنية عليه
+def _keyframe_values(frame_id):
+    key = (data_path(SNAPSHOT_FRAMES), frame_id)
+    values = _frame_values.get(key)
+    if values is None:
+        objects = _load_snapshot_objects()
+        values = _frame_values[key] = {objects[h]["name"]: objects[h]["value"]
+                                       for h in _load_snapshot_frames()[frame_id]}
+    return values
+
+
+# لقطة = keyframe + فرق: حذف المحذوف ثم تطبيق القيم الجديدة (الجديد يُضاف في النهاية)
+def _apply_frame_delta(frame_id, delta):
+    values = dict(_keyframe_values(frame_id))
+    for name in delta.get("removed", ()):
+        values.pop(name, None)
+    values.update(delta.get("set", {}))
+    return [{"name": name, "value": value} for name, value in values.items()]
+
+
+def _current_frame_state():
+    folder = data_path(SNAPSHOT_FOLDER)
+    state = _frame_state.get(folder)
+    if state is None and os.path.exists(data_path(SNAPSHOT_FRAME)):
+        try:
+            with open(data_path(SNAPSHOT_FRAME), "r", encoding="utf-8") as f:
+                state = _frame_state[folder] = json.load(f)
+        except (json.JSONDecodeError, OSError):
+            state = None
+    return state
+
+
+def _remember_frame_state(base, deltas):
+    state = _frame_state[data_path(SNAPSHOT_FOLDER)] = {"base": base, "deltas": deltas}
+    atomic_write(data_path(SNAPSHOT_FRAME), json.dumps(state))
+
+
+# محتوى ملف اللقطة: فرق عن الـ keyframe الحالي، أو keyframe جديد كل SNAPSHOT_KEYFRAME_EVERY لقطة
+# (أو لو الفرق لا يعيد بناء نفس القائمة بنفس الترتيب)
+def _encode_snapshot(skills_list):
+    state = _current_frame_state()
+    if state and state["deltas"] < SNAPSHOT_KEYFRAME_EVERY - 1 and state["base"] in _load_snapshot_frames():
+        try:
+            base = _keyframe_values(state["base"])
+            new_values = {record["name"]: record["value"] for record in skills_list}
+            delta = {
+                "base": state["base"],
+                "set": {name: value for name, value in new_values.items()
+                        if name not in base or base[name] != value},
+                "removed": [name for name in base if name not in new_values],
+            }
+            if _apply_frame_delta(state["base"], delta) == skills_list:
+                _remember_frame_state(state["base"], state["deltas"] + 1)
+                return delta
+        except (KeyError, TypeError):
+            pass  # مخزن ناقص أو سجلات بحقول إضافية → keyframe كامل
+
+    hashes = store_snapshot_records(skills_list)
+    _remember_frame_state(_store_frame(hashes), 0)
+    return {"objects": hashes}
+
+
+# صيغة اللقطات الجديدة (القديمة تُقرأ بأي صيغة كانت - والتحويل بـ convert_snapshots)
+def set_snapshot_format(fmt):
+    global _snapshot_format
+    if fmt not in SNAPSHOT_FORMATS:
+        raise ValueError(f"صيغة لقطات غير معروفة: {fmt}")
+    _snapshot_format = fmt
+
+
+def snapshot_format():
+    return _snapshot_format
+
+
+# محتوى ملف اللقطة بالصيغة المطلوبة وامتداده: (البيانات، الامتداد)
+# (الثنائية ترجع لـ JSON لو المهارات لا تصلح لها)
+def _snapshot_bytes(skills_list, fmt):
+    if fmt == "binary":
+        data = encode_binary_snapshot(skills_list)
+        if data is not None:
+            return data, BINARY_SUFFIX
+    manifest = _encode_snapshot(skills_list)
+    return json.dumps(manifest, ensure_ascii=False, separators=(",", ":")), ".json"
+
+
+# كتابة لقطة جديدة: فرق صغير عن آخر keyframe، أو قائمة hashes كاملة للـ keyframe، أو ثنائية
+# الامتداد يتبع الصيغة المكتوبة فعلًا - ترجع اسم الملف النهائي
+def write_snapshot(skills_list, filename):
+    with _snapshot_lock:
+        os.makedirs(data_path(SNAPSHOT_STORE), exist_ok=True)
+        data, suffix = _snapshot_bytes(skills_list, _snapshot_format)
+        filename = snapshot_stem(filename) + suffix
+        fresh = _index_is_fresh()
+        atomic_write(data_path(SNAPSHOT_FOLDER, filename), data)
+        _index_add(filename, fresh)
+        return filename
+
+
+# قراءة لقطة (ثنائية، أو فرق، أو keyframe، أو الصيغة القديمة) وإرجاع قائمة المهارات
+def load_snapshot(filename):
+    db = backend.active()
+    if db is not None:
+        return db.load_snapshot(filename)
+    with open(data_path(SNAPSHOT_FOLDER, filename), "rb") as f:
+        if f.read(len(BINARY_MAGIC)) == BINARY_MAGIC:
+            return read_binary_snapshot(f)
+        f.seek(0)
+        data = json.load(f)
+
+    if isinstance(data, dict) and "base" in data:
+        return _apply_frame_delta(data["base"], data)
+    if isinstance(data, dict) and "objects" in data:
+        objects = _load_snapshot_objects()
+        return [dict(objects[h]) for h in data["objects"]]
+    return data  # ملف قديم: نسخة كاملة من skills.json
+
+
+# تحويل لقطات موجودة إلى صيغة أخرى: الاسم نفسه مع امتداد الصيغة الجديدة، ووقت التعديل كما هو
+# حتى لا تُعاد الصور المصدرة - ترجع (عدد المحولة، [(الاسم، الخطأ)])
+# اللقطات التي بنفس الصيغة أو لا تصلح لها تُتخطى (والثنائية القديمة باسم .json يُصحح اسمها فقط)
+def convert_snapshots(fmt, filenames=None):
+    if fmt not in SNAPSHOT_FORMATS:
+        raise ValueError(f"صيغة لقطات غير معروفة: {fmt}")
+    if backend.active() is not None:
+        return 0, []  # لقطات SQLite صفوف في القاعدة وليست ملفات
+    suffix = BINARY_SUFFIX if fmt == "binary" else ".json"
+    with _snapshot_lock:
+        os.makedirs(data_path(SNAPSHOT_STORE), exist_ok=True)
+        index_fresh, last_fresh = _index_is_fresh(), _last_is_fresh()
+        converted = 0
+        renamed = []
+        failed = []
+        for filename in list(snapshot_index() if filenames is None else filenames):
+            path = data_path(SNAPSHOT_FOLDER, filename)
+            new_filename = snapshot_stem(filename) + suffix
+            new_path = data_path(SNAPSHOT_FOLDER, new_filename)
+            try:
+                data = None
+                if is_binary_snapshot(path) != (fmt == "binary"):
+                    skills_list = load_snapshot(filename)
+                    if fmt == "binary":
+                        data = encode_binary_snapshot(skills_list)
+                        if data is None:
+                            continue
+                    else:
+                        hashes = store_snapshot_records(skills_list)  # keyframe مستقل لا يعتمد على ترتيب التحويل
+                        data = json.dumps({"objects": hashes}, separators=(",", ":"))
+                elif new_filename == filename:
+                    continue
+                if new_filename != filename and os.path.exists(new_path):
+                    raise FileExistsError(new_filename)
+
+                stat = os.stat(path)
+                if data is None:
+                    os.rename(path, new_path)
+                else:
+                    atomic_write(new_path, data)
+                    if new_filename != filename:
+                        try:
+                            os.remove(path)
+                        except OSError:
+                            os.remove(new_path)  # لا نترك نسختين من نفس اللقطة
+                            raise
+                os.utime(new_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+                converted += 1
+                if new_filename != filename:
+                    renamed.append((filename, new_filename))
+            except (OSError, KeyError, ValueError) as e:
+                failed.append((filename, e))
+
+        folder = data_path(SNAPSHOT_FOLDER)
+        if renamed:
+            _apply_folder_changes(renamed, index_fresh, last_fresh)
+        elif converted:
+            if index_fresh:
+                _snapshot_index[folder]["mtime_ns"] = os.stat(folder).st_mtime_ns  # الأسماء لم تتغير
+            info = _last_snapshot_info.get(folder)
+            if last_fresh and info:
+                _remember_last_snapshot(info["filename"], info["fingerprint"])
+        return converted, failed
+
+
+# نسيان كل ما في الذاكرة عن لقطات مجلد بيانات (عند إغلاق ملفه، أو كأن التطبيق فُتح من جديد)
+def drop_caches(folder, exclude=None):
+    with _snapshot_lock:
+        for cache in (_snapshot_objects, _last_snapshot_info, _snapshot_index, _snapshot_deltas,
+                      _snapshot_frames, _frame_values, _frame_state):
+            drop_cached_paths(cache, folder, exclude)
+
+
+# تفريغ كاش المخزن لهذا المجلد (تُقرأ الملفات من جديد عند أول لقطة)
+def _drop_store_caches():
+    objects_path, frames_path = data_path(SNAPSHOT_OBJECTS), data_path(SNAPSHOT_FRAMES)
+    _snapshot_objects.pop(objects_path, None)
+    _snapshot_frames.pop(frames_path, None)
+    for key in [key for key in _frame_values if key[0] == frames_path]:
+        del _frame_values[key]
+
+
+# مقارنة على الملفات الموجودة فعلًا: اللقطات بصيغتها الحالية على القرص (مع snapshots/.store الذي
+# تعتمد عليه) مقابل نفس اللقطات بالصيغة الثنائية في مجلد مؤقت - بدون لمس البيانات
+# كل تكرار يبدأ بكاش فارغ داخل العملية (المخزن يُقرأ ويُفك من جديد)؛ كاش نظام التشغيل لا نتحكم فيه
+# الصيغة الثنائية لا تستخدم keyframes ولا فروق: كل ملف لقطة كاملة، فحجمها ينمو بعدد المهارات في كل لقطة
+# ترجع {"snapshots", "skipped": [(الاسم، الخطأ)], "current_bytes", "current_seconds", "binary_bytes", "binary_seconds"}
+def benchmark_snapshot_formats(filenames=None, repeat=5):
+    result = {"snapshots": 0, "skipped": [], "current_bytes": 0, "current_seconds": 0.0,
+              "binary_bytes": 0, "binary_seconds": 0.0}
+    if backend.active() is not None:
+        return result  # لقطات SQLite ليست ملفات
+
+    folder = tempfile.mkdtemp(prefix="snapshot-bench-")
+    try:
+        with _snapshot_lock:
+            names, binary_paths = [], []
+            for filename in list(snapshot_index() if filenames is None else filenames):
+                try:
+                    data = encode_binary_snapshot(load_snapshot(filename))
+                except (OSError, KeyError, ValueError) as e:
+                    result["skipped"].append((filename, e))
+                    continue
+                if data is None:
+                    result["skipped"].append((filename, ValueError("لا تصلح للصيغة الثنائية")))
+                    continue
+                binary_path = os.path.join(folder, snapshot_stem(filename) + BINARY_SUFFIX)
+                with open(binary_path, "wb") as f:
+                    f.write(data)
+                names.append(filename)
+                binary_paths.append(binary_path)
+
+            def load_binary(path):
+                with open(path, "rb") as f:
+                    return read_binary_snapshot(f)
+
+            def best_time(load, items, cold=False):
+                best = float("inf")
+                for _ in range(repeat):
+                    if cold:
+                        _drop_store_caches()
+                    start = time.perf_counter()
+                    for item in items:
+                        load(item)
+                    best = min(best, time.perf_counter() - start)
+                return best
+
+            if names:
+                result.update({
+                    "snapshots": len(names),
+                    "current_bytes": sum(os.path.getsize(data_path(SNAPSHOT_FOLDER, n)) for n in names)
+                                     + snapshot_store_size(),
+                    "current_seconds": best_time(load_snapshot, names, cold=True),
+                    "binary_bytes": sum(os.path.getsize(p) for p in binary_paths),
+                    "binary_seconds": best_time(load_binary, binary_paths),
+                })
+            _drop_store_caches()
+        return result
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+
+# ====== تنظيف المخزن (mark & sweep) ======
+
+# ما تستخدمه اللقطات الباقية من المخزن: (ids الـ keyframes، hashes السجلات)
+# excluding = لقطات ستُحذف (للتقرير التجريبي) - والـ keyframe الحالي يبقى دائمًا لأن اللقطات القادمة تُبنى عليه
+def _store_references(excluding=()):
+    gone = set(excluding)
+    frame_ids = set()
+    hashes = set()
+    state = _current_frame_state()
+    if state:
+        frame_ids.add(state["base"])
+    for filename in snapshot_index():
+        if filename in gone:
+            continue
+        try:
+            with open(data_path(SNAPSHOT_FOLDER, filename), "rb") as f:
+                if f.read(len(BINARY_MAGIC)) == BINARY_MAGIC:
+                    continue  # الثنائية مستقلة لا تستخدم المخزن
+                f.seek(0)
+                data = json.load(f)
+        except (OSError, ValueError):
+            continue
+        if isinstance(data, dict):
+            if "base" in data:
+                frame_ids.add(data["base"])
+            hashes.update(data.get("objects", ()))
+
+    frames = _load_snapshot_frames()
+    for frame_id in frame_ids:
+        hashes.update(frames.get(frame_id, ()))
+    return frame_ids, hashes
+
+
+# أسطر ملف إلحاقي في المخزن مقسمة إلى (المستخدمة، بايتات غير المستخدمة) - used(obj) يحدد المستخدم
+def _split_store_lines(path, used):
+    kept = []
+    garbage = 0
+    if os.path.exists(path):
+        with open(path, "rb") as f:
+            for line in f:
+                try:
+                    keep = used(json.loads(line))
+                except (ValueError, KeyError, TypeError):
+                    keep = False  # سطر ناقص أو تالف
+                if keep:
+                    kept.append(line)
+                else:
+                    garbage += len(line)
+    return kept, garbage
+
+
+def _store_garbage(frame_ids, hashes):
+    frames = _split_store_lines(data_path(SNAPSHOT_FRAMES), lambda obj: obj["h"] in frame_ids)
+    objects = _split_store_lines(data_path(SNAPSHOT_OBJECTS), lambda obj: obj["h"] in hashes)
+    return frames, objects
+
+
+# المساحة التي سيوفرها تنظيف المخزن لو حُذفت لقطات excluding (بدون تعديل أي شيء)
+def snapshot_store_garbage(excluding=()):
+    if backend.active() is not None:
+        return 0  # القاعدة تحذف قيم اللقطة معها (ON DELETE CASCADE)
+    with _snapshot_lock:
+        (_, frames_bytes), (_, objects_bytes) = _store_garbage(*_store_references(excluding))
+        return frames_bytes + objects_bytes + _deltas_garbage(excluding)
+
+
+# بايتات deltas.jsonl الزائدة (أسطر التغييرات والفروق القديمة وفروق excluding) = الحجم - حجم الفروق الباقية
+def _deltas_garbage(excluding=()):
+    path = data_path(SNAPSHOT_DELTAS)
+    if not os.path.exists(path):
+        return 0
+    gone = set(excluding)
+    live = sum(len(_delta_line(a, b, diff).encode("utf-8"))
+               for (a, b), diff in _load_snapshot_deltas()["diffs"].items() if a not in gone and b not in gone)
+    return max(0, os.path.getsize(path) - live)
+
+
+# الحجم الحالي لملفات المخزن (keyframes + سجلات + فروق)
+def snapshot_store_size():
+    if backend.active() is not None:
+        return 0
+    total = 0
+    for name in (SNAPSHOT_FRAMES, SNAPSHOT_OBJECTS, SNAPSHOT_DELTAS):
+        try:
+            total += os.path.getsize(data_path(name))
+        except OSError:
+            pass
+    return total
+
+
+# حذف الـ keyframes والسجلات التي لم تعد أي لقطة تستخدمها، وضغط deltas.jsonl - ترجع البايتات المحذوفة
+def sweep_snapshot_store():
+    if backend.active() is not None:
+        return 0
+    with _snapshot_lock:
+        frame_ids, hashes = _store_references()
+        (frame_lines, frames_bytes), (object_lines, objects_bytes) = _store_garbage(frame_ids, hashes)
+        if frames_bytes:
+            atomic_write(data_path(SNAPSHOT_FRAMES), b"".join(frame_lines))
+            path = data_path(SNAPSHOT_FRAMES)
+            _snapshot_frames[path] = {h: v for h, v in _load_snapshot_frames().items() if h in frame_ids}
+            for key in [key for key in _frame_values if key[0] == path and key[1] not in frame_ids]:
+                del _frame_values[key]
+        if objects_bytes:
+            atomic_write(data_path(SNAPSHOT_OBJECTS), b"".join(object_lines))
+            path = data_path(SNAPSHOT_OBJECTS)
+            _snapshot_objects[path] = {h: r for h, r in _load_snapshot_objects().items() if h in hashes}
+        deltas_bytes = _deltas_garbage()
+        if deltas_bytes:
+            _compact_snapshot_deltas(_load_snapshot_deltas())
+        return frames_bytes + objects_bytes + deltas_bytes
+
+
+# ====== إدارة ملفات اللقطات ======
+
+# حذف لقطة من الفهرس في الذاكرة
+def _index_remove(filename):
+    state = _snapshot_index.get(data_path(SNAPSHOT_FOLDER))
+    if state is None:
+        return
+    i = bisect.bisect_left(state["keys"], snapshot_sort_key(filename))
+    while i < len(state["names"]) and state["keys"][i] == snapshot_sort_key(filename):
+        if state["names"][i] == filename:
+            del state["names"][i]
+            del state["keys"][i]
+            return
+        i += 1
+
+
+# بعد إعادة تسمية أو حذف قمنا به: نحدّث الفهرس وبصمة آخر لقطة بدل إعادة قراءة المجلد
+# changes = [(الاسم القديم، الاسم الجديد أو None عند الحذف)]
+def _apply_folder_changes(changes, index_fresh, last_fresh):
+    folder = data_path(SNAPSHOT_FOLDER)
+    mtime_ns = os.stat(folder).st_mtime_ns
+
+    if index_fresh:
+        for old, new in changes:
+            _index_remove(old)
+            if new:
+                _index_add(new, True)
+        _snapshot_index[folder]["mtime_ns"] = mtime_ns
+
+    _rename_snapshot_deltas(changes)
+
+    info = _last_snapshot_info.get(folder)
+    if last_fresh and info:
+        renamed = dict(changes)
+        if info["filename"] in renamed:
+            if renamed[info["filename"]] is None:
+                return  # حذفنا آخر لقطة → تُحسب البصمة من جديد عند الحاجة
+            info["filename"] = renamed[info["filename"]]
+        _remember_last_snapshot(info["filename"], info["fingerprint"])
+
+
+def _last_is_fresh():
+    folder = data_path(SNAPSHOT_FOLDER)
+    info = _last_snapshot_info.get(folder)
+    return info is not None and info.get("mtime_ns") == os.stat(folder).st_mtime_ns
+
+
+# الاسم الجديد للقطة بعد إضافة وصف بعد تاريخها
+def renamed_filename(filename, description):
+    stem = snapshot_stem(filename)
+    date_part = stem.split("__")[0]  # نأخذ الجزء الخاص بالتاريخ فقط
+    return f"{date_part}__{description.strip().replace(' ', '_')}{filename[len(stem):] or '.json'}"
+
+
+# إعادة تسمية مجموعة لقطات بنفس الوصف مرة واحدة
+# ترجع ({القديم: الجديد}، [(الاسم، الخطأ)])
+def rename_snapshots(filenames, description):
+    db = backend.active()
+    if db is not None:
+        return db.rename_snapshots(filenames, description)
+    with _snapshot_lock:
+        index_fresh, last_fresh = _index_is_fresh(), _last_is_fresh()
+        renamed = {}
+        failed = []
+        for filename in filenames:
+            new_filename = renamed_filename(filename, description)
+            if new_filename == filename:
+                continue
+            new_path = data_path(SNAPSHOT_FOLDER, new_filename)
+            try:
+                if os.path.exists(new_path):
+                    raise FileExistsError(new_filename)
+                os.rename(data_path(SNAPSHOT_FOLDER, filename), new_path)
+                renamed[filename] = new_filename
+            except OSError as e:
+                failed.append((filename, e))
+
+        if renamed:
+            _apply_folder_changes(list(renamed.items()), index_fresh, last_fresh)
+        return renamed, failed
+
+
+# حذف مجموعة لقطات مرة واحدة - ترجع (المحذوفة، [(الاسم، الخطأ)])
+def delete_snapshots(filenames):
+    db = backend.active()
+    if db is not None:
+        return db.delete_snapshots(filenames)
+    with _snapshot_lock:
+        index_fresh, last_fresh = _index_is_fresh(), _last_is_fresh()
+        deleted = []
+        failed = []
+        for filename in filenames:
+            try:
+                os.remove(data_path(SNAPSHOT_FOLDER, filename))
+                deleted.append(filename)
+            except OSError as e:
+                failed.append((filename, e))
+
+        if deleted:
+            _apply_folder_changes([(name, None) for name in deleted], index_fresh, last_fresh)
+        return deleted, failed
+
+
+# إضافة وصف بعد تاريخ اللقطة - ترجع الاسم الجديد
+def rename_snapshot(filename, description):
+    renamed, failed = rename_snapshots([filename], description)
+    if failed:
+        raise failed[0][1]
+    return renamed.get(filename, filename)
+
+
+def delete_snapshot(filename):
+    deleted, failed = delete_snapshots([filename])
+    if failed:
+        raise failed[0][1]
+
+
+# وقت آخر تعديل للقطة (لمعرفة هل الصورة المصدرة محدثة) - لقطات SQLite لا تتغير بعد كتابتها
+def snapshot_mtime(filename):
+    if backend.active() is not None:
+        return 0.0
+    return os.path.getmtime(data_path(SNAPSHOT_FOLDER, filename))
@@ -0,0 +1,367 @@
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+from .diff import diff_skills
+from .paths import data_path, SKILLS_FILE
+from .snapshots import renamed_filename, skills_fingerprint, snapshot_sort_key
+
+
+SQLITE_FILE = "status.db"
+HISTORY_BATCH = 500                    # لقطات السجل في كل استعلام عند المرور عليه بالترتيب
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS skills (
+    name     TEXT PRIMARY KEY,
+    value    INTEGER NOT NULL,
+    position INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS snapshots (
+    id          INTEGER PRIMARY KEY,
+    name        TEXT NOT NULL UNIQUE,      -- نفس اسم ملف اللقطة في النسخة JSON
+    kind        TEXT NOT NULL,             -- 'auto' (snapshots/) أو 'history' (سجل التاريخ)
+    taken_at    TEXT NOT NULL,             -- YYYY-MM-DD_HH-MM-SS أو '' للأسماء بدون تاريخ
+    fingerprint TEXT
+);
+CREATE INDEX IF NOT EXISTS snapshots_by_time ON snapshots (kind, taken_at, name);
+CREATE TABLE IF NOT EXISTS snapshot_values (
+    snapshot_id INTEGER NOT NULL REFERENCES snapshots (id) ON DELETE CASCADE,
+    position    INTEGER NOT NULL,
+    skill_name  TEXT NOT NULL,
+    value       INTEGER NOT NULL,
+    PRIMARY KEY (snapshot_id, position)
+);
+CREATE INDEX IF NOT EXISTS snapshot_values_by_skill ON snapshot_values (skill_name, snapshot_id);
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS snapshot_deltas (
+    to_id   INTEGER PRIMARY KEY REFERENCES snapshots (id) ON DELETE CASCADE,
+    from_id INTEGER REFERENCES snapshots (id) ON DELETE CASCADE,   -- NULL لأول لقطة
+    diff    TEXT NOT NULL                                          -- JSON بصيغة diff_skills
+);
+"""
+
+
+# لقطة سجل بنفس شكل سطر history.jsonl
+def _history_entry(taken_at, skills_list):
+    date, _, time = taken_at.partition("_")
+    return {
+        "timestamp": f"{date} {time.replace('-', ':')}",
+        "skills": skills_list,
+    }
+
+
+# تخزين المهارات واللقطات والتاريخ في قاعدة SQLite واحدة (WAL)
+# نفس واجهة دوال الملفات: الأسماء والقيم المرجعة لا تتغير، فالواجهة لا تعرف الفرق
+class SqliteBackend:
+    def __init__(self, path=None):
+        self.path = path or data_path(SQLITE_FILE)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.executescript(_SCHEMA)
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+    # ====== بيانات وصفية (meta) ======
+
+    def _meta_get(self, key, default=None):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def _meta_set(self, key, value):
+        self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value)))
+
+    # ====== المهارات ======
+
+    def read_skills_file(self):
+        with self.lock:
+            rows = self.conn.execute("SELECT name, value FROM skills ORDER BY position").fetchall()
+        return [{"name": name, "value": value} for name, value in rows]
+
+    def load_skills(self):
+        return self.read_skills_file()
+
+    def save_skills(self, skills_list):
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM skills")
+            self.conn.executemany(
+                "INSERT INTO skills (name, value, position) VALUES (?, ?, ?)",
+                [(s["name"], s["value"], i) for i, s in enumerate(skills_list)],
+            )
+
+    # ====== اللقطات ======
+
+    def _insert_snapshot(self, name, kind, taken_at, skills_list, fingerprint=None):
+        self.conn.execute("DELETE FROM snapshots WHERE name = ?", (name,))
+        cursor = self.conn.execute(
+            "INSERT INTO snapshots (name, kind, taken_at, fingerprint) VALUES (?, ?, ?, ?)",
+            (name, kind, taken_at, fingerprint),
+        )
+        self.conn.executemany(
+            "INSERT INTO snapshot_values (snapshot_id, position, skill_name, value) VALUES (?, ?, ?, ?)",
+            [(cursor.lastrowid, i, s["name"], s["value"]) for i, s in enumerate(skills_list)],
+        )
+        return cursor.lastrowid
+
+    def _snapshot_values(self, snapshot_id):
+        rows = self.conn.execute(
+            "SELECT skill_name, value FROM snapshot_values WHERE snapshot_id = ? ORDER BY position",
+            (snapshot_id,),
+        ).fetchall()
+        return [{"name": name, "value": value} for name, value in rows]
+
+    # فرق اللقطة عن السابقة لها يُحسب مرة واحدة عند إدخالها
+    def _insert_delta(self, from_id, to_id, previous_list, skills_list):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO snapshot_deltas (to_id, from_id, diff) VALUES (?, ?, ?)",
+            (to_id, from_id, json.dumps(diff_skills(previous_list, skills_list), ensure_ascii=False)),
+        )
+
+    # لقطة تلقائية فقط لو المهارات اختلفت عن آخر لقطة (البصمة محفوظة مع كل لقطة)
+    def snapshot_if_changed(self, skills_list):
+        fingerprint = skills_fingerprint(skills_list)
+        with self.lock, self.conn:
+            row = self.conn.execute(
+                "SELECT id, fingerprint, name FROM snapshots WHERE kind = 'auto' ORDER BY taken_at DESC, name DESC LIMIT 1"
+            ).fetchone()
+            if row and row[1] == fingerprint:
+                return None
+            taken_at = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+            filename = f"{taken_at}.json"
+            if row and row[2] == filename:
+                # نفس الثانية → اللقطة السابقة ستُستبدل (ومعها فرقها)، والفرق الجديد من التي قبلها
+                row = self.conn.execute(
+                    "SELECT id, fingerprint, name FROM snapshots WHERE kind = 'auto' AND name != ? "
+                    "ORDER BY taken_at DESC, name DESC LIMIT 1",
+                    (filename,),
+                ).fetchone()
+            previous_list = self._snapshot_values(row[0]) if row else []
+            snapshot_id = self._insert_snapshot(filename, "auto", taken_at, skills_list, fingerprint)
+            self._insert_delta(row[0] if row else None, snapshot_id, previous_list, skills_list)
+        return filename
+
+    def snapshot_index(self):
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT name FROM snapshots WHERE kind = 'auto' ORDER BY taken_at, name"
+            ).fetchall()
+        return [name for name, in rows]
+
+    def snapshot_range(self, since=None, until=None):
+        if not since and not until:
+            return self.snapshot_index()
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT name FROM snapshots WHERE kind = 'auto' AND taken_at >= ? AND taken_at <= ? "
+                "AND taken_at != '' ORDER BY taken_at, name",
+                (since or "", (until or "9999-12-31") + "\uffff"),
+            ).fetchall()
+        return [name for name, in rows]
+
+    def load_snapshot(self, filename):
+        with self.lock:
+            row = self.conn.execute("SELECT id FROM snapshots WHERE name = ?", (filename,)).fetchone()
+            if row is None:
+                raise FileNotFoundError(filename)
+            return self._snapshot_values(row[0])
+
+    def snapshot_diff(self, older, newer):
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT d.diff FROM snapshot_deltas d JOIN snapshots t ON t.id = d.to_id "
+                "LEFT JOIN snapshots f ON f.id = d.from_id WHERE t.name = ? AND f.name IS ?",
+                (newer, older),
+            ).fetchone()
+        if row:
+            return json.loads(row[0])
+        return diff_skills(self.load_snapshot(older) if older else [], self.load_snapshot(newer))
+
+    def rename_snapshots(self, filenames, description):
+        renamed = {}
+        failed = []
+        with self.lock, self.conn:
+            for filename in filenames:
+                new_filename = renamed_filename(filename, description)
+                if new_filename == filename:
+                    continue
+                try:
+                    cursor = self.conn.execute("UPDATE snapshots SET name = ? WHERE name = ?", (new_filename, filename))
+                    if cursor.rowcount == 0:
+                        raise FileNotFoundError(filename)
+                    renamed[filename] = new_filename
+                except sqlite3.IntegrityError:
+                    failed.append((filename, FileExistsError(new_filename)))
+                except FileNotFoundError as e:
+                    failed.append((filename, e))
+        return renamed, failed
+
+    def delete_snapshots(self, filenames):
+        deleted = []
+        failed = []
+        with self.lock, self.conn:
+            for filename in filenames:
+                cursor = self.conn.execute("DELETE FROM snapshots WHERE name = ?", (filename,))
+                if cursor.rowcount:
+                    deleted.append(filename)
+                else:
+                    failed.append((filename, FileNotFoundError(filename)))
+        return deleted, failed
+
+    # ====== سجل التاريخ ======
+
+    def _insert_history(self, entry):
+        taken_at = entry["timestamp"].replace(" ", "_").replace(":", "-")
+        name = f"history:{taken_at}:{os.urandom(4).hex()}"  # اسم داخلي فريد - سجل التاريخ لا يظهر في نافذة اللقطات
+        self._insert_snapshot(name, "history", taken_at, entry["skills"])
+
+    def append_history(self, entry):
+        with self.lock, self.conn:
+            self._insert_history(entry)
+
+    # تزيد كلما حُذفت صفوف من السجل (أرقام اللقطات تغيرت) - مثل history_generation لملفات JSON
+    def history_generation(self):
+        with self.lock:
+            return int(self._meta_get("history_generation", 0))
+
+    # (id، وقت اللقطة YYYY-MM-DD_HH-MM-SS) لكل لقطات السجل من الأقدم للأحدث - لسياسة الاحتفاظ
+    def history_times(self):
+        with self.lock:
+            return self.conn.execute(
+                "SELECT id, taken_at FROM snapshots WHERE kind = 'history' ORDER BY id"
+            ).fetchall()
+
+    # حجم تقريبي لقيم لقطات السجل (للتقرير التجريبي)
+    def history_size(self, ids):
+        size = 0
+        with self.lock:
+            for start in range(0, len(ids), 500):
+                batch = ids[start:start + 500]
+                size += self.conn.execute(
+                    f"SELECT COALESCE(SUM(LENGTH(skill_name) + 16), 0) FROM snapshot_values "
+                    f"WHERE snapshot_id IN ({','.join('?' * len(batch))})", batch,
+                ).fetchone()[0]
+        return size
+
+    # حذف لقطات من السجل (قيمها تُحذف معها) - أرقام ما بعدها تتغير → نسخة جديدة للسجل
+    def delete_history(self, ids):
+        if not ids:
+            return 0
+        with self.lock, self.conn:
+            for start in range(0, len(ids), 500):
+                batch = ids[start:start + 500]
+                self.conn.execute(f"DELETE FROM snapshots WHERE kind = 'history' AND id IN ({','.join('?' * len(batch))})",
+                                  batch)
+            self._meta_set("history_generation", int(self._meta_get("history_generation", 0)) + 1)
+        return len(ids)
+
+    def history_count(self):
+        with self.lock:
+            return self._history_count()
+
+    def _history_count(self):
+        return self.conn.execute("SELECT COUNT(*) FROM snapshots WHERE kind = 'history'").fetchone()[0]
+
+    def read_history_entry(self, i):
+        count = self.history_count()
+        if i < 0:
+            i += count
+        if not 0 <= i < count:
+            raise IndexError("history index out of range")
+        with self.lock:
+            snapshot_id, taken_at = self.conn.execute(
+                "SELECT id, taken_at FROM snapshots WHERE kind = 'history' ORDER BY id LIMIT 1 OFFSET ?", (i,)
+            ).fetchone()
+            skills_list = self._snapshot_values(snapshot_id)
+        return _history_entry(taken_at, skills_list)
+
+    # لقطات السجل من start (سالب = من النهاية) حتى الأحدث - OFFSET مرة واحدة ثم دفعات بالمؤشر (id > آخر id)
+    # وقيم كل دفعة باستعلام واحد، بدل COUNT و OFFSET لكل لقطة
+    def iter_history(self, start=0):
+        with self.lock:
+            if start < 0:
+                start = max(0, self._history_count() + start)
+            rows = self.conn.execute(
+                "SELECT id, taken_at FROM snapshots WHERE kind = 'history' ORDER BY id LIMIT ? OFFSET ?",
+                (HISTORY_BATCH, start),
+            ).fetchall()
+        while rows:
+            with self.lock:
+                values = {snapshot_id: [] for snapshot_id, _ in rows}
+                for snapshot_id, name, value in self.conn.execute(
+                    f"SELECT snapshot_id, skill_name, value FROM snapshot_values "
+                    f"WHERE snapshot_id IN ({','.join('?' * len(rows))}) ORDER BY snapshot_id, position",
+                    list(values),
+                ):
+                    values[snapshot_id].append({"name": name, "value": value})
+            for snapshot_id, taken_at in rows:
+                yield _history_entry(taken_at, values[snapshot_id])
+            if len(rows) < HISTORY_BATCH:
+                return
+            with self.lock:
+                rows = self.conn.execute(
+                    "SELECT id, taken_at FROM snapshots WHERE kind = 'history' AND id > ? ORDER BY id LIMIT ?",
+                    (rows[-1][0], HISTORY_BATCH),
+                ).fetchall()
+
+    # ====== الاستيراد من ملفات JSON ======
+
+    # نسخ skills.json ولقطات snapshots/ وسجل التاريخ إلى القاعدة - مرة واحدة فقط لكل قاعدة:
+    # الاستيراد كله transaction واحدة تسجل نفسها في meta، فتكراره (--import-json مرة ثانية) لا يكرر سجل التاريخ
+    # ترجع عدد (المهارات، اللقطات، سجلات التاريخ)
+    def import_json(self):
+        from . import backend
+        from .history import iter_history, migrate_history_json
+        from .snapshots import load_snapshot, snapshot_index
+        from .storage import load_skills
+
+        if backend.active() is self:
+            raise RuntimeError("import_json يجب أن يعمل قبل تفعيل قاعدة SQLite")
+
+        with self.lock:
+            imported_at = self._meta_get("json_imported")
+        if imported_at is not None:
+            print(f"ℹ️ ملفات JSON مستوردة إلى هذه القاعدة من قبل ({imported_at}) - لا شيء جديد")
+            return 0, 0, 0
+
+        skills_list = load_skills()
+        migrate_history_json()  # لو history.json القديم ما زال موجودًا
+
+        snapshots = history = 0
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM skills")
+            self.conn.executemany(
+                "INSERT INTO skills (name, value, position) VALUES (?, ?, ?)",
+                [(s["name"], s["value"], i) for i, s in enumerate(skills_list)],
+            )
+
+            previous_id, previous_list = None, []
+            for filename in snapshot_index():
+                try:
+                    data = load_snapshot(filename)
+                except (OSError, KeyError, ValueError) as e:
+                    print(f"⚠️ تخطي لقطة {filename}: {e}")
+                    continue
+                dated, date_part = snapshot_sort_key(filename)
+                snapshot_id = self._insert_snapshot(filename, "auto", date_part if dated else "", data,
+                                                    skills_fingerprint(data))
+                self._insert_delta(previous_id, snapshot_id, previous_list, data)
+                previous_id, previous_list = snapshot_id, data
+                snapshots += 1
+
+            for entry in iter_history():
+                self._insert_history(entry)
+                history += 1
+
+            self._meta_set("json_imported", datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+
+        print(f"✅ تم استيراد {len(skills_list)} مهارة من {SKILLS_FILE} و {snapshots} لقطة و {history} سجل تاريخ")
+        return len(skills_list), snapshots, history
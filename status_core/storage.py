@@ -0,0 +1,107 @@
+import json
+import os
+
+from . import backend
+from .atomic import atomic_batch, atomic_write
+from .jsonstream import iter_json_file, read_json_array
+from .paths import data_path, SKILLS_FILE
+from .snapshots import load_snapshot, snapshot_if_changed, snapshot_index
+
+
+# خطأ في أخذ اللقطة التلقائية (المهارات نفسها تم حفظها)
+class SnapshotError(Exception):
+    pass
+
+
+# قراءة skills.json كما هو - ترجع None لو الملف فارغ وترفع الخطأ لو غير موجود أو تالف
+# (يُفك تدريجيًا: لا نسخة نصية للملف كله في الذاكرة بجانب القائمة)
+def read_skills_file():
+    db = backend.active()
+    if db is not None:
+        return db.read_skills_file()
+    with open(data_path(SKILLS_FILE), "r", encoding="utf-8") as f:
+        return read_json_array(f)
+
+
+# المهارات سجلًا سجلًا بدون بناء القائمة كاملة (للتصدير والمرور على ملف ضخم)
+def iter_skills():
+    db = backend.active()
+    if db is not None:
+        yield from db.load_skills()
+        return
+    try:
+        yield from iter_json_file(data_path(SKILLS_FILE))
+    except FileNotFoundError:
+        return
+
+
+# دالة لقراءة المهارات من الملف
+def load_skills():
+    db = backend.active()
+    if db is not None:
+        return db.load_skills()
+    try:
+        return read_skills_file() or []
+    except FileNotFoundError:
+        return []
+    except json.JSONDecodeError as e:
+        print("❌ خطأ في قراءة JSON:", e)
+        return []
+
+# قائمة مهارات سليمة: [{"name": ..., "value": ...}, ...]
+def _valid_skills(data):
+    return isinstance(data, list) and all(isinstance(s, dict) and "name" in s and "value" in s for s in data)
+
+
+# بعد انقطاع مفاجئ (من نسخة قديمة كانت تكتب فوق الملف مباشرة): لو skills.json فارغ أو تالف
+# نسترجعه من أحدث لقطة سليمة، ونحتفظ بالملف التالف باسم skills.json.corrupt
+# ترجع اسم اللقطة المستخدمة أو None لو لم يلزم الاسترجاع (أو لا توجد لقطة صالحة)
+def recover_skills():
+    if backend.active() is not None:
+        return None  # القاعدة تكتب داخل transactions
+    try:
+        if _valid_skills(read_skills_file()):
+            return None
+    except FileNotFoundError:
+        return None
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        pass
+
+    for filename in reversed(snapshot_index()):
+        try:
+            data = load_snapshot(filename)
+        except (OSError, KeyError, ValueError):
+            continue
+        if _valid_skills(data):
+            break
+    else:
+        print(f"⚠️ {SKILLS_FILE} تالف ولا توجد لقطة صالحة للاسترجاع.")
+        return None
+
+    path = data_path(SKILLS_FILE)
+    os.replace(path, path + ".corrupt")
+    atomic_write(path, json.dumps(data, ensure_ascii=False, indent=2))
+    print(f"🩹 تم استرجاع {SKILLS_FILE} من اللقطة {filename}")
+    return filename
+
+
+# دالة لحفظ المهارات إلى الملف
+def save_skills(skills_list):
+    db = backend.active()
+    if db is not None:
+        db.save_skills(skills_list)
+        try:
+            db.snapshot_if_changed(skills_list)
+        except Exception as e:
+            raise SnapshotError(e) from e
+        return
+
+    # كل ملفات عملية الحفظ (المهارات + اللقطة + المخزن) في دفعة واحدة: fsync أقل لنفس الأمان
+    with atomic_batch():
+        atomic_write(data_path(SKILLS_FILE), json.dumps(skills_list, ensure_ascii=False, indent=2))
+
+        # ⬇⬇ أخذ نسخة snapshot تلقائيًا بعد الحفظ (لو المهارات تغيرت عن آخر لقطة) ⬇⬇
+        try:
+            snapshot_if_changed(skills_list)
+        except Exception as e:
+            raise SnapshotError(e) from e
@@ -0,0 +1,58 @@
+import numpy as np
+
+from .profiles import list_profiles, profile_index, profile_skills
+
+
+TEAM_PERCENTILES = (25, 50, 75)        # حدود الشريط والوسيط
+
+_team_cache = {}                       # أسماء الملفات (مرتبة) -> (نسخة المجموعة، النتيجة)
+
+
+# مصفوفة الفريق: صف لكل ملف وعمود لكل مهارة (اتحاد المهارات بترتيب أول ظهور، NaN = غير موجودة)
+def team_matrix(names):
+    columns = {}
+    rows = []
+    for name in names:
+        values = {skill["name"]: skill["value"] for skill in profile_skills(name)}
+        for skill in values:
+            columns.setdefault(skill, len(columns))
+        rows.append(values)
+
+    matrix = np.full((len(rows), len(columns)), np.nan)
+    for i, values in enumerate(rows):
+        for skill, value in values.items():
+            matrix[i, columns[skill]] = value
+    return list(columns), matrix
+
+
+# إحصاءات الفريق لكل مهارة في عملية واحدة على المصفوفة:
+# {"skills", "mean", "p25", "median", "p75", "count"} - مخزنة حتى يتغير أي ملف في المجموعة
+def team_stats(names=None):
+    names = sorted(names) if names else list_profiles()
+    index = profile_index()
+    version = tuple(index.get(name, {}).get("version", 0) for name in names)
+    key = tuple(names)
+    cached = _team_cache.get(key)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    skills, matrix = team_matrix(names)
+    present = ~np.isnan(matrix)
+    count = present.sum(axis=0)
+    if matrix.size:
+        filled = np.where(present, matrix, 0.0)
+        mean = filled.sum(axis=0) / np.maximum(count, 1)
+        p25, median, p75 = np.nanpercentile(matrix, TEAM_PERCENTILES, axis=0)
+    else:
+        mean = p25 = median = p75 = np.zeros(len(skills))
+
+    stats = {"skills": skills, "mean": mean, "p25": p25, "median": median, "p75": p75,
+             "count": count, "profiles": names}
+    _team_cache[key] = (version, stats)
+    return stats
+
+
+# قيم ملف واحد على محاور الفريق (المهارة غير الموجودة عنده = 0)
+def align_to_team(stats, skills_list):
+    values = {skill["name"]: skill["value"] for skill in skills_list}
+    return [values.get(skill, 0) for skill in stats["skills"]]
@@ -0,0 +1,28 @@
+import os
+import sys
+from collections import OrderedDict
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from status_core import backend, paths, profiles, retention, snapshots, set_data_dir, use_json  # noqa: E402
+
+
+# كل اختبار في مجلد بيانات مؤقت خاص به، بنفس الحالة التي يبدأ بها التطبيق
+# (الكاشات مفتاحها المسار فلا تتداخل بين الاختبارات، والحالة العامة تُعاد بعد كل اختبار)
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(paths, "DATA_DIR", paths.DATA_DIR)
+    monkeypatch.setattr(profiles, "_root_dir", None)
+    monkeypatch.setattr(profiles, "_root_db", None)
+    monkeypatch.setattr(profiles, "_index", None)
+    monkeypatch.setattr(profiles, "_open_profiles", OrderedDict())
+    monkeypatch.setattr(profiles, "_current", profiles.DEFAULT_PROFILE)
+    monkeypatch.setattr(profiles, "_recovered", {})
+    monkeypatch.setattr(snapshots, "_snapshot_format", "json")
+    monkeypatch.setattr(retention, "RETENTION_PAUSE", 0)
+    set_data_dir(str(tmp_path))
+    yield tmp_path
+    if backend.active() is not None:
+        use_json()
@@ -0,0 +1,35 @@
+from datetime import datetime
+
+from status_core import snapshots
+from status_core.paths import data_dir
+
+
+def skills(*values):
+    return [{"name": f"skill{i}", "value": value} for i, value in enumerate(values)]
+
+
+def entry(when, skills_list):
+    return {"timestamp": when.strftime("%Y-%m-%d %H:%M:%S"), "skills": skills_list}
+
+
+def stamp(when):
+    return when.strftime("%Y-%m-%d_%H-%M-%S")
+
+
+# نسيان كل ما في الذاكرة عن مجلد اللقطات (كأن التطبيق فُتح من جديد)
+def drop_snapshot_caches():
+    snapshots.drop_caches(data_dir())
+
+
+# ساعة ثابتة لـ datetime.now() في الوحدات المعطاة (clock.current يُغيَّر من الاختبار بدون انتظار)
+def freeze_clock(monkeypatch, when, *modules):
+    class Clock(datetime):
+        current = when
+
+        @classmethod
+        def now(cls, tz=None):
+            return cls.current
+
+    for module in modules:
+        monkeypatch.setattr(module, "datetime", Clock)
+    return Clock
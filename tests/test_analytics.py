@@ -0,0 +1,62 @@
+from datetime import datetime, timedelta
+
+from status_core import append_history, compact_history, delete_snapshots, write_snapshot
+from status_core.analytics import SkillMatrix, skill_matrix
+
+from helpers import entry, skills
+
+
+def write_days(*days):
+    return [write_snapshot(data, f"2024-01-{day:02d}_12-00-00.json") for day, data in days]
+
+
+# صف لكل لقطة مؤرخة وعمود لكل مهارة، والمهارة الغائبة عن لقطة لا تظهر في اتجاهها
+def test_trend_stats_and_movers(data_dir):
+    write_days((1, skills(10, 50)), (2, skills(20)), (3, skills(40, 45, 7)), (4, skills(35, 60, 7)))
+    write_snapshot(skills(99), "بدون_تاريخ.json")
+    matrix = skill_matrix()
+    assert len(matrix.names) == 4 and matrix.skills == ["skill0", "skill1", "skill2"]
+
+    times, values = matrix.trend("skill1")
+    assert [t.day for t in times] == [1, 3, 4] and values.tolist() == [50, 45, 60]
+    times, values = matrix.trend("skill0", since="2024-01-02", until="2024-01-03")
+    assert [t.day for t in times] == [2, 3] and values.tolist() == [20, 40]
+
+    stats = matrix.stats()
+    assert stats["skill0"] == {"min": 10.0, "max": 40.0, "mean": 26.25, "count": 4}
+    assert stats["skill2"]["count"] == 2
+    assert set(matrix.stats(since="2024-01-02", until="2024-01-02")) == {"skill0"}
+
+    assert matrix.biggest_movers() == [("skill0", 10.0, 35.0, 25.0), ("skill1", 50.0, 60.0, 10.0)]
+    assert matrix.biggest_movers(top=1) == [("skill0", 10.0, 35.0, 25.0)]
+    assert matrix.biggest_movers(since="2024-02-01") == []
+
+
+# refresh يضيف اللقطات الجديدة فقط، ويعيد البناء لو حُذف أو تغير ما سبق تحميله
+def test_matrix_refresh_is_incremental(data_dir):
+    first = write_days((1, skills(1)), (2, skills(2)))
+    matrix = skill_matrix()
+    write_days((3, skills(3)))
+    assert skill_matrix() is matrix
+    assert matrix.values[:, 0].tolist() == [1, 2, 3]
+
+    delete_snapshots(first[:1])
+    assert skill_matrix().values[:, 0].tolist() == [2, 3]
+
+    # سعة المصفوفة تتضاعف عند الحاجة بدون فقد القيم
+    write_days(*((day, skills(day, day)) for day in range(4, 28)))
+    assert matrix.refresh().values[:, 1].tolist()[-3:] == [25, 26, 27]
+    assert matrix.values.shape == (26, 2)
+
+
+def test_history_matrix_rebuilds_after_compaction(data_dir):
+    start = datetime(2024, 1, 1)
+    for i in range(5):
+        append_history(entry(start + timedelta(minutes=i), skills(i)))
+    matrix = SkillMatrix("history").refresh()
+    assert matrix.values[:, 0].tolist() == [0, 1, 2, 3, 4]
+
+    compact_history(keep=lambda e: e["skills"][0]["value"] >= 2)
+    append_history(entry(start + timedelta(minutes=5), skills(5)))
+    append_history(entry(start + timedelta(minutes=6), skills(6)))
+    assert matrix.refresh().values[:, 0].tolist() == [2, 3, 4, 5, 6]
@@ -0,0 +1,79 @@
+import threading
+import time
+
+import pytest
+
+from status_core import DebouncedSaver
+
+
+# التعديلات المتتالية خلال المهلة تُدمج في حفظ واحد لآخر نسخة
+def test_edits_coalesce_into_one_save():
+    saved = []
+    saver = DebouncedSaver(saved.append, delay=0.2)
+    for i in range(5):
+        saver.schedule(i)
+    assert saver.pending and saved == []
+    deadline = time.monotonic() + 5
+    while saver.pending and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert saved == [4]
+    saver.close()
+
+
+def test_flush_saves_now_and_waits():
+    saved = []
+    saver = DebouncedSaver(saved.append, delay=60)
+    saver.schedule("a")
+    saver.schedule("b")
+    saver.flush()
+    assert saved == ["b"] and not saver.pending
+    saver.flush()  # لا شيء معلق → يرجع فورًا
+    assert saved == ["b"]
+    saver.close()
+
+
+# flush أثناء حفظ جارٍ ينتظره، ثم يحفظ ما جُدول أثناءه
+def test_flush_waits_for_running_save():
+    started, release = threading.Event(), threading.Event()
+    saved = []
+
+    def slow_save(data):
+        started.set()
+        release.wait(5)
+        saved.append(data)
+
+    saver = DebouncedSaver(slow_save, delay=0)
+    saver.schedule(1)
+    assert started.wait(5)
+    saver.schedule(2)
+    threading.Timer(0.1, release.set).start()
+    saver.flush()
+    assert saved == [1, 2]
+    saver.close()
+
+
+def test_close_saves_pending_and_rejects_new_edits():
+    saved = []
+    saver = DebouncedSaver(saved.append, delay=60)
+    saver.schedule("last")
+    saver.close()
+    assert saved == ["last"]
+    with pytest.raises(RuntimeError):
+        saver.schedule("late")
+
+
+def test_errors_go_to_on_error_and_worker_keeps_running():
+    errors, saved = [], []
+
+    def save(data):
+        if data == "bad":
+            raise OSError("disk full")
+        saved.append(data)
+
+    saver = DebouncedSaver(save, delay=0, on_error=errors.append)
+    saver.schedule("bad")
+    saver.flush()
+    saver.schedule("good")
+    saver.flush()
+    assert [str(e) for e in errors] == ["disk full"] and saved == ["good"]
+    saver.close()
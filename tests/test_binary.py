@@ -0,0 +1,78 @@
+import os
+
+from status_core import (
+    BINARY_SUFFIX, benchmark_snapshot_formats, convert_snapshots, encode_binary_snapshot, load_snapshot,
+    rename_snapshot, set_snapshot_format, snapshot_index, snapshot_store_size, snapshot_stem, write_snapshot,
+)
+from status_core.paths import SNAPSHOT_FOLDER
+
+from helpers import drop_snapshot_caches, skills
+
+
+def test_binary_snapshots_use_their_own_suffix(data_dir):
+    set_snapshot_format("binary")
+    filename = write_snapshot(skills(0, 99), "2024-01-01_00-00-00.json")
+    assert filename == "2024-01-01_00-00-00" + BINARY_SUFFIX
+    assert load_snapshot(filename) == skills(0, 99)
+
+    # مهارات لا تصلح للصيغة الثنائية (قيمة خارج 0 - 100) → JSON
+    fallback = write_snapshot([{"name": "x", "value": 500}], "2024-01-01_00-00-01.json")
+    assert fallback.endswith(".json")
+    assert snapshot_index() == [filename, fallback]
+    assert snapshot_stem(filename) == "2024-01-01_00-00-00"
+
+    renamed = rename_snapshot(filename, "binary")
+    assert renamed == "2024-01-01_00-00-00__binary" + BINARY_SUFFIX
+    assert load_snapshot(renamed) == skills(0, 99)
+
+
+def test_convert_snapshots_keeps_content_and_mtime(data_dir):
+    written = {}
+    for i in range(4):
+        data = skills(i, 10 * i)
+        written[write_snapshot(data, f"2024-01-01_00-00-0{i}.json")] = data
+    mtimes = {snapshot_stem(name): os.path.getmtime(data_dir / SNAPSHOT_FOLDER / name) for name in written}
+    contents = {snapshot_stem(name): data for name, data in written.items()}
+
+    assert convert_snapshots("binary") == (4, [])
+    assert all(name.endswith(BINARY_SUFFIX) for name in snapshot_index())
+    assert convert_snapshots("binary") == (0, [])
+    assert convert_snapshots("json") == (4, [])
+
+    drop_snapshot_caches()
+    for name in snapshot_index():
+        assert name.endswith(".json")
+        assert load_snapshot(name) == contents[snapshot_stem(name)]
+        assert os.path.getmtime(data_dir / SNAPSHOT_FOLDER / name) == mtimes[snapshot_stem(name)]
+
+
+def test_legacy_binary_snapshot_named_json(data_dir):
+    folder = data_dir / SNAPSHOT_FOLDER
+    folder.mkdir()
+    (folder / "2023-01-01_00-00-00.json").write_bytes(encode_binary_snapshot(skills(7)))
+    assert load_snapshot("2023-01-01_00-00-00.json") == skills(7)
+    assert convert_snapshots("binary") == (1, [])
+    assert snapshot_index() == ["2023-01-01_00-00-00" + BINARY_SUFFIX]
+
+
+def test_convert_refuses_to_overwrite(data_dir):
+    write_snapshot(skills(1), "2024-01-01_00-00-00.json")
+    set_snapshot_format("binary")
+    write_snapshot(skills(2), "2024-01-01_00-00-00.json")
+    converted, failed = convert_snapshots("binary")
+    assert converted == 0 and [name for name, _ in failed] == ["2024-01-01_00-00-00.json"]
+    assert load_snapshot("2024-01-01_00-00-00.json") == skills(1)
+    assert load_snapshot("2024-01-01_00-00-00" + BINARY_SUFFIX) == skills(2)
+
+
+def test_benchmark_measures_files_on_disk(data_dir):
+    for i in range(5):
+        write_snapshot(skills(i, 1, 2), f"2024-01-01_00-00-0{i}.json")
+    write_snapshot([{"name": "x", "value": 500}], "2024-01-01_00-00-09.json")
+
+    result = benchmark_snapshot_formats(repeat=1)
+    assert result["snapshots"] == 5
+    assert [name for name, _ in result["skipped"]] == ["2024-01-01_00-00-09.json"]
+    on_disk = sum(os.path.getsize(data_dir / SNAPSHOT_FOLDER / name) for name in snapshot_index()[:5])
+    assert result["current_bytes"] == on_disk + snapshot_store_size()
+    assert result["binary_bytes"] > 0
@@ -0,0 +1,30 @@
+from status_core import SkillStore, export_skills, import_into
+from status_core.bulk import validate_rows
+
+from helpers import skills
+
+
+def test_validate_rows_accepts_only_integers():
+    report = {"rejected": 0, "errors": []}
+    rows = [(1, "a", 50), (2, "b", " 7 "), (3, "c", 50.9), (4, "d", 50.0), (5, "e", True),
+            (6, "f", "50.9"), (7, "", 5), (8, "g", 101), (9, None, None)]
+    assert list(validate_rows(rows, report)) == [("a", 50), ("b", 7)]
+    assert report["rejected"] == 7
+    assert [line for line, _ in report["errors"]] == [3, 4, 5, 6, 7, 8, 9]
+
+
+def test_bulk_round_trip(data_dir):
+    csv_path = str(data_dir / "in.csv")
+    with open(csv_path, "w", encoding="utf-8") as f:
+        f.write("name,value\nPython,90\nعربي,80\nbad,50.9\n")
+    store = SkillStore(skills(5))
+    report = import_into(store, csv_path)
+    assert report["imported"] == 2 and report["rejected"] == 1
+    assert store.to_list() == skills(5) + [{"name": "Python", "value": 90}, {"name": "عربي", "value": 80}]
+
+    for suffix in (".csv", ".jsonl"):
+        out = str(data_dir / f"out{suffix}")
+        assert export_skills(out, store.items()) == 3
+        copy = SkillStore()
+        assert import_into(copy, out)["imported"] == 3
+        assert copy.to_list() == store.to_list()
@@ -0,0 +1,41 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from status_core import load_skills
+from status_core.cli import main
+
+from helpers import skills
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_cli_import_and_export(data_dir, capsys):
+    source = data_dir / "in.csv"
+    source.write_text("name,value\nskill0,3\nskill1,x\n", encoding="utf-8")
+    assert main(["--import-skills", str(source)]) == 1  # سطر مرفوض
+    assert load_skills() == skills(3)
+
+    out = data_dir / "out.jsonl"
+    assert main(["--export-skills", str(out)]) == 0
+    assert [json.loads(line) for line in out.read_text(encoding="utf-8").splitlines()] == skills(3)
+    assert "تم تصدير 1 مهارة" in capsys.readouterr().out
+
+
+def test_cli_requires_a_command(data_dir):
+    with pytest.raises(SystemExit) as exc:
+        main([])
+    assert exc.value.code == 2
+
+
+# python -m status_core يعمل على نسخة بايثون بدون tkinter
+def test_cli_runs_without_tkinter(tmp_path):
+    script = ("import sys, runpy; sys.modules['tkinter'] = None; "
+              "sys.argv = ['status_core', '--retention-report']; runpy.run_module('status_core', run_name='__main__')")
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    result = subprocess.run([sys.executable, "-c", script], cwd=tmp_path, env=env, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    assert "سيتم حذف 0 لقطة" in result.stdout
@@ -0,0 +1,28 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def imported_modules(code):
+    script = (f"import sys; sys.modules['tkinter'] = None; {code}; "
+              "print(' '.join(name for name, module in sys.modules.items() if module))")
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    result = subprocess.run([sys.executable, "-c", script], env=env, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    return set(result.stdout.split())
+
+
+# قلب التطبيق يُستورد بدون tkinter، وبدون matplotlib/numpy حتى تُطلب التحليلات أو الرسم
+@pytest.mark.parametrize("code", ["import status_core", "import status_core.cli, status_core.export"])
+def test_core_imports_without_gui(code):
+    modules = imported_modules(code)
+    assert not modules & {"tkinter", "matplotlib", "numpy"}
+
+
+def test_analytics_loads_numpy_only():
+    modules = imported_modules("import status_core.analytics, status_core.team")
+    assert "numpy" in modules and not modules & {"tkinter", "matplotlib"}
@@ -0,0 +1,121 @@
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from status_core import (
+    delete_snapshots, diff_skills, format_diff, is_empty_diff, load_snapshot, rename_snapshot, rename_snapshots,
+    save_skills, snapshot_diff, snapshot_index, use_sqlite, write_snapshot,
+)
+from status_core import backend, snapshots, sqlite_backend
+from status_core.paths import SNAPSHOT_DELTAS
+
+from helpers import drop_snapshot_caches, freeze_clock, skills, stamp
+
+
+def test_diff_skills_by_name():
+    old = [{"name": "a", "value": 1}, {"name": "b", "value": 2}, {"name": "c", "value": 3}]
+    new = [{"name": "c", "value": 3}, {"name": "b", "value": 5}, {"name": "d", "value": 4}]
+    diff = diff_skills(old, new)
+    assert diff == {"added": {"d": 4}, "removed": {"a": 1}, "changed": {"b": [2, 5]}}
+    assert format_diff(diff).splitlines() == ["➕ d: 4", "➖ a: 1", "🔼 b: 2 → 5"]
+    assert is_empty_diff(diff_skills(old, list(reversed(old))))
+    assert format_diff(diff_skills(old, old)) == "لا يوجد فرق."
+
+
+def test_snapshot_diff_rename_and_delete(data_dir):
+    save_skills(skills(1, 2))
+    first = snapshot_index()[-1]
+    later = f"{stamp(datetime.now() + timedelta(minutes=1))}.json"
+    write_snapshot(skills(1, 5), later)
+
+    diff = snapshot_diff(first, later)
+    assert diff == diff_skills(skills(1, 2), skills(1, 5))
+
+    renamed = rename_snapshot(later, "بعد التعديل")
+    assert renamed.endswith("__بعد_التعديل.json")
+    assert load_snapshot(renamed) == skills(1, 5)
+    assert snapshot_index() == [first, renamed]
+
+    deleted, failed = delete_snapshots([first])
+    assert deleted == [first] and not failed
+    assert snapshot_index() == [renamed]
+
+
+# سلسلة لقطات متتالية مع فروقها المحسوبة وقت الكتابة (كما يفعل snapshot_if_changed)
+def write_chain(count):
+    names, previous = [], None
+    for i in range(count):
+        data = skills(i, 10)
+        name = write_snapshot(data, f"2024-01-01_00-00-{i:02d}.json")
+        snapshots._record_snapshot_delta(previous, name, data)
+        names.append(name)
+        previous = name
+    return names
+
+
+def deltas_lines(data_dir):
+    return (data_dir / SNAPSHOT_DELTAS).read_text(encoding="utf-8").splitlines()
+
+
+def test_rename_and_delete_append_one_line(data_dir):
+    names = write_chain(5)
+    before = deltas_lines(data_dir)
+
+    renamed, _ = rename_snapshots([names[1]], "مراجعة")
+    names[1] = renamed[names[1]]
+    delete_snapshots([names[3]])
+    after = deltas_lines(data_dir)
+    assert after[:len(before)] == before and len(after) == len(before) + 2
+
+    expected = {(a, b): snapshot_diff(a, b) for a, b in zip([None] + names, names) if names[3] not in (a, b)}
+    assert expected[(names[0], names[1])] == diff_skills(skills(0, 10), skills(1, 10))
+
+    # بعد إعادة التشغيل: نفس الفروق من الملف الإلحاقي
+    drop_snapshot_caches()
+    assert snapshots._load_snapshot_deltas()["diffs"] == expected
+    assert (names[2], names[4]) not in expected
+    assert snapshot_diff(names[2], names[4]) == diff_skills(skills(2, 10), skills(4, 10))
+
+
+def test_deltas_compact_when_garbage_piles_up(data_dir, monkeypatch):
+    monkeypatch.setattr(snapshots, "SNAPSHOT_DELTAS_COMPACT_MIN", 3)
+    names = write_chain(8)
+    for name in names[:4]:
+        delete_snapshots([name])
+    state = snapshots._load_snapshot_deltas()
+    assert state["garbage"] <= max(3, len(state["diffs"]))
+    assert len(deltas_lines(data_dir)) < 8 + 4
+
+    diffs = dict(state["diffs"])
+    drop_snapshot_caches()
+    assert snapshots._load_snapshot_deltas()["diffs"] == diffs
+    assert all(load_snapshot(name) == skills(i + 4, 10) for i, name in enumerate(snapshot_index()))
+
+
+# لقطتان في نفس الثانية: الثانية تستبدل الأولى، والفرق المحفوظ يكون من اللقطة التي قبلهما
+@pytest.mark.parametrize("store", ["json", "sqlite"])
+def test_same_second_snapshot_replaces_previous(data_dir, monkeypatch, store):
+    clock = freeze_clock(monkeypatch, datetime(2024, 1, 1, 12), snapshots, sqlite_backend)
+    if store == "sqlite":
+        use_sqlite()
+    save_skills(skills(1, 2))
+    clock.current += timedelta(seconds=1)
+    save_skills(skills(1, 3))
+    save_skills(skills(1, 4))
+
+    first, second = snapshot_index()
+    assert load_snapshot(second) == skills(1, 4)
+    expected = diff_skills(skills(1, 2), skills(1, 4))
+    assert snapshot_diff(first, second) == expected
+    if store == "sqlite":
+        db = backend.active()
+        rows = db.conn.execute(
+            "SELECT f.name, d.diff FROM snapshot_deltas d JOIN snapshots t ON t.id = d.to_id "
+            "LEFT JOIN snapshots f ON f.id = d.from_id WHERE t.name = ?", (second,)
+        ).fetchall()
+        assert rows == [(first, json.dumps(expected, ensure_ascii=False))]
+    else:
+        drop_snapshot_caches()
+        assert snapshots._load_snapshot_deltas()["diffs"] == {(None, first): diff_skills([], skills(1, 2)),
+                                                               (first, second): expected}
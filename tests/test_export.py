@@ -0,0 +1,40 @@
+import os
+
+from status_core import write_snapshot
+from status_core.export import export_radars
+from status_core.paths import SNAPSHOT_FOLDER
+
+from helpers import skills
+
+
+# الصور المحدثة تُتخطى، واللقطة التي تغيرت بعد رسمها تُرسم من جديد، و force يعيد رسم الكل
+def test_export_skips_fresh_images_and_refreshes_stale(data_dir):
+    names = [write_snapshot(skills(i, 50, 100), f"2024-01-0{i + 1}_00-00-00.json") for i in range(3)]
+    out = data_dir / "radars"
+
+    report = export_radars(str(out), "svg", jobs=1)
+    assert (report["rendered"], report["skipped"], report["failed"]) == (3, 0, [])
+    assert sorted(os.listdir(out)) == [f"2024-01-0{i + 1}_00-00-00.svg" for i in range(3)]
+
+    report = export_radars(str(out), "svg", jobs=1)
+    assert (report["rendered"], report["skipped"]) == (0, 3)
+
+    # صورة أقدم من لقطتها (اللقطة تغيرت بعد الرسم) → تُرسم وحدها من جديد
+    image = out / "2024-01-02_00-00-00.svg"
+    older = os.path.getmtime(data_dir / SNAPSHOT_FOLDER / names[1]) - 10
+    os.utime(image, (older, older))
+    report = export_radars(str(out), "svg", jobs=1)
+    assert (report["rendered"], report["skipped"]) == (1, 2)
+    assert os.path.getmtime(image) > older
+    assert export_radars(str(out), "svg", jobs=1)["skipped"] == 3
+
+    report = export_radars(str(out), "svg", match="01-03", force=True, jobs=1)
+    assert (report["rendered"], report["skipped"]) == (1, 0)
+
+
+def test_export_reports_empty_snapshots(data_dir):
+    write_snapshot(skills(1), "2024-01-01_00-00-00.json")
+    empty = write_snapshot([], "2024-01-02_00-00-00.json")
+    report = export_radars(str(data_dir / "radars"), "svg", jobs=1)
+    assert report["rendered"] == 1
+    assert [name for name, _ in report["failed"]] == [empty]
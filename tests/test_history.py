@@ -0,0 +1,112 @@
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+from status_core import (
+    append_history, apply_retention, compact_history, history_count, history_generation, history_tail,
+    iter_history, read_history_entry, save_retention_policy,
+)
+from status_core import history
+from status_core.paths import HISTORY_JOURNAL
+
+from helpers import entry, skills
+
+
+def test_history_round_trip(data_dir):
+    start = datetime(2024, 1, 1)
+    entries = [entry(start + timedelta(minutes=i), skills(i)) for i in range(10)]
+    for e in entries:
+        append_history(e)
+    assert history_count() == 10
+    assert read_history_entry(0) == entries[0]
+    assert read_history_entry(-1) == entries[-1]
+    assert list(iter_history()) == entries
+    assert list(iter_history(7)) == entries[7:]
+    assert history_tail(3) == entries[-3:]
+    assert list(iter_history(20)) == []
+
+
+def test_compaction_drops_only_torn_lines(data_dir):
+    start = datetime(2024, 1, 1)
+    entries = [entry(start + timedelta(minutes=i), skills(1)) for i in range(3)]
+    for e in entries:
+        append_history(e)
+    before = history_generation()
+
+    # لا شيء تالف → لا إعادة كتابة ولا نسخة جديدة، واللقطات المتطابقة تبقى كما هي
+    assert compact_history() == (3, 0)
+    assert history_generation() == before
+    assert list(iter_history()) == entries
+
+    # سطر تالف كامل في الوسط → يُحذف وحده وتتغير نسخة السجل
+    with open(data_dir / HISTORY_JOURNAL, "ab") as f:
+        f.write(b'{"timestamp": "2024-01-0\n')
+    history.drop_caches(str(data_dir))
+    append_history(entries[0])
+    assert compact_history() == (4, 1)
+    assert history_generation() != before
+    assert list(iter_history()) == entries + entries[:1]
+
+    # سطر ناقص في النهاية (انقطاع أثناء الكتابة) → يُقص عند فتح السجل
+    with open(data_dir / HISTORY_JOURNAL, "ab") as f:
+        f.write(b'{"timestamp": "2024-01-0')
+    history.drop_caches(str(data_dir))
+    assert history_count() == 4
+    append_history(entries[1])
+    assert list(iter_history()) == entries + entries[:2]
+
+
+def test_compaction_merges_only_when_asked(data_dir):
+    start = datetime(2024, 1, 1)
+    for i in range(3):
+        append_history(entry(start + timedelta(minutes=i), skills(1)))
+    append_history(entry(start + timedelta(minutes=3), skills(2)))
+
+    assert compact_history(merge=True) == (2, 2)
+    merged = list(iter_history())
+    assert [e["skills"] for e in merged] == [skills(1), skills(2)]
+    assert merged[0]["last_seen"] == (start + timedelta(minutes=2)).strftime("%Y-%m-%d %H:%M:%S")
+
+
+# ضغط يبدأ أثناء ضغط آخر لنفس السجل ينتظر انتهاءه ثم يعمل (لا يرجع None كأن لا شيء للحذف)
+def test_compaction_waits_for_running_one(data_dir):
+    now = datetime.now()
+    for i in range(3):
+        append_history(entry(now - timedelta(days=400, minutes=i), skills(i)))
+    append_history(entry(now, skills(9)))
+    save_retention_policy({"keep_all_hours": 1, "hourly_days": 0, "daily_days": 0})
+
+    inside, release = threading.Event(), threading.Event()
+
+    def slow_keep(entry):
+        inside.set()
+        release.wait(5)
+        return True
+
+    first = threading.Thread(target=compact_history, kwargs={"keep": slow_keep})
+    first.start()
+    assert inside.wait(5)
+    results = []
+    second = threading.Thread(target=lambda: results.append(apply_retention()))
+    second.start()
+    second.join(0.2)
+    assert second.is_alive()  # ينتظر الضغط الأول
+
+    release.set()
+    first.join(5)
+    second.join(5)
+    assert results[0]["history_dropped"] == 3
+    assert [e["skills"] for e in iter_history()] == [skills(9)]
+
+
+def test_compaction_error_propagates(data_dir):
+    append_history(entry(datetime(2024, 1, 1), skills(1)))
+
+    def broken_keep(entry):
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        compact_history(keep=broken_keep)
+    assert not (data_dir / (HISTORY_JOURNAL + ".compact")).exists()
+    assert compact_history(keep=lambda e: False) == (0, 1)
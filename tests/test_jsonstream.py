@@ -0,0 +1,38 @@
+import io
+import json
+
+import pytest
+
+from status_core import iter_json_array, read_json_array
+
+from helpers import skills
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64])
+def test_json_stream_matches_json_loads(chunk_size):
+    data = [{"name": "a", "value": -1.5e3}, [], {}, "نص , ] مع فواصل", 12345678901234567890, None, True,
+            {"nested": [1, 2, {"x": "y"}]}, 0.25]
+    text = json.dumps(data, ensure_ascii=False)
+    assert list(iter_json_array(io.StringIO(text), chunk_size)) == data
+    assert list(iter_json_array(io.StringIO(json.dumps(data, indent=1)), chunk_size)) == data
+
+
+@pytest.mark.parametrize("text", ["[1, 2", "[1 2]", "[1,]", "{}", "[1] 2", "[-1."])
+def test_json_stream_rejects_broken_arrays(text):
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json_array(io.StringIO(text), 2))
+
+
+def test_read_json_array_streaming_path(tmp_path):
+    path = tmp_path / "skills.json"
+    data = skills(*range(50))
+    path.write_text(json.dumps(data), encoding="utf-8")
+    with open(path, "r", encoding="utf-8") as f:
+        items = read_json_array(f, chunk_size=16, threshold=0)
+    assert items == data
+    assert all(list(item)[0] is list(items[0])[0] for item in items)  # المفاتيح مشتركة
+
+    path.write_text("  \n", encoding="utf-8")
+    with open(path, "r", encoding="utf-8") as f:
+        assert read_json_array(f, threshold=0) is None
+    assert list(iter_json_array(io.StringIO(""))) == []
@@ -0,0 +1,35 @@
+from status_core import SkillStore
+
+from helpers import skills
+
+
+def test_store_keeps_order_and_position():
+    store = SkillStore(skills(1, 2, 3))
+    store.upsert("skill1", 9)
+    store.upsert("new", 4)
+    store.delete("skill0")
+    store.delete("missing")
+    assert store.to_list() == [{"name": "skill1", "value": 9}, {"name": "skill2", "value": 3},
+                               {"name": "new", "value": 4}]
+    assert len(store) == 3 and "new" in store and "skill0" not in store
+    assert store.get("skill0", -1) == -1
+
+
+# dirty = الأسماء التي تغيرت فعلًا منذ آخر حفظ (نفس القيمة لا تُعتبر تغييرًا)
+def test_dirty_tracks_only_real_changes():
+    store = SkillStore(skills(1, 2))
+    assert store.dirty == set()
+
+    store.upsert("skill0", 1)
+    store.update({"skill1": 2})
+    store.delete("missing")
+    assert store.dirty == set()
+
+    store.update([("skill0", 5), ("skill2", 7)])
+    store.delete("skill1")
+    assert store.dirty == {"skill0", "skill1", "skill2"}
+
+    store.mark_clean()
+    assert store.dirty == set()
+    store.upsert("skill1", 2)  # إعادة مهارة محذوفة تغيير جديد
+    assert store.dirty == {"skill1"}
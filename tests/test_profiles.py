@@ -0,0 +1,86 @@
+import os
+from datetime import datetime
+
+from status_core import (
+    append_history, backend, create_profile, current_profile, history, list_profiles, load_skills, open_profile,
+    pop_recovered, profiles, save_profile_skills, save_skills, snapshot_index, snapshots, use_sqlite,
+)
+
+from helpers import entry, skills
+
+
+def test_profiles_round_trip(data_dir):
+    save_skills(skills(1))
+    create_profile("bob")
+    assert list_profiles() == ["default", "bob"]
+    assert open_profile("bob") == []
+    save_profile_skills(skills(9))
+    assert open_profile("default") == skills(1)
+    assert open_profile("bob") == skills(9)
+
+
+# --db يبقى قاعدة الملف الافتراضي بعد open_profile (عند التشغيل) وبعد التبديل والرجوع
+def test_custom_db_survives_open_profile(data_dir):
+    custom = str(data_dir / "custom.db")
+    use_sqlite(custom)
+    save_skills(skills(4, 5))
+
+    assert open_profile(current_profile()) == skills(4, 5)
+    assert backend.active_path() == custom
+
+    create_profile("bob")
+    open_profile("bob")
+    assert backend.active_path() == os.path.join(str(data_dir), "profiles", "bob", "status.db")
+    save_profile_skills(skills(7))
+
+    assert open_profile("default") == skills(4, 5)
+    assert backend.active_path() == custom
+    assert load_skills() == skills(4, 5)
+    assert not (data_dir / "status.db").exists()
+
+
+
+# الاسترجاع يحدث داخل open_profile (عند التشغيل أو التبديل) ونتيجته تبقى حتى تعرضها الواجهة مرة واحدة
+def test_open_profile_reports_recovery(data_dir):
+    create_profile("bob")
+    open_profile("bob")
+    save_profile_skills(skills(3, 4))
+    latest = snapshot_index()[-1]
+    open_profile("default")
+    profiles._open_profiles.clear()  # كأن التطبيق فُتح من جديد
+    (data_dir / "profiles" / "bob" / "skills.json").write_text('[{"name": "skill0", "val', encoding="utf-8")
+
+    assert open_profile("bob") == skills(3, 4)
+    assert open_profile("default") == []
+    assert pop_recovered("default") is None
+    assert pop_recovered("bob") == latest
+    assert pop_recovered("bob") is None
+
+
+# ملفات المهارات التي لها كاش في الذاكرة الآن (من مسارات كاش اللقطات والسجل)
+def cached_profiles(data_dir):
+    names = set()
+    for path in list(snapshots._snapshot_index) + list(history._history_offsets):
+        parts = os.path.relpath(path, data_dir).split(os.sep)
+        if parts[0] == os.pardir:
+            continue  # كاش اختبار سابق في مجلد آخر
+        names.add(parts[1] if parts[0] == "profiles" else "default")
+    return names
+
+
+# الملف الذي يخرج من الـ LRU تُحذف كاشاته فقط - وإخراج الافتراضي لا يلمس الملفات داخل profiles/
+def test_evicted_profile_releases_only_its_caches(data_dir, monkeypatch):
+    monkeypatch.setattr(profiles, "PROFILE_CACHE_SIZE", 2)
+    create_profile("bob")
+    create_profile("eve")
+    for name in ("default", "bob"):
+        open_profile(name)
+        save_profile_skills(skills(1))
+        append_history(entry(datetime(2024, 1, 1), skills(1)))
+    assert cached_profiles(data_dir) == {"default", "bob"}
+
+    open_profile("eve")
+    assert cached_profiles(data_dir) == {"bob"}
+    save_profile_skills(skills(2))
+    open_profile("default")
+    assert cached_profiles(data_dir) == {"eve"}
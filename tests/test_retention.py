@@ -0,0 +1,74 @@
+from datetime import datetime, timedelta
+
+from status_core import (
+    append_history, apply_retention, history_count, history_generation, load_snapshot, read_history_entry,
+    retention_report, save_retention_policy, set_data_dir, snapshot_index, snapshot_store_size, use_sqlite,
+    write_snapshot,
+)
+from status_core import snapshots
+
+from helpers import drop_snapshot_caches, entry, skills, stamp
+
+
+def write_old_and_new_snapshots(count_old, count_new):
+    now = datetime.now()
+    old = [write_snapshot(skills(i, i + 1), f"{stamp(now - timedelta(days=30, minutes=i))}.json")
+           for i in range(count_old)]
+    new = {}
+    for i in range(count_new):
+        data = skills(50 + i, 3)
+        new[write_snapshot(data, f"{stamp(now - timedelta(minutes=i))}.json")] = data
+    return old, new
+
+
+def test_retention_frees_store_space(data_dir, monkeypatch):
+    monkeypatch.setattr(snapshots, "SNAPSHOT_KEYFRAME_EVERY", 2)
+    save_retention_policy({"keep_all_hours": 1, "hourly_days": 0, "daily_days": 0})
+    old, new = write_old_and_new_snapshots(6, 3)
+
+    report = retention_report()
+    assert sorted(report["snapshots"]) == sorted(old)
+    assert report["store_bytes"] > 0
+
+    before = snapshot_store_size()
+    result = apply_retention()
+    assert result["deleted"] == len(old)
+    assert result["store_bytes"] == report["store_bytes"] == before - snapshot_store_size()
+    assert retention_report()["store_bytes"] == 0
+
+    drop_snapshot_caches()
+    for filename, data in new.items():
+        assert load_snapshot(filename) == data
+
+
+def test_retention_target_ignores_later_data_dir_switch(data_dir, tmp_path_factory):
+    save_retention_policy({"keep_all_hours": 1, "hourly_days": 0, "daily_days": 0})
+    old, _ = write_old_and_new_snapshots(2, 1)
+    other = str(tmp_path_factory.mktemp("other"))
+    target = (str(data_dir), None)
+
+    set_data_dir(other)
+    write_old_and_new_snapshots(2, 1)
+    save_retention_policy({"keep_all_hours": 1, "hourly_days": 0, "daily_days": 0})
+    assert apply_retention(target=target)["deleted"] == 2
+    assert len(snapshot_index()) == 3   # المجلد الآخر لم يُلمس
+
+    set_data_dir(str(data_dir))
+    assert len(snapshot_index()) == 1
+
+
+def test_sqlite_retention_prunes_history(data_dir):
+    use_sqlite()
+    save_retention_policy({"keep_all_hours": 1, "hourly_days": 0, "daily_days": 0})
+    now = datetime.now()
+    for i in range(3):
+        append_history(entry(now - timedelta(days=30, minutes=i), skills(i)))
+    append_history(entry(now, skills(9)))
+    generation = history_generation()
+
+    report = retention_report()
+    assert report["history_entries"] == 3 and report["history_bytes"] > 0
+    assert apply_retention()["history_dropped"] == 3
+    assert history_count() == 1
+    assert history_generation() != generation
+    assert read_history_entry(0)["skills"] == skills(9)
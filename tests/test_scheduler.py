@@ -0,0 +1,72 @@
+from status_core import SnapshotScheduler, TokenBucket, history_count, read_history_entry, save_skills
+
+from helpers import skills
+
+
+def test_token_bucket_refills_up_to_burst():
+    bucket = TokenBucket(rate=1.0, burst=2)
+    start = bucket.updated
+    assert bucket.take(start) and bucket.take(start)
+    assert not bucket.take(start)
+    assert bucket.wait_time(start) == 1.0
+    assert not bucket.take(start + 0.5)
+    assert bucket.wait_time(start + 0.5) == 0.5
+    assert bucket.take(start + 1.0)
+
+    # الرصيد لا يتجاوز burst مهما طال الانتظار
+    assert bucket.take(start + 100) and bucket.take(start + 100)
+    assert not bucket.take(start + 100)
+
+
+def test_token_bucket_without_rate_never_waits():
+    bucket = TokenBucket(None)
+    assert all(bucket.take() for _ in range(10))
+    assert bucket.wait_time() == 0.0
+
+
+# الطلبات أثناء الانتظار تُدمج في لقطة واحدة بآخر حالة، ولا تضيع عند الخروج
+def test_pending_requests_coalesce(data_dir):
+    save_skills(skills(1))
+    scheduler = SnapshotScheduler(min_interval=60, period=0)
+    assert scheduler.request() is not None
+    save_skills(skills(2))
+    assert scheduler.request() is None
+    save_skills(skills(3))
+    assert scheduler.request() is None
+    assert scheduler.pending and 0 < scheduler.next_delay() <= 60
+    assert scheduler.tick() is None
+
+    scheduler.bucket.tokens = 1.0  # كأن المدة مرت
+    assert scheduler.tick() is not None
+    assert not scheduler.pending and scheduler.next_delay() is None
+    assert history_count() == 2
+    assert read_history_entry(-1)["skills"] == skills(3)
+
+    assert scheduler.request() is None
+    assert scheduler.flush() is not None and scheduler.flush() is None
+    assert history_count() == 3
+
+
+def test_zero_interval_means_no_rate_limit(data_dir):
+    save_skills(skills(1))
+    scheduler = SnapshotScheduler(min_interval=0, period=0)
+    assert all(scheduler.request() is not None for _ in range(3))
+    assert history_count() == 3 and not scheduler.pending
+
+
+# اللقطة الدورية تُؤخذ فقط لو تغيرت المهارات منذ آخر لقطة
+def test_periodic_snapshot_only_when_changed(data_dir):
+    save_skills(skills(1))
+    scheduler = SnapshotScheduler(min_interval=0, period=10)
+    assert scheduler.tick() is None and 9 < scheduler.next_delay() <= 10
+
+    scheduler.last_time -= 10
+    assert scheduler.tick() is not None
+    scheduler.last_time -= 10
+    assert scheduler.tick() is None
+    assert history_count() == 1
+
+    save_skills(skills(2))
+    scheduler.last_time -= 10
+    assert scheduler.tick() is not None
+    assert read_history_entry(-1)["skills"] == skills(2)
@@ -0,0 +1,40 @@
+import json
+from datetime import datetime, timedelta
+
+from status_core import load_snapshot, snapshot_index, write_snapshot
+from status_core import snapshots
+from status_core.paths import SNAPSHOT_FOLDER, SNAPSHOT_FRAMES
+
+from helpers import drop_snapshot_caches, skills, stamp
+
+
+def test_snapshots_round_trip_across_keyframes(data_dir, monkeypatch):
+    monkeypatch.setattr(snapshots, "SNAPSHOT_KEYFRAME_EVERY", 3)
+    start = datetime(2024, 1, 1)
+    written = {}
+    for i in range(10):
+        data = skills(i, 50, 100 - i) + ([{"name": "extra", "value": i}] if i % 2 else [])
+        written[write_snapshot(data, f"{stamp(start + timedelta(minutes=i))}.json")] = data
+
+    assert snapshot_index() == sorted(written)
+    for filename, data in written.items():
+        assert load_snapshot(filename) == data
+    drop_snapshot_caches()
+    for filename, data in written.items():
+        assert load_snapshot(filename) == data
+
+
+# كل SNAPSHOT_KEYFRAME_EVERY لقطة keyframe كامل، وما بينها ملفات فروق صغيرة عن آخر keyframe
+def test_keyframe_every_n_snapshots(data_dir, monkeypatch):
+    monkeypatch.setattr(snapshots, "SNAPSHOT_KEYFRAME_EVERY", 4)
+    names = [write_snapshot(skills(i, *[5] * 19), f"2024-01-01_00-00-{i:02d}.json") for i in range(9)]
+    manifests = [json.loads((data_dir / SNAPSHOT_FOLDER / name).read_text(encoding="utf-8")) for name in names]
+    keyframes = [i for i, manifest in enumerate(manifests) if "objects" in manifest]
+    assert keyframes == [0, 4, 8]
+    assert len((data_dir / SNAPSHOT_FRAMES).read_text(encoding="utf-8").splitlines()) == 3
+    bases = [manifest.get("base") for manifest in manifests]
+    assert bases[1] == bases[2] == bases[3] != bases[5] == bases[6] == bases[7]
+    assert all(manifests[i]["set"] == {"skill0": i} and not manifests[i]["removed"]
+               for i in range(9) if i not in keyframes)
+    drop_snapshot_caches()
+    assert [load_snapshot(name) for name in names] == [skills(i, *[5] * 19) for i in range(9)]
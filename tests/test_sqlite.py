@@ -0,0 +1,50 @@
+from datetime import datetime, timedelta
+
+from status_core import (
+    append_history, history_count, iter_history, load_skills, load_snapshot, save_skills, snapshot_diff,
+    snapshot_index, use_json, use_sqlite,
+)
+from status_core import snapshots, sqlite_backend
+
+from helpers import entry, freeze_clock, skills
+
+
+def test_sqlite_import_is_idempotent(data_dir):
+    save_skills(skills(1, 2))
+    start = datetime(2024, 1, 1)
+    entries = [entry(start + timedelta(minutes=i), skills(i)) for i in range(3)]
+    for e in entries:
+        append_history(e)
+
+    use_sqlite(import_json=True)
+    assert history_count() == 3
+    use_json()
+    use_sqlite(import_json=True)
+    assert history_count() == 3
+    assert list(iter_history()) == entries
+    assert list(iter_history(-2)) == entries[-2:]
+    assert load_skills() == skills(1, 2)
+
+
+def test_sqlite_history_iteration_in_batches(data_dir, monkeypatch):
+    monkeypatch.setattr(sqlite_backend, "HISTORY_BATCH", 4)
+    use_sqlite()
+    start = datetime(2024, 1, 1)
+    entries = [entry(start + timedelta(minutes=i), skills(i, 1)) for i in range(10)]
+    for e in entries:
+        append_history(e)
+    assert list(iter_history()) == entries
+    assert list(iter_history(3)) == entries[3:]
+    assert list(iter_history(8)) == entries[8:]
+
+
+def test_sqlite_snapshots_round_trip(data_dir, monkeypatch):
+    clock = freeze_clock(monkeypatch, datetime(2024, 1, 1, 12), sqlite_backend)
+    use_sqlite()
+    save_skills(skills(1, 2))
+    clock.current += timedelta(seconds=1)
+    save_skills(skills(1, 3))
+    first, second = snapshot_index()
+    assert load_snapshot(first) == skills(1, 2)
+    assert load_snapshot(second) == skills(1, 3)
+    assert snapshot_diff(first, second) == snapshots.diff_skills(skills(1, 2), skills(1, 3))
@@ -0,0 +1,70 @@
+import os
+
+import pytest
+
+from status_core import (
+    atomic_append, atomic_batch, atomic_write, iter_skills, load_skills, recover_skills, save_skills, snapshot_index,
+)
+from status_core import atomic
+from status_core.paths import SKILLS_FILE
+
+from helpers import skills
+
+
+def test_skills_round_trip(data_dir):
+    assert load_skills() == []
+    data = skills(10, 20, 30) + [{"name": "عربي", "value": 100}]
+    save_skills(data)
+    assert load_skills() == data
+    assert list(iter_skills()) == data
+    assert len(snapshot_index()) == 1
+
+
+def test_recover_skills_from_latest_snapshot(data_dir):
+    save_skills(skills(1, 2))
+    (data_dir / SKILLS_FILE).write_text('[{"name": "skill0", "val', encoding="utf-8")
+    assert recover_skills() == snapshot_index()[-1]
+    assert load_skills() == skills(1, 2)
+    assert (data_dir / (SKILLS_FILE + ".corrupt")).exists()
+
+
+# تسجيل كل fsync (ملف أو مجلد) وكل استبدال بالترتيب
+@pytest.fixture
+def disk_log(monkeypatch):
+    log = []
+    fsync_path, fsync_dir, replace = atomic.fsync_path, atomic._fsync_dir, os.replace
+    monkeypatch.setattr(atomic, "fsync_path", lambda path: (log.append(("sync", os.path.basename(path))),
+                                                            fsync_path(path)))
+    monkeypatch.setattr(atomic, "_fsync_dir", lambda folder: (log.append(("dir", folder)), fsync_dir(folder)))
+    monkeypatch.setattr(os, "replace", lambda src, dst: (log.append(("replace", os.path.basename(dst))),
+                                                         replace(src, dst)))
+    return log
+
+
+# داخل دفعة: fsync واحد لكل ملف إلحاقي قبل أول استبدال قد يشير إليه، ومزامنة المجلد مرة في النهاية
+def test_atomic_batch_syncs_appends_before_replace(tmp_path, disk_log):
+    store, target = str(tmp_path / "store.jsonl"), str(tmp_path / "target.json")
+    with atomic_batch():
+        for i in range(3):
+            atomic_append(store, f"{i}\n")
+        atomic_write(target, "[]")
+        atomic_append(store, "3\n")
+        assert disk_log == [("sync", "store.jsonl"), ("replace", "target.json")]
+    assert disk_log[2:] == [("sync", "store.jsonl"), ("dir", str(tmp_path))]
+    assert (tmp_path / "store.jsonl").read_text() == "0\n1\n2\n3\n"
+    assert not (tmp_path / "target.json.tmp").exists()
+
+
+def test_nested_batch_joins_outer_and_failure_still_syncs(tmp_path, disk_log):
+    store = str(tmp_path / "store.jsonl")
+    with pytest.raises(RuntimeError):
+        with atomic_batch():
+            with atomic_batch():
+                atomic_append(store, "a\n")
+            assert disk_log == []  # الدفعة الداخلية لا تُزامن وحدها
+            raise RuntimeError
+    assert disk_log == [("sync", "store.jsonl"), ("dir", str(tmp_path))]
+
+    # بعد الدفعة: كل كتابة تُزامن فورًا من جديد
+    atomic_write(str(tmp_path / "x.json"), "{}")
+    assert disk_log[2:] == [("replace", "x.json"), ("dir", str(tmp_path))]
@@ -0,0 +1,62 @@
+import math
+
+import pytest
+
+from status_core import (
+    create_profile, open_profile, profile_index, profile_skills, save_profile_skills, use_sqlite,
+)
+from status_core import profiles
+from status_core.team import align_to_team, team_matrix, team_stats
+
+
+# ثلاثة ملفات بمهارات متداخلة، والملف المفتوح في النهاية هو الافتراضي
+def make_team():
+    save_profile_skills([{"name": "python", "value": 90}, {"name": "sql", "value": 40}])
+    for name, values in (("bob", [("python", 50), ("go", 70)]), ("sara", [("python", 70), ("sql", 80)])):
+        create_profile(name)
+        open_profile(name)
+        save_profile_skills([{"name": skill, "value": value} for skill, value in values])
+    open_profile("default")
+
+
+@pytest.mark.parametrize("storage", ["json", "sqlite"])
+def test_team_stats(data_dir, storage):
+    if storage == "sqlite":
+        use_sqlite()
+    make_team()
+    profiles._open_profiles.clear()  # الملفات غير المفتوحة تُقرأ من التخزين نفسه
+
+    names, matrix = team_matrix(["default", "bob", "sara"])
+    assert names == ["python", "sql", "go"]
+    assert matrix[0].tolist()[:2] == [90, 40] and math.isnan(matrix[0, 2])
+    assert matrix[1, 2] == 70
+
+    stats = team_stats()
+    assert stats["profiles"] == ["default", "bob", "sara"]
+    assert stats["mean"].tolist() == [70, 60, 70]
+    assert stats["median"][0] == 70
+    assert stats["count"].tolist() == [3, 2, 1]
+    assert align_to_team(stats, profile_skills("bob")) == [50, 0, 70]
+
+
+def test_team_stats_cache_follows_profile_versions(data_dir):
+    make_team()
+    first = team_stats(["bob", "sara"])
+    assert team_stats(["sara", "bob"]) is first
+
+    open_profile("bob")
+    save_profile_skills([{"name": "python", "value": 10}])
+    second = team_stats(["bob", "sara"])
+    assert second is not first
+    assert second["mean"].tolist()[0] == 40
+
+
+# إعادة بناء الفهرس تحت SQLite تقرأ قواعد الملفات وليس skills.json
+def test_rebuilt_index_reads_sqlite_profiles(data_dir):
+    use_sqlite()
+    make_team()
+    (data_dir / profiles.PROFILE_INDEX).unlink()
+    profiles._index = None
+    summary = profile_index()
+    assert summary["bob"]["skills"] == 2 and summary["bob"]["top"] == "go"
+    assert summary["default"]["mean"] == 65